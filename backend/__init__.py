@@ -3,13 +3,17 @@ Backend package for Resume Screening System
 """
 
 from .config import config
+from .batch_scheduler import EmbeddingBatcher
 from .document_processor import DocumentProcessor
 from .embedding_generator import EmbeddingGenerator
 from .similarity_calculator import SimilarityCalculator
+from .ranking_engine import RankingEngine
 
 __all__ = [
     "config",
+    "EmbeddingBatcher",
     "DocumentProcessor",
     "EmbeddingGenerator",
     "SimilarityCalculator",
+    "RankingEngine",
 ]
@@ -0,0 +1,24 @@
+"""
+API entry point: python -m backend (python -m backend.main hands off here)
+
+Extraction workers started with forkserver or spawn re-import the main
+module unless it is a package's __main__; serving from here keeps them
+from importing backend.main, which loads the embedding model.
+"""
+
+import os
+
+import uvicorn
+
+
+def main():
+    """Serve backend.main:app on HOST:PORT"""
+    uvicorn.run(
+        "backend.main:app",
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", 8000))
+    )
+
+
+if __name__ == "__main__":
+    main()
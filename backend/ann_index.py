@@ -0,0 +1,820 @@
+"""
+ANN Index Module
+Approximate nearest-neighbour search over normalized embeddings: inverted
+file (IVF), and flat code scans (FlatCodeIndex) with product quantization
+(PQ) and sign-bit binary (BinaryIndex) codes
+"""
+
+import logging
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import Iterable, List, Optional, Tuple
+import numpy as np
+
+from .ranking_engine import RankingEngine
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length as float32 (zero rows stay zero)"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors.reshape(1, -1)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1.0)
+
+
+def assign_to_centroids(
+    vectors: np.ndarray, centroids: np.ndarray, block_rows: int = 65536
+) -> np.ndarray:
+    """
+    Nearest centroid (by dot product) for each row, computed in blocks
+
+    Args:
+        vectors: (N, d) normalized vectors
+        centroids: (C, d) normalized centroids
+        block_rows: Rows scored per block to bound the (block, C) temporary
+
+    Returns:
+        Array of N centroid indices
+    """
+    assignments = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), block_rows):
+        block = vectors[start:start + block_rows]
+        assignments[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return assignments
+
+
+def spherical_kmeans(
+    vectors: np.ndarray, n_clusters: int, n_iter: int = 20, seed: int = 0
+) -> np.ndarray:
+    """
+    Train unit-length centroids with k-means under cosine similarity
+
+    Args:
+        vectors: (N, d) normalized training vectors
+        n_clusters: Number of centroids
+        n_iter: Lloyd iterations
+        seed: Random seed for initialization
+
+    Returns:
+        (n_clusters, d) normalized centroids
+    """
+    rng = np.random.default_rng(seed)
+    n_clusters = min(n_clusters, len(vectors))
+    centroids = vectors[rng.choice(len(vectors), n_clusters, replace=False)].copy()
+
+    for _ in range(n_iter):
+        assignments = assign_to_centroids(vectors, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, vectors)
+        counts = np.bincount(assignments, minlength=n_clusters)
+
+        empty = np.flatnonzero(counts == 0)
+        if len(empty):
+            # Restart empty clusters on random training points
+            sums[empty] = vectors[rng.choice(len(vectors), len(empty), replace=False)]
+        centroids = normalize_rows(sums)
+
+    return centroids
+
+
+def kmeans(
+    vectors: np.ndarray, n_clusters: int, n_iter: int = 20, seed: int = 0,
+    block_rows: int = 65536
+) -> np.ndarray:
+    """
+    Train centroids with Euclidean k-means (Lloyd iterations)
+
+    Args:
+        vectors: (N, d) training vectors
+        n_clusters: Number of centroids
+        n_iter: Lloyd iterations
+        seed: Random seed for initialization
+        block_rows: Rows assigned per block
+
+    Returns:
+        (n_clusters, d) centroids
+    """
+    rng = np.random.default_rng(seed)
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    n_clusters = min(n_clusters, len(vectors))
+    centroids = vectors[rng.choice(len(vectors), n_clusters, replace=False)].copy()
+
+    for _ in range(n_iter):
+        assignments = nearest_centroids(vectors, centroids, block_rows)
+        # Per-dimension bincount is several times faster than np.add.at
+        sums = np.stack([
+            np.bincount(assignments, weights=vectors[:, j], minlength=n_clusters)
+            for j in range(vectors.shape[1])
+        ], axis=1).astype(np.float32)
+        counts = np.bincount(assignments, minlength=n_clusters)
+
+        empty = counts == 0
+        centroids[~empty] = sums[~empty] / counts[~empty, None]
+        if empty.any():
+            # Restart empty clusters on random training points
+            centroids[empty] = vectors[rng.choice(len(vectors), int(empty.sum()), replace=False)]
+
+    return centroids
+
+
+def nearest_centroids(
+    vectors: np.ndarray, centroids: np.ndarray, block_rows: int = 65536
+) -> np.ndarray:
+    """Nearest centroid by Euclidean distance for each row, computed in blocks"""
+    # argmin |x - c|^2 = argmax (x.c - |c|^2 / 2)
+    half_norms = 0.5 * np.einsum("ij,ij->i", centroids, centroids)
+    assignments = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), block_rows):
+        scores = vectors[start:start + block_rows] @ centroids.T
+        scores -= half_norms
+        assignments[start:start + len(scores)] = np.argmax(scores, axis=1)
+    return assignments
+
+
+class IVFIndex:
+    """
+    Inverted-file index with k-means coarse centroids
+
+    Vectors are grouped into n_lists clusters; a query scores only the
+    vectors in its nprobe closest clusters. Raising nprobe trades latency
+    for recall. Supports incremental insert, tombstone deletes and
+    persistence with np.savez.
+    """
+
+    def __init__(self, dimension: int, n_lists: int = 256, nprobe: int = 8):
+        """
+        Initialize index
+
+        Args:
+            dimension: Embedding dimension
+            n_lists: Number of coarse clusters
+            nprobe: Default number of clusters scanned per query
+        """
+        self.dimension = dimension
+        self.n_lists = n_lists
+        self.nprobe = nprobe
+        self.centroids: Optional[np.ndarray] = None
+        self._lock = threading.RLock()
+        self._reset_lists()
+
+    def _reset_lists(self) -> None:
+        """Create empty inverted lists"""
+        self._list_ids: List[List[np.ndarray]] = [[] for _ in range(self.n_lists)]
+        self._list_vectors: List[List[np.ndarray]] = [[] for _ in range(self.n_lists)]
+        self._list_of_id = {}
+        self._max_id = -1
+        self._deleted = set()
+        self._deleted_per_list = np.zeros(self.n_lists, dtype=np.int64)
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def __len__(self) -> int:
+        return len(self._list_of_id) - len(self._deleted)
+
+    def max_id(self) -> int:
+        """
+        Largest id added since training (tombstoned and compacted ids
+        included), or -1 if empty; kept as a running maximum by add()
+        """
+        with self._lock:
+            return self._max_id
+
+    def train(self, vectors: np.ndarray, n_iter: int = 20, sample_size: int = 100000,
+              seed: int = 0) -> None:
+        """
+        Learn coarse centroids from a sample of the corpus
+
+        Args:
+            vectors: (N, d) training vectors
+            n_iter: k-means iterations
+            sample_size: Maximum number of vectors used for training
+            seed: Random seed
+        """
+        vectors = np.asarray(vectors)
+        rng = np.random.default_rng(seed)
+        if len(vectors) > sample_size:
+            vectors = vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))]
+
+        with self._lock:
+            self.centroids = spherical_kmeans(normalize_rows(vectors), self.n_lists, n_iter, seed)
+            if len(self.centroids) < self.n_lists:
+                logger.warning(
+                    f"Only {len(self.centroids)} training vectors; using that many lists"
+                )
+                self.n_lists = len(self.centroids)
+            self._reset_lists()
+
+    def add(self, ids: Iterable[int], vectors: np.ndarray) -> None:
+        """
+        Insert vectors; re-adding an id replaces its previous vector
+
+        Args:
+            ids: Integer ids (e.g. corpus rows)
+            vectors: (N, d) vectors
+        """
+        if not self.is_trained:
+            raise RuntimeError("IVFIndex must be trained before adding vectors")
+
+        ids = np.asarray(list(ids), dtype=np.int64)
+        vectors = normalize_rows(vectors)
+        if len(ids) == 0:
+            return
+
+        with self._lock:
+            replaced = [int(i) for i in ids if int(i) in self._list_of_id]
+            if replaced:
+                self.delete(replaced)
+                self.compact()
+
+            assignments = assign_to_centroids(vectors, self.centroids)
+            order = np.argsort(assignments, kind="stable")
+            bounds = np.searchsorted(assignments[order], np.arange(self.n_lists + 1))
+
+            for list_no in np.flatnonzero(np.diff(bounds)):
+                members = order[bounds[list_no]:bounds[list_no + 1]]
+                self._list_ids[list_no].append(ids[members])
+                self._list_vectors[list_no].append(vectors[members])
+
+            for i, list_no in zip(ids.tolist(), assignments.tolist()):
+                self._list_of_id[i] = list_no
+                self._deleted.discard(i)
+            self._max_id = max(self._max_id, int(ids.max()))
+
+    def delete(self, ids: Iterable[int]) -> int:
+        """
+        Mark ids as deleted; they are skipped by search until compact() runs
+
+        Args:
+            ids: Ids to delete
+
+        Returns:
+            Number of ids newly deleted
+        """
+        deleted = 0
+        with self._lock:
+            for i in ids:
+                i = int(i)
+                if i in self._list_of_id and i not in self._deleted:
+                    self._deleted.add(i)
+                    self._deleted_per_list[self._list_of_id[i]] += 1
+                    deleted += 1
+        return deleted
+
+    def compact(self) -> None:
+        """Physically remove tombstoned vectors"""
+        with self._lock:
+            if not self._deleted:
+                return
+            deleted = np.fromiter(self._deleted, dtype=np.int64)
+            for list_no in np.flatnonzero(self._deleted_per_list):
+                ids, vectors = self._list_arrays(list_no)
+                keep = ~np.isin(ids, deleted)
+                self._list_ids[list_no] = [ids[keep]]
+                self._list_vectors[list_no] = [vectors[keep]]
+            for i in self._deleted:
+                del self._list_of_id[i]
+            self._deleted.clear()
+            self._deleted_per_list[:] = 0
+
+    def _list_arrays(self, list_no: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Ids and vectors of one inverted list as single arrays (lock held)"""
+        ids = self._list_ids[list_no]
+        vectors = self._list_vectors[list_no]
+        if len(ids) > 1:
+            # Merge chunks left by incremental inserts so later scans are contiguous
+            self._list_ids[list_no] = ids = [np.concatenate(ids)]
+            self._list_vectors[list_no] = vectors = [np.concatenate(vectors)]
+        if not ids:
+            return (
+                np.empty(0, dtype=np.int64),
+                np.empty((0, self.dimension), dtype=np.float32)
+            )
+        return ids[0], vectors[0]
+
+    def search(
+        self, query: np.ndarray, k: int = 10, nprobe: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Approximate top-k by cosine similarity
+
+        Args:
+            query: Query embedding
+            k: Number of results
+            nprobe: Clusters to scan (defaults to self.nprobe)
+
+        Returns:
+            Tuple of (ids, scores), best first
+        """
+        if not self.is_trained or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        query = normalize_rows(query)[0]
+        nprobe = min(nprobe or self.nprobe, self.n_lists)
+
+        with self._lock:
+            probes = RankingEngine.select_top_k(self.centroids @ query, nprobe)
+            candidate_ids = []
+            candidate_scores = []
+            deleted = None
+            for list_no in probes:
+                ids, vectors = self._list_arrays(list_no)
+                if len(ids) == 0:
+                    continue
+                scores = vectors @ query
+                if self._deleted_per_list[list_no]:
+                    if deleted is None:
+                        deleted = np.fromiter(self._deleted, dtype=np.int64)
+                    alive = ~np.isin(ids, deleted)
+                    ids, scores = ids[alive], scores[alive]
+                candidate_ids.append(ids)
+                candidate_scores.append(scores)
+
+        if not candidate_ids:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        ids = np.concatenate(candidate_ids)
+        scores = np.concatenate(candidate_scores)
+        best = RankingEngine.select_top_k(scores, k)
+        return ids[best], np.clip(scores[best], -1.0, 1.0)
+
+    def save(self, path: str) -> None:
+        """Write the index (tombstones included) to an .npz file"""
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        with self._lock:
+            if not self.is_trained:
+                raise RuntimeError("Cannot save an untrained IVFIndex")
+            lists = [self._list_arrays(list_no) for list_no in range(self.n_lists)]
+            tmp_path = path + ".tmp.npz"
+            np.savez(
+                tmp_path,
+                params=np.array([self.dimension, self.n_lists, self.nprobe], dtype=np.int64),
+                centroids=self.centroids,
+                ids=np.concatenate([ids for ids, _ in lists]),
+                vectors=np.concatenate([vectors for _, vectors in lists]),
+                list_sizes=np.array([len(ids) for ids, _ in lists], dtype=np.int64),
+                deleted=np.fromiter(self._deleted, dtype=np.int64, count=len(self._deleted))
+            )
+            os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "IVFIndex":
+        """Read an index written by save()"""
+        with np.load(path) as data:
+            dimension, n_lists, nprobe = (int(v) for v in data["params"])
+            index = cls(dimension, n_lists, nprobe)
+            index.centroids = data["centroids"]
+            bounds = np.concatenate([[0], np.cumsum(data["list_sizes"])])
+            ids = data["ids"]
+            vectors = data["vectors"]
+            deleted = data["deleted"]
+
+        for list_no in range(n_lists):
+            list_ids = ids[bounds[list_no]:bounds[list_no + 1]]
+            if len(list_ids):
+                index._list_ids[list_no] = [list_ids]
+                index._list_vectors[list_no] = [vectors[bounds[list_no]:bounds[list_no + 1]]]
+                for i in list_ids.tolist():
+                    index._list_of_id[i] = list_no
+        if len(ids):
+            index._max_id = int(ids.max())
+        index.delete(deleted.tolist())
+        return index
+
+
+class FlatCodeIndex(ABC):
+    """
+    Base class for indexes that scan a compact code per vector
+
+    Codes are kept column-major, shape (n_columns, N), so a query scores
+    the whole corpus with a few sequential passes. Subclasses implement
+    train, encode, score and their own parameters; this class handles ids,
+    incremental inserts, tombstone deletes, compaction and persistence.
+    """
+
+    CODE_DTYPE = np.uint8
+
+    def __init__(self, dimension: int):
+        self.dimension = dimension
+        self._lock = threading.RLock()
+        self._reset_codes()
+
+    def _reset_codes(self) -> None:
+        """Drop every stored code"""
+        self._ids: List[np.ndarray] = []
+        self._codes: List[np.ndarray] = []
+        self._row_of_id = {}
+        self._max_id = -1
+        self._deleted = set()
+
+    @property
+    @abstractmethod
+    def is_trained(self) -> bool:
+        """Whether train() has run"""
+
+    @property
+    @abstractmethod
+    def n_columns(self) -> int:
+        """Code columns per vector"""
+
+    @abstractmethod
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """Codes of shape (n_columns, N) for (N, d) vectors"""
+
+    @abstractmethod
+    def score(self, query: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """Approximate cosine similarity of a query to every code column"""
+
+    @abstractmethod
+    def _params(self) -> dict:
+        """Arrays besides ids and codes that save() must store"""
+
+    @classmethod
+    @abstractmethod
+    def _from_params(cls, data) -> "FlatCodeIndex":
+        """Rebuild an empty index from the arrays written by _params()"""
+
+    def __len__(self) -> int:
+        return len(self._row_of_id) - len(self._deleted)
+
+    def max_id(self) -> int:
+        """
+        Largest id added since training (tombstoned and compacted ids
+        included), or -1 if empty; kept as a running maximum by add()
+        """
+        with self._lock:
+            return self._max_id
+
+    def nbytes(self) -> int:
+        """Memory held by the codes and ids"""
+        with self._lock:
+            return sum(a.nbytes for a in self._ids) + sum(a.nbytes for a in self._codes)
+
+    def add(self, ids: Iterable[int], vectors: np.ndarray) -> None:
+        """
+        Encode and insert vectors; re-adding an id replaces its previous code
+
+        Args:
+            ids: Integer ids (e.g. corpus rows)
+            vectors: (N, d) vectors
+        """
+        if not self.is_trained:
+            raise RuntimeError(f"{type(self).__name__} must be trained before adding vectors")
+
+        ids = np.asarray(list(ids), dtype=np.int64)
+        if len(ids) == 0:
+            return
+        codes = self.encode(vectors)
+
+        with self._lock:
+            replaced = [int(i) for i in ids if int(i) in self._row_of_id]
+            if replaced:
+                self.delete(replaced)
+                self.compact()
+
+            first_row = sum(len(chunk) for chunk in self._ids)
+            self._ids.append(ids)
+            self._codes.append(codes)
+            for offset, i in enumerate(ids.tolist()):
+                self._row_of_id[i] = first_row + offset
+            self._max_id = max(self._max_id, int(ids.max()))
+
+    def delete(self, ids: Iterable[int]) -> int:
+        """
+        Mark ids as deleted; they are skipped by search until compact() runs
+
+        Args:
+            ids: Ids to delete
+
+        Returns:
+            Number of ids newly deleted
+        """
+        deleted = 0
+        with self._lock:
+            for i in ids:
+                i = int(i)
+                if i in self._row_of_id and i not in self._deleted:
+                    self._deleted.add(i)
+                    deleted += 1
+        return deleted
+
+    def compact(self) -> None:
+        """Physically remove tombstoned codes"""
+        with self._lock:
+            if not self._deleted:
+                return
+            ids, codes = self._arrays()
+            keep = ~np.isin(ids, np.fromiter(self._deleted, dtype=np.int64))
+            self._ids, self._codes = [ids[keep]], [codes[:, keep]]
+            self._row_of_id = {i: row for row, i in enumerate(self._ids[0].tolist())}
+            self._deleted.clear()
+
+    def _arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """All ids and codes as single arrays (lock held)"""
+        if len(self._ids) > 1:
+            # Merge chunks left by incremental inserts so scans are contiguous
+            self._ids = [np.concatenate(self._ids)]
+            self._codes = [np.concatenate(self._codes, axis=1)]
+        if not self._ids:
+            return (
+                np.empty(0, dtype=np.int64),
+                np.empty((self.n_columns, 0), dtype=self.CODE_DTYPE)
+            )
+        return self._ids[0], self._codes[0]
+
+    def search(self, query: np.ndarray, k: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Approximate top-k by cosine similarity
+
+        Args:
+            query: Query embedding
+            k: Number of results
+
+        Returns:
+            Tuple of (ids, approximate scores), best first
+        """
+        if not self.is_trained or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        with self._lock:
+            ids, codes = self._arrays()
+            scores = self.score(query, codes)
+            if self._deleted:
+                deleted_rows = [self._row_of_id[i] for i in self._deleted]
+                scores[deleted_rows] = -np.inf
+                k = min(k, len(ids) - len(deleted_rows))
+
+        best = RankingEngine.select_top_k(scores, k)
+        return ids[best], np.clip(scores[best], -1.0, 1.0)
+
+    def save(self, path: str) -> None:
+        """Write the index (tombstones included) to an .npz file"""
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        with self._lock:
+            if not self.is_trained:
+                raise RuntimeError(f"Cannot save an untrained {type(self).__name__}")
+            ids, codes = self._arrays()
+            tmp_path = path + ".tmp.npz"
+            np.savez(
+                tmp_path,
+                ids=ids,
+                codes=codes,
+                deleted=np.fromiter(self._deleted, dtype=np.int64, count=len(self._deleted)),
+                **self._params()
+            )
+            os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "FlatCodeIndex":
+        """Read an index written by save()"""
+        with np.load(path) as data:
+            index = cls._from_params(data)
+            ids = data["ids"]
+            codes = data["codes"]
+            deleted = data["deleted"]
+
+        if len(ids):
+            index._ids, index._codes = [ids], [codes]
+            index._row_of_id = {i: row for row, i in enumerate(ids.tolist())}
+            index._max_id = int(ids.max())
+        index.delete(deleted.tolist())
+        return index
+
+
+class PQIndex(FlatCodeIndex):
+    """
+    Product-quantization index scored with asymmetric distance computation
+
+    Each normalized vector is split into n_subvectors slices and every
+    slice is replaced by the id of its nearest codebook centroid, so a
+    384-dim vector costs n_subvectors bytes instead of 1536. A query
+    builds one (n_subvectors, 256) table of slice-centroid dot products
+    and a vector's score is the sum of n_subvectors table lookups (ADC).
+    Scores are approximate; CorpusStore.search(rerank=...) rescores the
+    best candidates against the stored embeddings.
+    """
+
+    N_CENTROIDS = 256
+
+    def __init__(self, dimension: int, n_subvectors: int = 48):
+        """
+        Initialize index
+
+        Args:
+            dimension: Embedding dimension
+            n_subvectors: Slices per vector (bytes per code); must divide dimension
+        """
+        if dimension % n_subvectors:
+            raise ValueError(
+                f"n_subvectors ({n_subvectors}) must divide the dimension ({dimension})"
+            )
+        super().__init__(dimension)
+        self.n_subvectors = n_subvectors
+        self.sub_dimension = dimension // n_subvectors
+        self.codebooks: Optional[np.ndarray] = None
+
+    @property
+    def is_trained(self) -> bool:
+        return self.codebooks is not None
+
+    @property
+    def n_columns(self) -> int:
+        return self.n_subvectors
+
+    def train(self, vectors: np.ndarray, n_iter: int = 20, sample_size: int = 32768,
+              seed: int = 0) -> None:
+        """
+        Learn one 256-centroid codebook per subvector from a corpus sample
+
+        Args:
+            vectors: (N, d) training vectors
+            n_iter: k-means iterations
+            sample_size: Maximum number of vectors used for training
+            seed: Random seed
+        """
+        vectors = np.asarray(vectors)
+        rng = np.random.default_rng(seed)
+        if len(vectors) > sample_size:
+            vectors = vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))]
+        vectors = normalize_rows(vectors)
+
+        codebooks = np.zeros(
+            (self.n_subvectors, self.N_CENTROIDS, self.sub_dimension), dtype=np.float32
+        )
+        for m in range(self.n_subvectors):
+            sub = vectors[:, m * self.sub_dimension:(m + 1) * self.sub_dimension]
+            centroids = kmeans(sub, self.N_CENTROIDS, n_iter, seed + m)
+            # Fewer training vectors than centroids: repeat centroids to fill the codebook
+            codebooks[m] = centroids[np.arange(self.N_CENTROIDS) % len(centroids)]
+
+        with self._lock:
+            self.codebooks = codebooks
+            self._reset_codes()
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        Quantize vectors
+
+        Args:
+            vectors: (N, d) vectors (normalized here)
+
+        Returns:
+            (n_subvectors, N) uint8 codes
+        """
+        vectors = normalize_rows(vectors)
+        codes = np.empty((self.n_subvectors, len(vectors)), dtype=np.uint8)
+        for m in range(self.n_subvectors):
+            sub = vectors[:, m * self.sub_dimension:(m + 1) * self.sub_dimension]
+            codes[m] = nearest_centroids(sub, self.codebooks[m])
+        return codes
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """Approximate (N, d) vectors from (n_subvectors, N) codes"""
+        return np.concatenate(
+            [self.codebooks[m][codes[m]] for m in range(self.n_subvectors)], axis=1
+        )
+
+    def lookup_table(self, query: np.ndarray) -> np.ndarray:
+        """(n_subvectors, 256) dot products of query slices with their codebooks"""
+        query = normalize_rows(query)[0].reshape(self.n_subvectors, self.sub_dimension)
+        return np.einsum("mkd,md->mk", self.codebooks, query)
+
+    def score(self, query: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """Sum of per-subvector table lookups (one sequential take() per subvector)"""
+        table = self.lookup_table(query)
+        scores = np.zeros(codes.shape[1], dtype=np.float32)
+        for m in range(self.n_subvectors):
+            scores += table[m].take(codes[m])
+        return scores
+
+    def _params(self) -> dict:
+        return {
+            "params": np.array([self.dimension, self.n_subvectors], dtype=np.int64),
+            "codebooks": self.codebooks
+        }
+
+    @classmethod
+    def _from_params(cls, data) -> "PQIndex":
+        dimension, n_subvectors = (int(v) for v in data["params"])
+        index = cls(dimension, n_subvectors)
+        index.codebooks = data["codebooks"]
+        return index
+
+
+def popcount(words: np.ndarray) -> np.ndarray:
+    """Set bits per element of an unsigned integer array"""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words)
+    # numpy < 2.0: count bits byte by byte with a lookup table
+    as_bytes = words.view(np.uint8).reshape(words.shape + (words.itemsize,))
+    return _BYTE_POPCOUNT[as_bytes].sum(axis=-1, dtype=np.uint8)
+
+
+_BYTE_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+class BinaryIndex(FlatCodeIndex):
+    """
+    Sign-bit index scanned with XOR + popcount
+
+    Each vector keeps one bit per dimension (the sign after subtracting the
+    corpus mean), packed into uint64 words: 48 bytes for 384 dims. Hamming
+    distance h between two codes estimates the angle between the vectors
+    (h / d ~ angle / pi), so cos(pi * h / d) is reported as the score. It
+    is a coarse prefilter: keep a few thousand candidates and rerank them
+    exactly with CorpusStore.search(rerank=...).
+    """
+
+    CODE_DTYPE = np.uint64
+
+    def __init__(self, dimension: int):
+        """
+        Initialize index
+
+        Args:
+            dimension: Embedding dimension
+        """
+        super().__init__(dimension)
+        self.n_words = -(-dimension // 64)
+        self.thresholds: Optional[np.ndarray] = None
+
+    @property
+    def is_trained(self) -> bool:
+        return self.thresholds is not None
+
+    @property
+    def n_columns(self) -> int:
+        return self.n_words
+
+    def train(self, vectors: np.ndarray, sample_size: int = 100000, seed: int = 0) -> None:
+        """
+        Learn per-dimension thresholds (the mean of a corpus sample)
+
+        Centering keeps bits informative on dimensions where every
+        embedding has the same sign.
+
+        Args:
+            vectors: (N, d) training vectors
+            sample_size: Maximum number of vectors used for training
+            seed: Random seed
+        """
+        vectors = np.asarray(vectors)
+        if len(vectors) > sample_size:
+            rng = np.random.default_rng(seed)
+            vectors = vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))]
+
+        with self._lock:
+            self.thresholds = normalize_rows(vectors).mean(axis=0)
+            self._reset_codes()
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        Sign bits of the centered vectors
+
+        Args:
+            vectors: (N, d) vectors (normalized here)
+
+        Returns:
+            (n_words, N) uint64 codes
+        """
+        bits = normalize_rows(vectors) > self.thresholds
+        packed = np.packbits(bits, axis=1)
+        padded = np.zeros((len(packed), self.n_words * 8), dtype=np.uint8)
+        padded[:, :packed.shape[1]] = packed
+        return np.ascontiguousarray(padded.view(np.uint64).T)
+
+    def hamming(self, query: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """Hamming distance from the query's code to every code column"""
+        query_code = self.encode(query)[:, 0]
+        distances = np.zeros(codes.shape[1], dtype=np.uint16)
+        for w in range(self.n_words):
+            distances += popcount(codes[w] ^ query_code[w])
+        return distances
+
+    def score(self, query: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """Cosine estimate cos(pi * hamming / d)"""
+        distances = self.hamming(query, codes)
+        return np.cos(distances * np.float32(np.pi / self.dimension))
+
+    def _params(self) -> dict:
+        return {
+            "params": np.array([self.dimension], dtype=np.int64),
+            "thresholds": self.thresholds
+        }
+
+    @classmethod
+    def _from_params(cls, data) -> "BinaryIndex":
+        index = cls(int(data["params"][0]))
+        index.thresholds = data["thresholds"]
+        return index
@@ -0,0 +1,163 @@
+"""
+Batch Scheduler Module
+Coalesces concurrent embedding requests into shared model passes
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Optional
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class _EncodeRequest:
+    """A pending encode call waiting for the next batch"""
+
+    def __init__(self, texts: List[str], fitted: bool = False):
+        self.texts = texts
+        self.fitted = fitted
+        self.future = Future()
+
+
+class EmbeddingBatcher:
+    """
+    Micro-batching scheduler in front of an EmbeddingGenerator
+
+    Request handlers submit texts and get a future back. A single worker
+    thread collects submissions for up to max_wait_ms or max_batch_size
+    texts, encodes them in one generate_batch_embeddings call and resolves
+    each caller's future with its own slice of the vectors.
+    """
+
+    def __init__(self, generator, max_batch_size: int = 64, max_wait_ms: float = 5.0):
+        """
+        Initialize the batcher
+
+        Args:
+            generator: EmbeddingGenerator used to encode batches
+            max_batch_size: Stop collecting once this many texts are queued
+            max_wait_ms: Longest time the first request of a batch waits for company
+        """
+        self.generator = generator
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start the worker thread if it is not running"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="embedding-batcher", daemon=True
+                )
+                self._thread.start()
+                logger.info(
+                    f"Started embedding batcher (max_batch_size={self.max_batch_size}, "
+                    f"max_wait={self.max_wait * 1000:.1f}ms)"
+                )
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Finish queued work and stop the worker thread"""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None and thread.is_alive():
+            self._queue.put(None)
+            thread.join(timeout)
+
+    def submit(self, texts: List[str], fitted: bool = False) -> Future:
+        """
+        Queue texts for encoding
+
+        Args:
+            texts: List of text strings
+            fitted: The texts already fit the model's sequence length (e.g.
+                    chunk_texts chunks) and are never pre-truncated
+
+        Returns:
+            Future resolving to a list of embedding vectors
+        """
+        self.start()
+        request = _EncodeRequest(list(texts), fitted)
+        if not request.texts:
+            request.future.set_result([])
+            return request.future
+        self._queue.put(request)
+        return request.future
+
+    async def encode(self, texts: List[str], fitted: bool = False) -> List[np.ndarray]:
+        """
+        Encode texts without blocking the event loop
+
+        Args:
+            texts: List of text strings
+            fitted: The texts already fit the model's sequence length (see submit)
+
+        Returns:
+            List of embedding vectors, in the same order as texts
+        """
+        return await asyncio.wrap_future(self.submit(texts, fitted))
+
+    def _run(self) -> None:
+        """Worker loop: collect a batch, encode it, resolve its futures"""
+        while True:
+            request = self._queue.get()
+            if request is None:
+                return
+
+            batch = [request]
+            batch_size = len(request.texts)
+            stopping = False
+            deadline = time.monotonic() + self.max_wait
+
+            while batch_size < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        next_request = self._queue.get(timeout=remaining)
+                    else:
+                        next_request = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+                if next_request is None:
+                    stopping = True
+                    break
+                batch.append(next_request)
+                batch_size += len(next_request.texts)
+
+            self._dispatch(batch)
+            if stopping:
+                return
+
+    def _dispatch(self, batch: List[_EncodeRequest]) -> None:
+        """Encode one collected batch and hand each caller its vectors"""
+        batch = [
+            request for request in batch
+            if request.future.set_running_or_notify_cancel()
+        ]
+        if not batch:
+            return
+
+        texts = [text for request in batch for text in request.texts]
+        fitted = [request.fitted for request in batch for _ in request.texts]
+        try:
+            embeddings = self.generator.generate_batch_embeddings(texts, fitted=fitted)
+        except Exception as e:
+            logger.error(f"Error encoding batch of {len(texts)} texts: {str(e)}")
+            for request in batch:
+                request.future.set_exception(e)
+            return
+
+        offset = 0
+        for request in batch:
+            count = len(request.texts)
+            request.future.set_result(embeddings[offset:offset + count])
+            offset += count
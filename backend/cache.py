@@ -0,0 +1,522 @@
+"""
+Cache Module
+Size-bounded in-memory and on-disk caches for embeddings and other artifacts
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    """Thread-safe least-recently-used cache bounded by total size in bytes"""
+
+    def __init__(self, max_bytes: int, sizeof: Callable = len):
+        """
+        Initialize cache
+
+        Args:
+            max_bytes: Total size budget; least recently used entries are evicted beyond it
+            sizeof: Function returning the size of a value in bytes
+        """
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        """Return the cached value for key, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, value) -> None:
+        """Store a value, evicting least recently used entries as needed"""
+        size = self.sizeof(value)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+    def pop(self, key: str):
+        """Remove and return the value for key, or None"""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return None
+            self.current_bytes -= entry[1]
+            return entry[0]
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and size usage"""
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class DiskCache:
+    """Persistent blob store in SQLite, bounded by total size in bytes"""
+
+    def __init__(self, path: str, max_bytes: int):
+        """
+        Initialize cache
+
+        Args:
+            path: SQLite database file
+            max_bytes: Total size budget; least recently accessed entries are evicted beyond it
+        """
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+            "size INTEGER NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON entries (accessed)")
+        self._conn.commit()
+        self.current_bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()[0]
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, bytes]:
+        """
+        Fetch several entries in one query
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Dictionary of found keys to their blobs
+        """
+        keys = list(keys)
+        if not keys:
+            return {}
+
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM entries WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                found.update((key, bytes(value)) for key, value in rows)
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE entries SET accessed = ? WHERE key = ?",
+                    [(now, key) for key in found]
+                )
+                self._conn.commit()
+
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the blob for key, or None"""
+        return self.get_many([key]).get(key)
+
+    def touch_many(self, keys: Iterable[str]) -> Set[str]:
+        """
+        Check which keys are stored, without reading their blobs or counting
+        hits, and mark the found ones as just accessed
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Set of the keys that are present
+        """
+        keys = list(keys)
+        found = set()
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key FROM entries WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                found.update(key for key, in rows)
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE entries SET accessed = ? WHERE key = ?",
+                    [(now, key) for key in found]
+                )
+                self._conn.commit()
+        return found
+
+    def put_many(self, items: Dict[str, bytes]) -> None:
+        """Store several blobs, evicting least recently accessed entries as needed"""
+        items = {key: value for key, value in items.items() if len(value) <= self.max_bytes}
+        if not items:
+            return
+
+        with self._lock:
+            now = time.time()
+            keys = list(items)
+            replaced = 0
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                replaced += self._conn.execute(
+                    f"SELECT COALESCE(SUM(size), 0) FROM entries WHERE key IN ({placeholders})",
+                    chunk
+                ).fetchone()[0]
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO entries (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                [(key, sqlite3.Binary(value), len(value), now) for key, value in items.items()]
+            )
+            self.current_bytes += sum(len(value) for value in items.values()) - replaced
+            self._evict()
+            self._conn.commit()
+
+    def put(self, key: str, value: bytes) -> None:
+        """Store one blob"""
+        self.put_many({key: value})
+
+    def delete(self, key: str) -> None:
+        """Remove an entry if present"""
+        with self._lock:
+            row = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._conn.commit()
+                self.current_bytes -= row[0]
+
+    def retain_prefix(self, prefix: str) -> int:
+        """
+        Delete every entry whose key does not start with prefix
+
+        Args:
+            prefix: Key prefix to keep
+
+        Returns:
+            Number of deleted entries
+        """
+        with self._lock:
+            deleted = self._conn.execute(
+                "DELETE FROM entries WHERE substr(key, 1, ?) != ?", (len(prefix), prefix)
+            ).rowcount
+            self._conn.commit()
+            self.current_bytes = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()[0]
+        return deleted
+
+    def _evict(self) -> None:
+        """Drop least recently accessed entries until under budget (lock held)"""
+        while self.current_bytes > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM entries ORDER BY accessed LIMIT 64"
+            ).fetchall()
+            if not rows:
+                self.current_bytes = 0
+                return
+            for key, size in rows:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self.current_bytes -= size
+                self.evictions += 1
+                if self.current_bytes <= self.max_bytes:
+                    break
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and size usage"""
+        return {
+            "path": self.path,
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class EmbeddingCache:
+    """
+    Content-addressed two-tier embedding cache
+
+    Entries are keyed by a hash of (model name, variant, text), where the
+    variant identifies the loaded weights and input settings (see
+    EmbeddingGenerator.cache_variant) and text is the exact model input.
+    Lookups check the in-memory LRU first, then the optional on-disk
+    tier; disk hits are promoted into memory. Stored and returned arrays
+    are copies, so callers may modify what they get back.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        memory_bytes: int = 64 * 1024 * 1024,
+        disk_dir: Optional[str] = None,
+        disk_bytes: int = 512 * 1024 * 1024,
+        variant: str = ""
+    ):
+        """
+        Initialize cache
+
+        Args:
+            model_name: Embedding model name, part of every key
+            memory_bytes: Size budget of the in-memory tier
+            disk_dir: Directory for the on-disk tier (None disables it)
+            disk_bytes: Size budget of the on-disk tier
+            variant: Model fingerprint and input settings, part of every key
+                     (set by the EmbeddingGenerator that owns the cache)
+        """
+        self.model_name = model_name
+        self.variant = variant
+        self.memory = LRUCache(memory_bytes, sizeof=lambda value: value.nbytes)
+        self.disk = None
+        if disk_dir:
+            try:
+                self.disk = DiskCache(os.path.join(disk_dir, "embeddings.sqlite3"), disk_bytes)
+            except Exception as e:
+                logger.error(f"Error opening embedding disk cache in {disk_dir}: {str(e)}")
+
+    def key(self, text: str) -> str:
+        """Content hash identifying text under the current model and variant"""
+        digest = hashlib.sha256()
+        digest.update(self.model_name.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(self.variant.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get_many(self, texts: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Look up embeddings for several texts
+
+        Args:
+            texts: Input texts
+
+        Returns:
+            Dictionary of found texts to (writable copies of) their embeddings
+        """
+        found = {}
+        missing = {}
+        for text in texts:
+            if text in found or text in missing:
+                continue
+            key = self.key(text)
+            embedding = self.memory.get(key)
+            if embedding is not None:
+                found[text] = embedding.copy()
+            else:
+                missing[key] = text
+
+        if self.disk is not None and missing:
+            for key, blob in self.disk.get_many(missing).items():
+                embedding = np.frombuffer(blob, dtype=np.float32)
+                self.memory.put(key, embedding)
+                found[missing[key]] = embedding.copy()
+
+        return found
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        """Return the cached embedding for text, or None"""
+        return self.get_many([text]).get(text)
+
+    def put_many(self, embeddings: Dict[str, np.ndarray]) -> None:
+        """Store embeddings for several texts in both tiers"""
+        blobs = {}
+        for text, embedding in embeddings.items():
+            key = self.key(text)
+            # A copy, so later changes to the caller's array do not reach the cache
+            embedding = np.array(embedding, dtype=np.float32)
+            self.memory.put(key, embedding)
+            blobs[key] = embedding.tobytes()
+
+        if self.disk is not None and blobs:
+            self.disk.put_many(blobs)
+
+    def put(self, text: str, embedding: np.ndarray) -> None:
+        """Store the embedding for one text"""
+        self.put_many({text: embedding})
+
+    def stats(self) -> dict:
+        """Return hit/miss counters for both tiers"""
+        if self.disk is not None:
+            hits = self.memory.hits + self.disk.hits
+            misses = self.disk.misses
+        else:
+            hits = self.memory.hits
+            misses = self.memory.misses
+        return {
+            "model": self.model_name,
+            "variant": self.variant,
+            "hits": hits,
+            "misses": misses,
+            "memory": self.memory.stats(),
+            "disk": self.disk.stats() if self.disk is not None else None,
+        }
+
+
+class TextCache:
+    """
+    Extracted-text cache keyed by the SHA-256 of raw file bytes
+
+    Keys carry a version stamp of the extraction/cleaning pipeline, so
+    bumping the version invalidates every cached text. Stale entries age
+    out of the memory tier and are purged from the disk tier on startup.
+    """
+
+    def __init__(
+        self,
+        version: str,
+        memory_bytes: int = 32 * 1024 * 1024,
+        disk_dir: Optional[str] = None,
+        disk_bytes: int = 256 * 1024 * 1024
+    ):
+        """
+        Initialize cache
+
+        Args:
+            version: Version stamp of the text pipeline, part of every key
+            memory_bytes: Size budget of the in-memory tier
+            disk_dir: Directory for the on-disk tier (None disables it)
+            disk_bytes: Size budget of the on-disk tier
+        """
+        self.version = str(version)
+        self.memory = LRUCache(memory_bytes, sizeof=lambda value: len(value.encode("utf-8")))
+        self.disk = None
+        if disk_dir:
+            try:
+                self.disk = DiskCache(os.path.join(disk_dir, "texts.sqlite3"), disk_bytes)
+                purged = self.disk.retain_prefix(f"v{self.version}:")
+                if purged:
+                    logger.info(f"Purged {purged} cached texts from older pipeline versions")
+            except Exception as e:
+                logger.error(f"Error opening text disk cache in {disk_dir}: {str(e)}")
+
+    @staticmethod
+    def digest(file_content: bytes) -> str:
+        """SHA-256 hex digest of raw file bytes"""
+        return hashlib.sha256(file_content).hexdigest()
+
+    def key(self, file_digest: str, filename: str) -> str:
+        """Cache key for a file digest under the current pipeline version"""
+        extension = os.path.splitext(filename)[1].lower()
+        return f"v{self.version}:{extension}:{file_digest}"
+
+    def get(self, file_digest: str, filename: str) -> Optional[str]:
+        """Return the cached text for a file, or None"""
+        key = self.key(file_digest, filename)
+        text = self.memory.get(key)
+        if text is not None:
+            return text
+
+        if self.disk is not None:
+            blob = self.disk.get(key)
+            if blob is not None:
+                text = blob.decode("utf-8")
+                self.memory.put(key, text)
+                return text
+        return None
+
+    def known(self, files: Iterable[Tuple[str, str]]) -> Set[str]:
+        """
+        Digests among files whose text is cached in either tier
+
+        Does not load the texts or count hits. Disk entries found are marked
+        as recently accessed, so a screening request that follows is
+        unlikely to see them evicted.
+
+        Args:
+            files: (file digest, filename) pairs
+
+        Returns:
+            Set of the digests that are cached
+        """
+        keys = {self.key(file_digest, filename): file_digest for file_digest, filename in files}
+        found = {key for key in keys if key in self.memory}
+        if self.disk is not None:
+            found |= self.disk.touch_many(key for key in keys if key not in found)
+        return {keys[key] for key in found}
+
+    def put(self, file_digest: str, filename: str, text: str) -> None:
+        """Store the extracted text for a file in both tiers"""
+        key = self.key(file_digest, filename)
+        self.memory.put(key, text)
+        if self.disk is not None:
+            self.disk.put(key, text.encode("utf-8"))
+
+    def stats(self) -> dict:
+        """Return hit/miss counters for both tiers"""
+        if self.disk is not None:
+            hits = self.memory.hits + self.disk.hits
+            misses = self.disk.misses
+        else:
+            hits = self.memory.hits
+            misses = self.memory.misses
+        return {
+            "version": self.version,
+            "hits": hits,
+            "misses": misses,
+            "memory": self.memory.stats(),
+            "disk": self.disk.stats() if self.disk is not None else None,
+        }
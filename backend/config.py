@@ -24,15 +24,78 @@ class Config:
 
     # Embedding Settings
     EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+    EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", 32))
+    # Opt-in fast mode: cut whole texts to about max_seq_length tokens of
+    # characters before tokenizing them (the model discards the rest anyway);
+    # chunked resumes are never cut
+    EMBEDDING_PRE_TRUNCATE = os.getenv("EMBEDDING_PRE_TRUNCATE", "False") == "True"
+
+    # Embedding cache (in-memory LRU plus optional on-disk tier)
+    EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "True") == "True"
+    EMBEDDING_CACHE_MEMORY_MB = int(os.getenv("EMBEDDING_CACHE_MEMORY_MB", 64))
+    EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", "cache")
+    EMBEDDING_CACHE_DISK_MB = int(os.getenv("EMBEDDING_CACHE_DISK_MB", 512))
+
+    # Extracted-text cache keyed by the SHA-256 of uploaded file bytes
+    TEXT_CACHE_ENABLED = os.getenv("TEXT_CACHE_ENABLED", "True") == "True"
+    TEXT_CACHE_MEMORY_MB = int(os.getenv("TEXT_CACHE_MEMORY_MB", 32))
+    TEXT_CACHE_DIR = os.getenv("TEXT_CACHE_DIR", "cache")
+    TEXT_CACHE_DISK_MB = int(os.getenv("TEXT_CACHE_DISK_MB", 256))
+
+    # Cross-request batching of encode calls
+    BATCHER_MAX_BATCH_SIZE = int(os.getenv("BATCHER_MAX_BATCH_SIZE", 64))
+    BATCHER_MAX_WAIT_MS = float(os.getenv("BATCHER_MAX_WAIT_MS", 5))
 
     # Azure Settings (for production deployment)
     AZURE_OPENAI_KEY = os.getenv("AZURE_OPENAI_KEY", "")
     AZURE_OPENAI_ENDPOINT = os.getenv("AZURE_OPENAI_ENDPOINT", "")
     AZURE_OPENAI_DEPLOYMENT = os.getenv("AZURE_OPENAI_DEPLOYMENT", "")
 
+    # Worker Pool Settings
+    # Extraction runs in separate processes so PDF/DOCX parsing never blocks
+    # the event loop; encoding runs on the embedding batcher's own thread
+    EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", min(4, os.cpu_count() or 1)))
+    # A document running longer than this has its worker killed and replaced
+    EXTRACTION_TIMEOUT_S = float(os.getenv("EXTRACTION_TIMEOUT_S", 30))
+    # Address-space cap per extraction worker (0 disables; Unix only)
+    EXTRACTION_MEMORY_MB = int(os.getenv("EXTRACTION_MEMORY_MB", 1024))
+    # Workers are replaced after this many documents
+    EXTRACTION_MAX_TASKS_PER_WORKER = int(os.getenv("EXTRACTION_MAX_TASKS_PER_WORKER", 100))
+    # multiprocessing start method of the workers (empty: forkserver where
+    # available, else spawn); "fork" is faster to start but can deadlock a
+    # worker forked while another thread of the API holds a lock
+    EXTRACTION_START_METHOD = os.getenv("EXTRACTION_START_METHOD", "")
+
+    # Streaming screening pipeline (used when no BM25 stage is needed):
+    # resumes are extracted PIPELINE_EXTRACT_CONCURRENCY at a time, at most
+    # PIPELINE_QUEUE_SIZE wait for encoding, and PIPELINE_BATCH_SIZE resumes
+    # per batch are encoded PIPELINE_ENCODE_CONCURRENCY batches at a time
+    PIPELINE_BATCH_SIZE = int(os.getenv("PIPELINE_BATCH_SIZE", 32))
+    PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", 64))
+    PIPELINE_EXTRACT_CONCURRENCY = int(
+        os.getenv("PIPELINE_EXTRACT_CONCURRENCY", 2 * EXTRACTION_WORKERS)
+    )
+    PIPELINE_ENCODE_CONCURRENCY = int(os.getenv("PIPELINE_ENCODE_CONCURRENCY", 2))
+
+    # /screen-resumes/stream sends a snapshot of the best STREAM_SNAPSHOT_SIZE
+    # resumes (or top_k) at most every STREAM_SNAPSHOT_INTERVAL_S seconds
+    STREAM_SNAPSHOT_SIZE = int(os.getenv("STREAM_SNAPSHOT_SIZE", 10))
+    STREAM_SNAPSHOT_INTERVAL_S = float(os.getenv("STREAM_SNAPSHOT_INTERVAL_S", 0.5))
+
+    # Stop reading PDF pages after this many characters (0 reads the whole
+    # document; chunked scoring uses all of it)
+    PDF_MAX_CHARS = int(os.getenv("PDF_MAX_CHARS", 0))
+    # DOCX reader: "stream" (zipfile + incremental XML, python-docx as
+    # fallback) or "python-docx"
+    DOCX_ENGINE = os.getenv("DOCX_ENGINE", "stream")
+
     # File Upload Settings
     MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE", 10 * 1024 * 1024))  # 10MB
     ALLOWED_EXTENSIONS = {".pdf", ".docx"}
+    # Uploads are copied to temporary files in chunks of this many bytes and
+    # extracted from there (UPLOAD_TEMP_DIR empty = system temp directory)
+    UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", 64 * 1024))
+    UPLOAD_TEMP_DIR = os.getenv("UPLOAD_TEMP_DIR") or None
 
     # Similarity Threshold Settings
     MIN_SIMILARITY_THRESHOLD = float(os.getenv("MIN_SIMILARITY_THRESHOLD", 0.3))
@@ -45,9 +108,52 @@ class Config:
     # CORS Settings
     CORS_ORIGINS = os.getenv("CORS_ORIGINS", "*").split(",")
 
-    # Database Settings (for future use)
+    # Database Settings (resume corpus metadata and screening jobs)
     DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///resume_screening.db")
 
+    # Asynchronous Screening Jobs
+    # Jobs screened at the same time (later ones wait queued), how often a
+    # running job writes its progress, and how long finished jobs are kept
+    JOB_CONCURRENCY = int(os.getenv("JOB_CONCURRENCY", 2))
+    JOB_PROGRESS_INTERVAL_S = float(os.getenv("JOB_PROGRESS_INTERVAL_S", 0.5))
+    JOB_RETENTION_HOURS = float(os.getenv("JOB_RETENTION_HOURS", 24))
+
+    # Long-Resume Chunking
+    # Resumes are split into chunks that fit the model's sequence length and
+    # chunk scores are pooled per resume: max, mean, top_m, or none (whole
+    # text, truncated by the model)
+    CHUNK_POOLING = os.getenv("CHUNK_POOLING", "max")
+    CHUNK_TOP_M = int(os.getenv("CHUNK_TOP_M", 3))
+    CHUNK_OVERLAP_TOKENS = int(os.getenv("CHUNK_OVERLAP_TOKENS", 0))
+
+    # Hybrid Retrieval Settings
+    # Uploads larger than BM25_SHORTLIST_SIZE are shortlisted lexically before
+    # embedding; HYBRID_FUSION_WEIGHT blends the BM25 score into the final score
+    BM25_SHORTLIST_SIZE = int(os.getenv("BM25_SHORTLIST_SIZE", 200))
+    BM25_K1 = float(os.getenv("BM25_K1", 1.5))
+    BM25_B = float(os.getenv("BM25_B", 0.75))
+    HYBRID_FUSION_WEIGHT = float(os.getenv("HYBRID_FUSION_WEIGHT", 0.0))
+
+    # Resume Corpus Settings
+    CORPUS_MATRIX_PATH = os.getenv("CORPUS_MATRIX_PATH", "data/corpus_embeddings.f32")
+    # Encoding of a new corpus matrix: float32, float16 (half size) or int8 (quarter size)
+    CORPUS_MATRIX_DTYPE = os.getenv("CORPUS_MATRIX_DTYPE", "float32")
+
+    # Approximate nearest-neighbour (IVF) index over the corpus
+    IVF_INDEX_PATH = os.getenv("IVF_INDEX_PATH", "data/corpus_ivf.npz")
+    IVF_NLISTS = int(os.getenv("IVF_NLISTS", 0))  # 0 = about 4 * sqrt(corpus size)
+    IVF_NPROBE = int(os.getenv("IVF_NPROBE", 16))
+
+    # Product-quantization (PQ) index: PQ_SUBVECTORS bytes per resume; the best
+    # PQ_RERANK candidates are rescored against the stored embeddings
+    PQ_INDEX_PATH = os.getenv("PQ_INDEX_PATH", "data/corpus_pq.npz")
+    PQ_SUBVECTORS = int(os.getenv("PQ_SUBVECTORS", 48))
+    PQ_RERANK = int(os.getenv("PQ_RERANK", 200))
+
+    # Binary sign-bit prefilter: Hamming scan, then exact rerank of BINARY_RERANK candidates
+    BINARY_INDEX_PATH = os.getenv("BINARY_INDEX_PATH", "data/corpus_binary.npz")
+    BINARY_RERANK = int(os.getenv("BINARY_RERANK", 2000))
+
 
 class DevelopmentConfig(Config):
     """Development configuration"""
@@ -68,6 +174,22 @@ class TestingConfig(Config):
     LOG_LEVEL = "DEBUG"
 
 
+def sqlite_path(database_url: str) -> str:
+    """
+    Convert a sqlite:/// URL to a path usable by sqlite3.connect
+
+    Args:
+        database_url: URL such as sqlite:///resume_screening.db or sqlite:///:memory:
+
+    Returns:
+        Database file path (or ":memory:")
+    """
+    prefix = "sqlite:///"
+    if not database_url.startswith(prefix):
+        raise ValueError(f"Only sqlite:/// database URLs are supported, got {database_url}")
+    return database_url[len(prefix):]
+
+
 # Get config based on environment
 ENV = os.getenv("ENVIRONMENT", "development")
 
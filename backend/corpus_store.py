@@ -0,0 +1,427 @@
+"""
+Corpus Store Module
+Persists ingested resumes (metadata, cleaned text, embeddings) for repeated screening
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+import numpy as np
+
+from .ranking_engine import RankingEngine
+from .similarity_calculator import SimilarityCalculator
+from .vector_store import VectorStore
+
+logger = logging.getLogger(__name__)
+
+
+class CorpusStore:
+    """
+    Ingest-once / query-many resume store
+
+    Metadata and cleaned text live in SQLite; embeddings live in a
+    memory-mapped VectorStore (float32, float16 or int8), one L2-normalized
+    row per resume, so ranking the whole corpus against a JD is a single
+    blocked matrix-vector product over pages shared by every worker.
+
+    Row numbers are assigned under the VectorStore's inter-process write
+    lock, which is held until the database insert commits, so uvicorn
+    workers ingesting at the same time never claim the same rows. Each
+    search first refreshes the row count from the database, so rows
+    committed by other workers are visible.
+    """
+
+    def __init__(
+        self, db_path: str, matrix_path: str, model_name: str, dimension: int,
+        dtype: str = "float32"
+    ):
+        """
+        Open (or create) the corpus
+
+        Args:
+            db_path: SQLite database file
+            matrix_path: Embedding matrix file
+            model_name: Embedding model the corpus is built with
+            dimension: Embedding dimension
+            dtype: Encoding of a new corpus ("float32", "float16" or "int8");
+                   an existing corpus keeps the encoding it was built with
+
+        Raises:
+            ValueError: If the corpus was built with a different model or dimension
+        """
+        for path in (db_path, matrix_path):
+            directory = os.path.dirname(path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+
+        self.db_path = db_path
+        self.matrix_path = matrix_path
+        self.model_name = model_name
+        self.dimension = dimension
+        self.dtype = dtype
+        self._lock = threading.Lock()
+        self._indexes = {}
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS corpus_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS resumes ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "row INTEGER NOT NULL UNIQUE, "
+            "candidate_name TEXT NOT NULL, "
+            "filename TEXT NOT NULL, "
+            "content_sha256 TEXT NOT NULL UNIQUE, "
+            "text TEXT NOT NULL, "
+            "created_at REAL NOT NULL)"
+        )
+        self._check_meta()
+        self._conn.commit()
+
+        self._vectors = VectorStore(matrix_path, dimension, self.dtype)
+        with self._vectors.locked():
+            self._size = self._committed_rows()
+            self._repair_matrix()
+
+    def _check_meta(self) -> None:
+        """Record the model on first use and refuse to mix models afterwards"""
+        meta = dict(self._conn.execute("SELECT key, value FROM corpus_meta").fetchall())
+        if not meta:
+            self._conn.executemany(
+                "INSERT INTO corpus_meta (key, value) VALUES (?, ?)",
+                [
+                    ("model", self.model_name),
+                    ("dimension", str(self.dimension)),
+                    ("dtype", self.dtype)
+                ]
+            )
+            return
+
+        if meta.get("model") != self.model_name or int(meta.get("dimension", 0)) != self.dimension:
+            raise ValueError(
+                f"Corpus was built with model {meta.get('model')} "
+                f"({meta.get('dimension')} dims), not {self.model_name} ({self.dimension} dims)"
+            )
+
+        # Corpora created before quantization support are float32
+        stored_dtype = meta.get("dtype", "float32")
+        if "dtype" not in meta:
+            self._conn.execute(
+                "INSERT INTO corpus_meta (key, value) VALUES ('dtype', ?)", (stored_dtype,)
+            )
+        if stored_dtype != self.dtype:
+            logger.warning(
+                f"Corpus is stored as {stored_dtype}, not {self.dtype}; "
+                f"run compact_matrix('{self.dtype}') to convert it"
+            )
+            self.dtype = stored_dtype
+
+    def _committed_rows(self) -> int:
+        """Rows committed to the database (rows are numbered from 0 without gaps)"""
+        return self._conn.execute("SELECT COALESCE(MAX(row) + 1, 0) FROM resumes").fetchone()[0]
+
+    def _repair_matrix(self) -> None:
+        """
+        Drop matrix rows written by an ingestion that never committed
+
+        Call with the VectorStore write lock held: an ingestion in progress
+        holds it too, so any extra rows seen here belong to a crashed one.
+        """
+        actual = self._vectors.refresh()
+        if actual < self._size:
+            raise ValueError(
+                f"Embedding matrix {self.matrix_path} has {actual} rows, "
+                f"database has {self._size}"
+            )
+        if actual > self._size:
+            logger.warning(f"Truncating {actual - self._size} uncommitted corpus rows")
+            self._vectors.truncate(self._size)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def refresh(self) -> int:
+        """
+        Pick up resumes committed by other processes, adding them to the
+        attached indexes
+
+        Returns:
+            Number of resumes
+        """
+        with self._lock:
+            previous = self._size
+            self._size = self._committed_rows()
+            self._vectors.refresh(self._size)
+            if self._size > previous:
+                for index, _ in self._indexes.values():
+                    self._catch_up(index, self._size)
+            return self._size
+
+    def _catch_up(self, index, size: int) -> int:
+        """Add rows past the index's max_id (up to size) to an index"""
+        first_missing = index.max_id() + 1
+        block_rows = 65536
+        for start in range(first_missing, size, block_rows):
+            stop = min(start + block_rows, size)
+            index.add(range(start, stop), self._vectors.vectors(start, stop))
+        return max(size - first_missing, 0)
+
+    def find_by_sha256(self, content_sha256: str) -> Optional[int]:
+        """Return the id of an already ingested file, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id FROM resumes WHERE content_sha256 = ?", (content_sha256,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def add(self, records: List[Dict], embeddings: List[np.ndarray]) -> List[int]:
+        """
+        Append resumes to the corpus
+
+        Args:
+            records: Dicts with candidate_name, filename, content_sha256 and text
+            embeddings: One embedding per record
+
+        Returns:
+            Ids of the new resumes, in the same order as records
+        """
+        if not records:
+            return []
+
+        matrix = np.asarray(embeddings, dtype=np.float32).reshape(len(records), self.dimension)
+
+        with self._lock, self._vectors.locked():
+            # Rows of a crashed ingestion would otherwise shift this one's rows
+            self._size = self._committed_rows()
+            self._repair_matrix()
+            missed = self._size
+
+            # Vectors go to disk first; a crash before the commit below leaves
+            # extra rows that _repair_matrix truncates on the next ingestion
+            first_row = self._vectors.append(matrix)
+
+            now = time.time()
+            ids = []
+            try:
+                for offset, record in enumerate(records):
+                    cursor = self._conn.execute(
+                        "INSERT INTO resumes "
+                        "(row, candidate_name, filename, content_sha256, text, created_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (
+                            first_row + offset,
+                            record["candidate_name"],
+                            record["filename"],
+                            record["content_sha256"],
+                            record["text"],
+                            now
+                        )
+                    )
+                    ids.append(cursor.lastrowid)
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                self._vectors.truncate(first_row)
+                raise
+
+            self._size = first_row + len(records)
+
+            for index, _ in self._indexes.values():
+                # Rows other workers committed since this one last looked
+                self._catch_up(index, missed)
+                index.add(range(first_row, first_row + len(records)), matrix)
+        return ids
+
+    def attach_index(self, name: str, index, path: Optional[str] = None) -> None:
+        """
+        Keep an approximate index in sync with the corpus and expose it to search
+
+        Rows ingested after the index was last saved are added on attach.
+
+        Args:
+            name: Method name used in search(method=...)
+            index: Trained index with add, search, max_id and save methods
+            path: File the index is saved to by save_indexes()
+        """
+        with self._lock:
+            self._indexes[name] = (index, path)
+            size = self._size
+
+        added = self._catch_up(index, size)
+        if added:
+            logger.info(f"Added {added} corpus rows to the {name} index")
+
+    def build_index(
+        self, name: str, index, path: Optional[str] = None, sample_size: int = 100000
+    ) -> None:
+        """
+        Train an index on the current corpus, fill it and attach it
+
+        Args:
+            name: Method name used in search(method=...)
+            index: Untrained index with train, add, search, max_id and save methods
+            path: File the index is saved to
+            sample_size: Maximum number of rows decoded for training
+        """
+        size = self.refresh()
+        if size == 0:
+            raise ValueError("Cannot build an index over an empty corpus")
+
+        if size > sample_size:
+            rows = np.sort(np.random.default_rng(0).choice(size, sample_size, replace=False))
+            index.train(self._vectors.take(rows))
+        else:
+            index.train(self._vectors.vectors(0, size))
+        self.attach_index(name, index, path)
+        if path:
+            index.save(path)
+
+    def index_names(self) -> List[str]:
+        """Names of the attached indexes"""
+        return list(self._indexes)
+
+    def save_indexes(self) -> None:
+        """Persist every attached index that has a path"""
+        for name, (index, path) in list(self._indexes.items()):
+            if path:
+                try:
+                    index.save(path)
+                except Exception as e:
+                    logger.error(f"Error saving {name} index: {str(e)}")
+
+    def matrix(self) -> np.ndarray:
+        """Return the (N, d) normalized embedding matrix decoded to float32"""
+        return self._vectors.vectors(0, self.refresh())
+
+    def compact_matrix(self, dtype: Optional[str] = None) -> None:
+        """
+        Offline rewrite of the embedding matrix, e.g. to convert a float32
+        corpus to float16 or int8
+
+        Run it while no other process is ingesting into the same corpus.
+
+        Args:
+            dtype: New encoding (default: unchanged)
+        """
+        with self._lock:
+            self._vectors = self._vectors.compact(dtype=dtype)
+            self.dtype = self._vectors.dtype
+            self._conn.execute(
+                "UPDATE corpus_meta SET value = ? WHERE key = 'dtype'", (self.dtype,)
+            )
+            self._conn.commit()
+
+    def matrix_nbytes(self) -> int:
+        """Size of the stored embedding matrix in bytes"""
+        return self._vectors.nbytes()
+
+    def get_by_rows(self, rows: List[int]) -> List[Dict]:
+        """
+        Fetch metadata for matrix rows
+
+        Args:
+            rows: Matrix row numbers
+
+        Returns:
+            Dicts with id, row, candidate_name and filename, in the same order as rows
+        """
+        if not rows:
+            return []
+
+        rows = [int(row) for row in rows]
+        placeholders = ",".join("?" * len(rows))
+        with self._lock:
+            found = self._conn.execute(
+                f"SELECT id, row, candidate_name, filename FROM resumes WHERE row IN ({placeholders})",
+                rows
+            ).fetchall()
+
+        by_row = {
+            row: {"id": resume_id, "row": row, "candidate_name": name, "filename": filename}
+            for resume_id, row, name, filename in found
+        }
+        return [by_row[row] for row in rows if row in by_row]
+
+    def search(
+        self, query_embedding: np.ndarray, top_k: int = 10, method: str = "exact",
+        rerank: int = 0, **options
+    ) -> List[Dict]:
+        """
+        Rank the stored corpus against a query embedding by cosine similarity
+
+        Args:
+            query_embedding: Job description embedding
+            top_k: Number of results to return
+            method: "exact" for a full scan, or the name of an attached index
+            rerank: With an index, fetch this many candidates and rescore them
+                    against the stored embeddings before keeping top_k
+            options: Search knobs passed to the index (e.g. nprobe)
+
+        Returns:
+            Dicts with id, row, candidate_name, filename and score, best first
+        """
+        if self.refresh() == 0 or top_k <= 0:
+            return []
+
+        if np.linalg.norm(query_embedding) == 0:
+            return []
+
+        if method == "exact":
+            scores = self._vectors.scores(query_embedding)
+            rows = RankingEngine.select_top_k(scores, top_k)
+            scores = scores[rows]
+        elif method in self._indexes:
+            index, _ = self._indexes[method]
+            rows, scores = index.search(query_embedding, max(top_k, rerank), **options)
+            if rerank > 0 and len(rows):
+                exact = np.asarray(
+                    SimilarityCalculator.batch_similarity(
+                        query_embedding, self._vectors.take(rows)
+                    ),
+                    dtype=np.float32
+                )
+                best = RankingEngine.select_top_k(exact, top_k)
+                rows, scores = rows[best], np.clip(exact[best], -1.0, 1.0)
+        else:
+            raise ValueError(f"Unknown search method {method}. Use exact or {self.index_names()}")
+        score_by_row = dict(zip(rows.tolist(), scores.tolist()))
+
+        results = self.get_by_rows(rows.tolist())
+        for result in results:
+            result["score"] = score_by_row[result["row"]]
+        return results
+
+    def close(self) -> None:
+        """Save attached indexes and close the database connection"""
+        self.save_indexes()
+        with self._lock:
+            self._conn.close()
+
+
+if __name__ == "__main__":
+    # Offline compaction, e.g.: python -m backend.corpus_store --dtype int8
+    import argparse
+    from .config import config, sqlite_path
+
+    parser = argparse.ArgumentParser(description="Rewrite the corpus embedding matrix")
+    parser.add_argument("--dtype", choices=VectorStore.DTYPES, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    conn = sqlite3.connect(sqlite_path(config.DATABASE_URL))
+    meta = dict(conn.execute("SELECT key, value FROM corpus_meta").fetchall())
+    conn.close()
+
+    store = CorpusStore(
+        sqlite_path(config.DATABASE_URL), config.CORPUS_MATRIX_PATH,
+        meta["model"], int(meta["dimension"]), meta.get("dtype", "float32")
+    )
+    before = store.matrix_nbytes()
+    store.compact_matrix(args.dtype)
+    print(f"{len(store)} rows, {store.dtype}: {before} -> {store.matrix_nbytes()} bytes")
+    store.close()
@@ -4,21 +4,148 @@ Handles PDF and DOCX text extraction
 """
 
 import io
-from typing import Optional
+import zipfile
+from xml.etree import ElementTree
+from typing import BinaryIO, Iterator, List, Optional, Tuple, Union
 from PyPDF2 import PdfReader
 from docx import Document
 import re
 import logging
 
+from .config import config
+
 logger = logging.getLogger(__name__)
 
+# Version stamp of the extraction and cleaning pipeline. Bump it whenever
+# extract_* or clean_text change their output so cached texts are invalidated.
+TEXT_PIPELINE_VERSION = "2"
+
+# Document bytes, or an open binary file positioned anywhere
+DocumentSource = Union[bytes, BinaryIO]
+
+
+def as_stream(file_content: DocumentSource) -> BinaryIO:
+    """Seekable binary stream over document bytes or an open file (rewound)"""
+    if isinstance(file_content, (bytes, bytearray)):
+        return io.BytesIO(file_content)
+    file_content.seek(0)
+    return file_content
+
+
+def iter_pdf_pages(file_content: DocumentSource) -> Iterator[str]:
+    """
+    Yield the raw text of PDF pages one at a time
+
+    Pages are only parsed when the consumer asks for them, so stopping
+    early skips the rest of the document.
+
+    Args:
+        file_content: PDF file bytes or open binary file
+
+    Yields:
+        Page text ("" for pages without a text layer)
+    """
+    for page in PdfReader(as_stream(file_content)).pages:
+        yield page.extract_text() or ""
+
+
+class _CleanTable(dict):
+    """
+    str.translate table for clean_text: each character maps to its
+    lowercase form with everything but [a-z0-9.] and whitespace blanked
+
+    Filled lazily, one entry per distinct code point seen. Only final
+    sigma lowercases differently in context, and it is blanked either way,
+    so mapping characters one at a time equals text.lower().
+    """
+
+    _KEEP = frozenset("abcdefghijklmnopqrstuvwxyz0123456789.")
+
+    def __missing__(self, codepoint: int) -> str:
+        mapped = "".join(
+            char if char in self._KEEP or char.isspace() else " "
+            for char in chr(codepoint).lower()
+        )
+        self[codepoint] = mapped
+        return mapped
+
+
+_CLEAN_TABLE = _CleanTable()
+# All-digit tokens, or all-digit dot-separated parts of a token ("3.5" -> ".").
+# ASCII matching is exact after _CLEAN_TABLE (only [a-z0-9.] and whitespace
+# are left) and about twice as fast as Unicode \b.
+_NUMBER_PART = re.compile(r"\b\d+\b", re.ASCII)
+
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+# Run content that python-docx's paragraph.text also renders as whitespace
+_DOCX_BREAKS = {_W + "tab": "\t", _W + "br": "\n", _W + "cr": "\n"}
+
+
+def iter_docx_paragraphs(file_content: DocumentSource) -> Iterator[str]:
+    """
+    Yield the text of every paragraph in word/document.xml, in document order
+
+    The part is decompressed and parsed incrementally, and each paragraph
+    is released once emitted. Table cells are just paragraphs here, so a
+    merged cell is read once. Fallback copies of text boxes
+    (mc:Fallback) are skipped.
+
+    Args:
+        file_content: DOCX file bytes or open binary file
+
+    Yields:
+        Paragraph text (table cells, text boxes and body paragraphs alike)
+    """
+    with zipfile.ZipFile(as_stream(file_content)) as archive:
+        with archive.open("word/document.xml") as part:
+            paragraphs: List[List[str]] = []
+            fallback_depth = 0
+            for event, element in ElementTree.iterparse(part, events=("start", "end")):
+                tag = element.tag
+                if tag == _MC_FALLBACK:
+                    fallback_depth += 1 if event == "start" else -1
+                    if event == "end":
+                        element.clear()
+                    continue
+                if fallback_depth:
+                    continue
+
+                if tag == _W + "p":
+                    if event == "start":
+                        paragraphs.append([])
+                    else:
+                        yield "".join(paragraphs.pop())
+                        element.clear()
+                elif event == "end" and paragraphs:
+                    if tag == _W + "t":
+                        paragraphs[-1].append(element.text or "")
+                    elif tag in _DOCX_BREAKS:
+                        paragraphs[-1].append(_DOCX_BREAKS[tag])
+
 
 class DocumentProcessor:
     """Handles text extraction from PDF and DOCX files"""
 
-    def __init__(self):
-        """Initialize document processor"""
+    DOCX_ENGINES = ("stream", "python-docx")
+
+    def __init__(self, pdf_max_chars: Optional[int] = None, docx_engine: str = "stream"):
+        """
+        Initialize document processor
+
+        Args:
+            pdf_max_chars: Stop reading PDF pages once this many characters
+                           were extracted, and cut the text there (None or
+                           0 for the whole document)
+            docx_engine: "stream" (zipfile + incremental XML parsing, falls
+                         back to python-docx on errors) or "python-docx"
+        """
+        if docx_engine not in self.DOCX_ENGINES:
+            raise ValueError(f"Unknown DOCX engine {docx_engine}. Use one of {self.DOCX_ENGINES}")
         self.stopwords = self._load_stopwords()
+        self.pdf_max_chars = pdf_max_chars or None
+        self.docx_engine = docx_engine
 
     def _load_stopwords(self) -> set:
         """Load common English stopwords"""
@@ -30,83 +157,122 @@ class DocumentProcessor:
         }
         return common_stopwords
 
-    def extract_from_pdf(self, file_content: bytes) -> Optional[str]:
+    def extract_from_pdf(self, file_content: DocumentSource) -> Optional[str]:
         """
         Extract text from PDF file
 
+        Pages are streamed and joined once at the end; reading stops at
+        pdf_max_chars.
+
         Args:
-            file_content: PDF file bytes
+            file_content: PDF file bytes or open binary file
 
         Returns:
             Extracted text or None if extraction fails
         """
         try:
-            pdf_reader = PdfReader(io.BytesIO(file_content))
-            text = ""
-
-            for page in pdf_reader.pages:
-                text += page.extract_text()
-
+            pages = iter_pdf_pages(file_content)
+            collected = []
+            total = 0
+            try:
+                for page_text in pages:
+                    collected.append(page_text)
+                    total += len(page_text) + 1
+                    if self.pdf_max_chars and total >= self.pdf_max_chars:
+                        break
+            finally:
+                pages.close()
+
+            text = "\n".join(collected)
+            if self.pdf_max_chars:
+                text = text[:self.pdf_max_chars]
             return self.clean_text(text)
 
+        except MemoryError:
+            raise
         except Exception as e:
             logger.error(f"Error extracting PDF: {str(e)}")
             return None
 
-    def extract_from_docx(self, file_content: bytes) -> Optional[str]:
+    def extract_from_docx(self, file_content: DocumentSource) -> Optional[str]:
         """
         Extract text from DOCX file
 
         Args:
-            file_content: DOCX file bytes
+            file_content: DOCX file bytes or open binary file
 
         Returns:
             Extracted text or None if extraction fails
         """
         try:
-            docx_file = Document(io.BytesIO(file_content))
-            text = ""
+            if self.docx_engine == "stream":
+                try:
+                    return self.clean_text("\n".join(iter_docx_paragraphs(file_content)))
+                except (zipfile.BadZipFile, KeyError, ElementTree.ParseError) as e:
+                    logger.warning(f"Streaming DOCX parse failed, using python-docx: {str(e)}")
 
-            for paragraph in docx_file.paragraphs:
-                text += paragraph.text + "\n"
+            docx_file = Document(as_stream(file_content))
+            parts = [paragraph.text + "\n" for paragraph in docx_file.paragraphs]
 
             for table in docx_file.tables:
                 for row in table.rows:
                     for cell in row.cells:
-                        text += cell.text + " "
+                        parts.append(cell.text + " ")
 
-            return self.clean_text(text)
+            return self.clean_text("".join(parts))
 
+        except MemoryError:
+            raise
         except Exception as e:
             logger.error(f"Error extracting DOCX: {str(e)}")
             return None
 
+    def normalize(self, text: str) -> Tuple[str, List[str]]:
+        """
+        Clean text and split it into tokens
+
+        One str.translate pass lowercases and blanks special characters,
+        one regex pass drops numbers-only tokens, and a single split yields
+        the tokens.
+
+        Args:
+            text: Raw text from document
+
+        Returns:
+            Tuple of (cleaned text, its whitespace-separated tokens)
+        """
+        tokens = _NUMBER_PART.sub("", text.translate(_CLEAN_TABLE)).split()
+        return " ".join(tokens), tokens
+
     def clean_text(self, text: str) -> str:
         """
         Clean and preprocess text
 
+        Lowercases, replaces everything but letters, digits, dots and
+        whitespace with spaces, drops numbers-only tokens and collapses
+        whitespace.
+
         Args:
             text: Raw text from document
 
         Returns:
             Cleaned text
         """
-        # Convert to lowercase
-        text = text.lower()
+        return self.normalize(text)[0]
 
-        # Remove special characters but keep spaces
-        text = re.sub(r'[^a-z0-9\s\.]', ' ', text)
-
-        # Remove extra whitespace
-        text = ' '.join(text.split())
+    def content_tokens(self, text: str) -> List[str]:
+        """
+        Tokens of the cleaned text without stopwords
 
-        # Remove numbers-only tokens
-        text = re.sub(r'\b\d+\b', '', text)
+        Same words as remove_stopwords(clean_text(text)).split().
 
-        # Remove extra spaces again
-        text = ' '.join(text.split())
+        Args:
+            text: Raw text from document
 
-        return text
+        Returns:
+            List of tokens (repeats kept)
+        """
+        return [token for token in self.normalize(text)[1] if token not in self.stopwords]
 
     def remove_stopwords(self, text: str) -> str:
         """
@@ -124,6 +290,23 @@ class DocumentProcessor:
         ]
         return ' '.join(filtered_words)
 
+    def extract_text(self, file_content: DocumentSource, filename: str) -> Optional[str]:
+        """
+        Extract cleaned text based on the file extension
+
+        Args:
+            file_content: File bytes or open binary file
+            filename: Original filename
+
+        Returns:
+            Cleaned text, or None for unsupported or unreadable files
+        """
+        if filename.endswith('.pdf'):
+            return self.extract_from_pdf(file_content)
+        elif filename.endswith('.docx'):
+            return self.extract_from_docx(file_content)
+        return None
+
     def extract_and_preprocess(self, file_content: bytes, filename: str) -> Optional[str]:
         """
         Unified method to extract and preprocess document
@@ -135,13 +318,38 @@ class DocumentProcessor:
         Returns:
             Preprocessed text
         """
-        if filename.endswith('.pdf'):
-            text = self.extract_from_pdf(file_content)
-        elif filename.endswith('.docx'):
-            text = self.extract_from_docx(file_content)
-        else:
-            return None
+        text = self.extract_text(file_content, filename)
 
         if text:
             return self.remove_stopwords(text)
         return None
+
+
+# Per-process instance used by extract_document in worker processes
+_worker_processor: Optional[DocumentProcessor] = None
+
+
+def extract_document(file_content: Union[bytes, str], filename: str) -> Optional[str]:
+    """
+    Extract cleaned text from a document inside a worker process
+
+    Module-level so it can be pickled for a ProcessPoolExecutor.
+
+    Args:
+        file_content: File bytes, or the path of a spooled upload, which
+                      is read through a file handle instead of being sent
+                      to the worker
+        filename: Original filename
+
+    Returns:
+        Cleaned text, or None for unsupported or unreadable files
+    """
+    global _worker_processor
+    if _worker_processor is None:
+        _worker_processor = DocumentProcessor(
+            pdf_max_chars=config.PDF_MAX_CHARS, docx_engine=config.DOCX_ENGINE
+        )
+    if isinstance(file_content, str):
+        with open(file_content, "rb") as handle:
+            return _worker_processor.extract_text(handle, filename)
+    return _worker_processor.extract_text(file_content, filename)
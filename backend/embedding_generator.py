@@ -3,19 +3,53 @@ Embedding Generator Module
 Generates semantic embeddings using Azure OpenAI or open-source models
 """
 
+import hashlib
 import os
-from typing import List
+import re
+from typing import Any, Dict, List, Optional, Tuple
 import numpy as np
 import logging
 from sentence_transformers import SentenceTransformer
 
+from .cache import EmbeddingCache
+
 logger = logging.getLogger(__name__)
 
 
 class EmbeddingGenerator:
     """Generates semantic embeddings for text using SentenceTransformer"""
 
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    # Pre-truncation keeps TRUNCATE_MARGIN times the calibrated character
+    # budget, so the tokenizer still sees a little more than the model keeps
+    TRUNCATE_MARGIN = 1.25
+    # Characters per text tokenized when calibrating the budget
+    CALIBRATION_CHARS = 4096
+    # Fixed, resume-like samples the budget is calibrated on at load time
+    # (cleaned text, as the screening endpoints encode it)
+    CALIBRATION_SAMPLES = (
+        "senior software engineer with eight years of experience building python "
+        "services and data pipelines led migration of a monolith to kubernetes on aws "
+        "reducing deployment time from hours to minutes mentored four engineers and "
+        "introduced code review and continuous integration practices",
+        "skills python java typescript sql postgresql redis kafka docker kubernetes "
+        "terraform aws gcp pytorch scikit-learn pandas numpy fastapi django react "
+        "graphql grpc airflow spark elasticsearch prometheus grafana",
+        "education master of science in computer science 2015 university of "
+        "washington bachelor of engineering 2013 certifications aws certified "
+        "solutions architect 2021 certified kubernetes administrator 2022 languages "
+        "english spanish german",
+    )
+    # Encoded once at load time to read the dimension and dtype and to
+    # fingerprint the weights
+    PROBE_TEXT = "Senior Python developer with machine learning experience"
+
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        batch_size: int = 32,
+        cache: Optional[EmbeddingCache] = None,
+        pre_truncate: bool = False
+    ):
         """
         Initialize embedding generator
 
@@ -24,8 +58,18 @@ class EmbeddingGenerator:
                        - "all-MiniLM-L6-v2" (lightweight, 384 dimensions)
                        - "all-mpnet-base-v2" (better quality, 768 dimensions)
                        - For production: Use Azure OpenAI text-embedding-ada-002
+            batch_size: Number of texts encoded per forward pass in batch mode
+            cache: Optional EmbeddingCache consulted before encoding
+            pre_truncate: Cut whole texts to about max_seq_length tokens worth
+                          of characters before tokenization (see
+                          truncate_for_model); the budget is calibrated once,
+                          here, on CALIBRATION_SAMPLES
         """
         self.model_name = model_name
+        self.batch_size = batch_size
+        self.cache = cache
+        self.pre_truncate = pre_truncate
+        self.truncate_chars: Optional[int] = None
         try:
             self.model = SentenceTransformer(model_name)
             logger.info(f"Loaded embedding model: {model_name}")
@@ -33,13 +77,67 @@ class EmbeddingGenerator:
             logger.error(f"Error loading model {model_name}: {str(e)}")
             # Fallback to lightweight model
             self.model = SentenceTransformer("all-MiniLM-L6-v2")
+        self._load_metadata()
+        if self.pre_truncate:
+            self.calibrate_truncation()
+        if self.cache is not None:
+            self.cache.variant = self.cache_variant()
 
-    def generate_embedding(self, text: str) -> np.ndarray:
+    def _load_metadata(self) -> None:
+        """Read dimension, sequence length, dtype and fingerprint of the loaded model"""
+        probe = np.asarray(self.model.encode(self.PROBE_TEXT, convert_to_numpy=True))
+        self.dimension = int(probe.shape[-1])
+        self.dtype = probe.dtype
+        self.max_seq_length = getattr(self.model, "max_seq_length", None)
+
+        # Rounded so that the fingerprint survives tiny numeric differences
+        # between BLAS backends, but changes with the weights
+        digest = hashlib.sha256()
+        digest.update(f"{self.dimension}:{self.max_seq_length}:".encode("utf-8"))
+        digest.update(np.round(probe.astype(np.float64), 4).tobytes())
+        self.fingerprint = digest.hexdigest()[:16]
+        logger.info(
+            f"Model metadata: dimension={self.dimension}, "
+            f"max_seq_length={self.max_seq_length}, dtype={self.dtype}, "
+            f"fingerprint={self.fingerprint}"
+        )
+
+    def cache_variant(self) -> str:
+        """
+        Cache key component for everything besides the text that shapes an
+        embedding: the weights fingerprint and the pre-truncation setting
+
+        Returns:
+            Variant string for EmbeddingCache
+        """
+        truncation = f"pre{self.truncate_chars}" if self.pre_truncate else "full"
+        return f"{self.fingerprint}:{truncation}"
+
+    def model_info(self) -> Dict[str, Any]:
+        """
+        Metadata of the loaded model, computed once at load time
+
+        Returns:
+            Dictionary with model_name, dimension, max_seq_length, dtype,
+            fingerprint and batch_size
+        """
+        return {
+            "model_name": self.model_name,
+            "dimension": self.dimension,
+            "max_seq_length": self.max_seq_length,
+            "dtype": str(self.dtype),
+            "fingerprint": self.fingerprint,
+            "batch_size": self.batch_size
+        }
+
+    def generate_embedding(self, text: str, fitted: bool = False) -> np.ndarray:
         """
         Generate embedding vector for input text
 
         Args:
             text: Input text to embed
+            fitted: The text already fits the sequence length (e.g. a
+                    chunk_texts chunk) and is never pre-truncated
 
         Returns:
             Embedding vector as numpy array
@@ -47,45 +145,308 @@ class EmbeddingGenerator:
         try:
             if not text or not text.strip():
                 logger.warning("Empty text provided for embedding")
-                return np.zeros(self.get_embedding_dimension())
+                return self._zero_vector()
+
+            # Cache by the text the model sees, so pre-truncated and fitted
+            # inputs never share an entry unless they are identical
+            model_input = self._model_input(text, fitted)
+            if self.cache is not None:
+                cached = self.cache.get(model_input)
+                if cached is not None:
+                    return cached
 
             # Generate embedding
-            embedding = self.model.encode(text, convert_to_numpy=True)
+            embedding = self.model.encode(model_input, convert_to_numpy=True)
+
+            if self.cache is not None:
+                self.cache.put(model_input, embedding)
 
             return embedding
 
         except Exception as e:
             logger.error(f"Error generating embedding: {str(e)}")
-            return np.zeros(self.get_embedding_dimension())
+            return self._zero_vector()
 
-    def generate_batch_embeddings(self, texts: List[str]) -> List[np.ndarray]:
+    def generate_batch_embeddings(
+        self,
+        texts: List[str],
+        batch_size: Optional[int] = None,
+        lengths: Optional[List[int]] = None,
+        fitted: Optional[List[bool]] = None
+    ) -> List[np.ndarray]:
         """
         Generate embeddings for multiple texts efficiently
 
+        Empty texts get a zero vector, like in generate_embedding. If the
+        batched pass fails, each text is retried on its own so that a single
+        bad input does not zero out the whole batch.
+
         Args:
             texts: List of text strings
+            batch_size: Texts per forward pass (defaults to self.batch_size)
+            lengths: Token count of each text, if known (e.g. from chunk_texts);
+                     character counts are used for bucketing otherwise. Texts
+                     with known lengths are never pre-truncated.
+            fitted: Per text, whether it already fits the sequence length
+                    (e.g. a chunk_texts chunk) and must not be pre-truncated
 
         Returns:
-            List of embedding vectors
+            List of embedding vectors, in the same order as texts
         """
-        try:
-            embeddings = self.model.encode(texts, convert_to_numpy=True)
-            return list(embeddings)
+        if not texts:
+            return []
+        if lengths is not None:
+            fitted = [True] * len(texts)
+        elif fitted is None:
+            fitted = [False] * len(texts)
 
-        except Exception as e:
-            logger.error(f"Error generating batch embeddings: {str(e)}")
-            return [np.zeros(self.get_embedding_dimension()) for _ in texts]
+        valid_indices = [i for i, text in enumerate(texts) if text and text.strip()]
+        if len(valid_indices) < len(texts):
+            logger.warning(
+                f"{len(texts) - len(valid_indices)} empty texts provided for batch embedding"
+            )
+        if not valid_indices:
+            return [self._zero_vector() for _ in texts]
+
+        # Cache by the text the model sees (see generate_embedding)
+        inputs = {i: self._model_input(texts[i], fitted[i]) for i in valid_indices}
+        cached = {}
+        if self.cache is not None:
+            cached = self.cache.get_many(list(inputs.values()))
+
+        to_encode = [i for i in valid_indices if inputs[i] not in cached]
+        encoded = []
+        if to_encode:
+            try:
+                encoded = self._encode_bucketed(
+                    [inputs[i] for i in to_encode],
+                    batch_size or self.batch_size,
+                    [lengths[i] for i in to_encode] if lengths is not None else None,
+                    [True] * len(to_encode)
+                )
+
+                if self.cache is not None:
+                    self.cache.put_many(
+                        {inputs[i]: embedding for i, embedding in zip(to_encode, encoded)}
+                    )
+
+            except Exception as e:
+                logger.error(f"Error generating batch embeddings, retrying per item: {str(e)}")
+                encoded = [self.generate_embedding(texts[i], fitted[i]) for i in to_encode]
+
+        embeddings = [None] * len(texts)
+        for i in valid_indices:
+            embeddings[i] = cached.get(inputs[i])
+        for i, embedding in zip(to_encode, encoded):
+            embeddings[i] = embedding
+
+        if len(valid_indices) < len(texts):
+            embeddings = [
+                embedding if embedding is not None else self._zero_vector()
+                for embedding in embeddings
+            ]
+
+        return embeddings
+
+    def _encode_bucketed(
+        self,
+        texts: List[str],
+        batch_size: int,
+        lengths: Optional[List[int]] = None,
+        fitted: Optional[List[bool]] = None
+    ) -> np.ndarray:
+        """
+        Encode texts in length-sorted buckets of batch_size
+
+        Each forward pass pads to its longest member, so grouping texts of
+        similar length keeps padding (wasted attention work) small.
+
+        Args:
+            texts: Non-empty texts
+            batch_size: Texts per forward pass
+            lengths: Token counts used for sorting (character counts if None)
+            fitted: Per text, whether to skip pre-truncation (default: none)
+
+        Returns:
+            (len(texts), d) array in the order of texts
+        """
+        fitted = fitted or [False] * len(texts)
+        if lengths is None:
+            lengths = [len(text) for text in texts]
+        order = np.argsort(np.asarray(lengths), kind="stable")
+
+        encoded = None
+        for start in range(0, len(order), batch_size):
+            bucket = order[start:start + batch_size]
+            vectors = self.model.encode(
+                [self._model_input(texts[i], fitted[i]) for i in bucket],
+                batch_size=len(bucket),
+                convert_to_numpy=True
+            )
+            if encoded is None:
+                encoded = np.empty((len(texts), vectors.shape[1]), dtype=vectors.dtype)
+            encoded[bucket] = vectors
+        return encoded
+
+    def calibrate_truncation(self, texts: Optional[List[str]] = None) -> int:
+        """
+        Set the pre-truncation character budget from sample texts
+
+        The budget is the model's token limit times the largest
+        characters-per-token ratio seen in the samples (each tokenized up to
+        CALIBRATION_CHARS), times TRUNCATE_MARGIN. It does not depend on the
+        texts being encoded, so every request is cut the same way.
+
+        Args:
+            texts: Representative texts (default: CALIBRATION_SAMPLES)
+
+        Returns:
+            Character budget
+        """
+        texts = self.CALIBRATION_SAMPLES if texts is None else texts
+        samples = [text[:self.CALIBRATION_CHARS] for text in texts if text and text.strip()]
+        ratios = [
+            len(sample) / len(spans)
+            for sample, spans in zip(samples, self._token_spans(samples))
+            if spans
+        ]
+        # English WordPiece text averages about 4-5 characters per token
+        chars_per_token = max(ratios) if ratios else 5.0
+        self.truncate_chars = int(
+            self.max_chunk_tokens() * chars_per_token * self.TRUNCATE_MARGIN
+        )
+        logger.info(
+            f"Pre-truncation budget: {self.truncate_chars} characters "
+            f"({chars_per_token:.2f} characters per token)"
+        )
+        return self.truncate_chars
+
+    def truncate_for_model(self, text: str) -> str:
+        """
+        Cut text to the character budget, ending on whitespace
+
+        Tokenizing text past max_seq_length is wasted work: the model drops
+        those tokens anyway. The budget is calibrated on CALIBRATION_SAMPLES
+        if calibrate_truncation has not run.
+
+        Args:
+            text: Input text
+
+        Returns:
+            Text of at most truncate_chars characters
+        """
+        if self.truncate_chars is None:
+            self.calibrate_truncation()
+        if len(text) <= self.truncate_chars:
+            return text
+        head = text[:self.truncate_chars + 1]
+        cut = max(head.rfind(" "), head.rfind("\n"))
+        return text[:cut if cut > 0 else self.truncate_chars]
+
+    def _model_input(self, text: str, fitted: bool = False) -> str:
+        """Text as passed to the model (pre-truncated in fast mode unless fitted)"""
+        return self.truncate_for_model(text) if self.pre_truncate and not fitted else text
+
+    def max_chunk_tokens(self) -> int:
+        """Content tokens that fit in one forward pass (special tokens excluded)"""
+        max_seq_length = getattr(self.model, "max_seq_length", None) or 256
+        return max(max_seq_length - 2, 1)
+
+    def _token_spans(self, texts: List[str]) -> List[List[Tuple[int, int]]]:
+        """Character span of every token, from the model tokenizer when it has offsets"""
+        tokenizer = getattr(self.model, "tokenizer", None)
+        if tokenizer is not None and getattr(tokenizer, "is_fast", False):
+            encoded = tokenizer(
+                texts, add_special_tokens=False, return_offsets_mapping=True, verbose=False
+            )
+            return [list(map(tuple, offsets)) for offsets in encoded["offset_mapping"]]
+        # Slow or missing tokenizer: approximate tokens by words
+        return [[match.span() for match in re.finditer(r"\S+", text)] for text in texts]
+
+    def chunk_texts(
+        self, texts: List[str], max_tokens: Optional[int] = None, overlap: int = 0
+    ) -> Tuple[List[str], np.ndarray, List[int]]:
+        """
+        Split texts into chunks that each fit the model's sequence length
+
+        Chunks end on word boundaries where possible. Every text yields at
+        least one chunk (empty texts yield an empty chunk, encoded as a zero
+        vector), and chunks of the same text are consecutive.
+
+        Args:
+            texts: List of text strings
+            max_tokens: Tokens per chunk (default: max_chunk_tokens())
+            overlap: Tokens repeated at the start of the next chunk
+
+        Returns:
+            Tuple of (chunks, owner index of each chunk, token count of each chunk)
+        """
+        texts = [text or "" for text in texts]
+        max_tokens = max_tokens or self.max_chunk_tokens()
+        overlap = min(max(overlap, 0), max_tokens - 1)
+
+        chunks, owners, lengths = [], [], []
+        for owner, (text, spans) in enumerate(zip(texts, self._token_spans(texts))):
+            n_tokens = len(spans)
+            if n_tokens <= max_tokens:
+                chunks.append(text)
+                owners.append(owner)
+                lengths.append(n_tokens)
+                continue
+
+            starts = np.fromiter((span[0] for span in spans), dtype=np.int64, count=n_tokens)
+            ends = np.fromiter((span[1] for span in spans), dtype=np.int64, count=n_tokens)
+            # A token starts a word unless it continues the previous one (e.g. "##ing")
+            word_start = np.ones(n_tokens, dtype=bool)
+            word_start[1:] = starts[1:] != ends[:-1]
+
+            first = 0
+            while first < n_tokens:
+                stop = min(first + max_tokens, n_tokens)
+                if stop < n_tokens and not word_start[stop]:
+                    boundaries = np.flatnonzero(word_start[first + 1:stop])
+                    if len(boundaries):
+                        stop = first + 1 + int(boundaries[-1])
+                chunks.append(text[starts[first]:ends[stop - 1]])
+                owners.append(owner)
+                lengths.append(stop - first)
+                if stop >= n_tokens:
+                    break
+                first = max(stop - overlap, first + 1)
+
+        return chunks, np.asarray(owners, dtype=np.int64), lengths
+
+    def generate_chunked_embeddings(
+        self, texts: List[str], batch_size: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Encode every chunk of every text in length-bucketed batches
+
+        Args:
+            texts: List of text strings
+            batch_size: Chunks per forward pass (defaults to self.batch_size)
+
+        Returns:
+            Tuple of ((n_chunks, d) chunk embeddings, owner index of each chunk)
+        """
+        chunks, owners, lengths = self.chunk_texts(texts)
+        embeddings = self.generate_batch_embeddings(chunks, batch_size, lengths)
+        if not embeddings:
+            return np.empty((0, 0), dtype=np.float32), owners
+        return np.vstack(embeddings), owners
 
     def get_embedding_dimension(self) -> int:
         """
         Get dimension of embedding vectors
 
         Returns:
-            Embedding dimension
+            Embedding dimension (read at load time, no model call)
         """
-        # Create a dummy embedding to determine dimension
-        dummy_embedding = self.model.encode("test")
-        return len(dummy_embedding)
+        return self.dimension
+
+    def _zero_vector(self) -> np.ndarray:
+        """Embedding returned for empty or failed texts"""
+        return np.zeros(self.dimension, dtype=self.dtype)
 
     def normalize_embedding(self, embedding: np.ndarray) -> np.ndarray:
         """
@@ -0,0 +1,296 @@
+"""
+Extraction Pool Module
+Worker processes for PDF/DOCX extraction with per-document timeouts,
+an address-space cap and worker recycling
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Union
+
+from .document_processor import extract_document
+
+try:
+    import resource
+except ImportError:  # Windows: no RLIMIT_AS
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Per-file outcomes besides "ok"
+FAILED = "failed"
+TIMEOUT = "timeout"
+MEMORY_LIMIT = "memory_limit"
+CRASHED = "crashed"
+
+
+def extraction_result(
+    status: str, text: Optional[str] = None, error: Optional[str] = None
+) -> Dict:
+    """Structured outcome of one extraction"""
+    return {"status": status, "text": text, "error": error}
+
+
+def _address_space_bytes() -> int:
+    """Current virtual memory size of this process (0 where /proc is missing)"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+def _worker_main(conn, extract: Callable, memory_bytes: Optional[int]) -> None:
+    """Worker process: extract documents received on conn until None arrives"""
+    if memory_bytes and resource is not None:
+        # Relative to what the worker already maps: a forked worker shares
+        # the API process's (copy-on-write) model memory
+        limit = _address_space_bytes() + memory_bytes
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ValueError, OSError) as e:
+            logger.warning(f"Could not cap extraction worker memory: {str(e)}")
+
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+
+        file_content, filename = task
+        try:
+            text = extract(file_content, filename)
+            if text:
+                result = extraction_result("ok", text)
+            else:
+                result = extraction_result(FAILED, error="No text could be extracted")
+        except MemoryError:
+            result = extraction_result(MEMORY_LIMIT, error="Worker memory limit exceeded")
+        except Exception as e:
+            result = extraction_result(FAILED, error=str(e))
+        conn.send(result)
+        if result["status"] == MEMORY_LIMIT:
+            # The heap may be fragmented near the cap; let the pool start a fresh worker
+            return
+
+
+class _ExtractTask:
+    """A document waiting for a worker"""
+
+    def __init__(self, file_content: Union[bytes, str], filename: str):
+        self.file_content = file_content
+        self.filename = filename
+        self.future = Future()
+
+
+class ExtractionPool:
+    """
+    Process pool for document extraction that survives pathological files
+
+    Each of the n_workers slots is a thread that owns one worker process
+    and hands it one document at a time. A document that runs past
+    timeout_s gets its worker killed and replaced; workers may grow their
+    address space (RLIMIT_AS) by at most memory_mb and are recycled after
+    max_tasks_per_worker documents. Every submission resolves to a result dict (status, text,
+    error) instead of raising, so one bad file only fails itself.
+    """
+
+    def __init__(
+        self,
+        n_workers: int = 4,
+        timeout_s: float = 30.0,
+        memory_mb: Optional[int] = 1024,
+        max_tasks_per_worker: int = 100,
+        extract: Callable = extract_document,
+        start_method: Optional[str] = None
+    ):
+        """
+        Initialize the pool (processes start on first use)
+
+        Args:
+            n_workers: Documents extracted in parallel
+            timeout_s: Wall-clock limit per document (0 or None for none)
+            memory_mb: Address space a worker may add beyond what it maps at
+                       start-up (0 or None for no limit)
+            max_tasks_per_worker: Documents a worker handles before it is replaced
+            extract: Picklable function (file_content or path, filename) -> text
+            start_method: multiprocessing start method (default: "forkserver"
+                          where available, "spawn" otherwise). Workers are then
+                          forked from a small single-threaded server instead of
+                          the API process, whose model, batcher and SQLite
+                          threads could hold a lock at fork time and deadlock
+                          the child. "fork" starts faster and is an explicit
+                          opt-in for processes without such threads.
+        """
+        self.n_workers = max(1, n_workers)
+        self.timeout_s = timeout_s or None
+        self.memory_bytes = memory_mb * 1024 * 1024 if memory_mb else None
+        self.max_tasks_per_worker = max(1, max_tasks_per_worker)
+        self.extract = extract
+        if not start_method:
+            start_method = (
+                "forkserver" if "forkserver" in multiprocessing.get_all_start_methods()
+                else "spawn"
+            )
+        self._context = multiprocessing.get_context(start_method)
+        if start_method == "forkserver":
+            # Import the extractors once in the server rather than in every worker
+            self._context.set_forkserver_preload([__name__])
+        self._queue = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start the slot threads if they are not running"""
+        with self._lock:
+            if self._threads:
+                return
+            self._threads = [
+                threading.Thread(target=self._run, name=f"extraction-slot-{i}", daemon=True)
+                for i in range(self.n_workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+            logger.info(
+                f"Started extraction pool (workers={self.n_workers}, "
+                f"timeout={self.timeout_s}s, memory_bytes={self.memory_bytes}, "
+                f"max_tasks_per_worker={self.max_tasks_per_worker})"
+            )
+
+    def shutdown(self, cancel_futures: bool = True, timeout: float = 5.0) -> None:
+        """
+        Stop the slot threads and their worker processes
+
+        Args:
+            cancel_futures: Cancel documents that have not started yet
+            timeout: Seconds to wait for each slot thread
+        """
+        with self._lock:
+            threads, self._threads = self._threads, []
+        if cancel_futures:
+            while True:
+                try:
+                    task = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if task is not None:
+                    task.future.cancel()
+        for _ in threads:
+            self._queue.put(None)
+        for thread in threads:
+            thread.join(timeout)
+
+    def submit(self, file_content: Union[bytes, str], filename: str) -> Future:
+        """
+        Queue a document for extraction
+
+        Args:
+            file_content: File bytes, or the path of a file the worker opens
+                          itself (only the path crosses the pipe)
+            filename: Original filename
+
+        Returns:
+            Future resolving to a result dict with status ("ok", "failed",
+            "timeout", "memory_limit" or "crashed"), text and error
+        """
+        self.start()
+        task = _ExtractTask(file_content, filename)
+        self._queue.put(task)
+        return task.future
+
+    async def extract_async(self, file_content: Union[bytes, str], filename: str) -> Dict:
+        """Extract a document without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(file_content, filename))
+
+    def _start_worker(self):
+        """Spawn a worker process and return (process, parent connection)"""
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(child_conn, self.extract, self.memory_bytes),
+            name="extraction-worker",
+            daemon=True
+        )
+        process.start()
+        child_conn.close()
+        return process, parent_conn
+
+    @staticmethod
+    def _stop_worker(process, conn, kill: bool = False) -> None:
+        """Ask a worker to exit (or kill it) and release its pipe"""
+        if process is None:
+            return
+        if not kill and process.is_alive():
+            try:
+                conn.send(None)
+                process.join(1.0)
+            except (OSError, ValueError):
+                pass
+        if process.is_alive():
+            process.kill()
+        process.join()
+        conn.close()
+
+    def _run(self) -> None:
+        """Slot loop: feed documents to one worker, replacing it as needed"""
+        process, conn, handled = None, None, 0
+        while True:
+            task = self._queue.get()
+            if task is None:
+                self._stop_worker(process, conn)
+                return
+            if not task.future.set_running_or_notify_cancel():
+                continue
+
+            if process is None or not process.is_alive() or handled >= self.max_tasks_per_worker:
+                self._stop_worker(process, conn)
+                process = None
+                try:
+                    process, conn = self._start_worker()
+                except Exception as e:
+                    # Keep the slot alive; the next document tries a new worker
+                    logger.error(f"Could not start an extraction worker: {str(e)}")
+                    task.future.set_result(extraction_result(
+                        CRASHED, error=f"Could not start an extraction worker: {str(e)}"
+                    ))
+                    continue
+                handled = 0
+            handled += 1
+
+            try:
+                conn.send((task.file_content, task.filename))
+                if conn.poll(self.timeout_s):
+                    result = conn.recv()
+                    if result["status"] == MEMORY_LIMIT:
+                        # The worker exits after a MemoryError; wait for it
+                        self._stop_worker(process, conn)
+                        process = None
+                else:
+                    logger.error(
+                        f"Extraction of {task.filename} timed out after {self.timeout_s}s"
+                    )
+                    result = extraction_result(
+                        TIMEOUT, error=f"Extraction exceeded {self.timeout_s}s"
+                    )
+                    self._stop_worker(process, conn, kill=True)
+                    process = None
+            except (EOFError, OSError) as e:
+                process.join(1.0)
+                logger.error(
+                    f"Extraction worker died on {task.filename} "
+                    f"(exit code {process.exitcode}): {str(e)}"
+                )
+                result = extraction_result(
+                    CRASHED, error=f"Worker exited with code {process.exitcode}"
+                )
+                self._stop_worker(process, conn, kill=True)
+                process = None
+
+            task.future.set_result(result)
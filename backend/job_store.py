@@ -0,0 +1,266 @@
+"""
+Job Store Module
+Persists asynchronous screening jobs (status, progress counters, results)
+in SQLite
+"""
+
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+INTERRUPTED = "interrupted"
+
+# Progress counters tracked per job
+PROGRESS_FIELDS = ("parsed", "embedded", "scored", "failed")
+
+
+class JobStore:
+    """
+    SQLite table of screening jobs
+
+    A job is created queued with the number of uploaded files, moves to
+    running, reports progress counters while it works and ends done or
+    failed with the HTTP status and JSON body its synchronous endpoint
+    would have returned. Each job records the process that owns it
+    (hostname:pid:token). Jobs still queued or running when their owner
+    has exited are marked interrupted, since their uploads are gone; jobs
+    of other live server processes sharing the database are left alone.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Open (or create) the job table
+
+        Args:
+            db_path: SQLite database file (shared with the corpus)
+        """
+        self.hostname = socket.gethostname()
+        # The token tells this process apart from an earlier one that had
+        # the same pid (e.g. pid 1 in a restarted container)
+        self.owner = f"{self.hostname}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        directory = os.path.dirname(db_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS screening_jobs ("
+            "id TEXT PRIMARY KEY, "
+            "status TEXT NOT NULL, "
+            "params TEXT NOT NULL, "
+            "total_files INTEGER NOT NULL, "
+            "parsed INTEGER NOT NULL DEFAULT 0, "
+            "embedded INTEGER NOT NULL DEFAULT 0, "
+            "scored INTEGER NOT NULL DEFAULT 0, "
+            "failed INTEGER NOT NULL DEFAULT 0, "
+            "http_status INTEGER, "
+            "result TEXT, "
+            "error TEXT, "
+            "created_at REAL NOT NULL, "
+            "started_at REAL, "
+            "finished_at REAL, "
+            "owner TEXT)"
+        )
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(screening_jobs)")}
+        if "owner" not in columns:
+            # Tables created before jobs recorded their owner
+            self._conn.execute("ALTER TABLE screening_jobs ADD COLUMN owner TEXT")
+        self._conn.commit()
+
+    def create(self, params: Dict, total_files: int) -> str:
+        """
+        Record a new queued job
+
+        Args:
+            params: Screening parameters (JSON-serializable)
+            total_files: Number of uploaded files
+
+        Returns:
+            Job id
+        """
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO screening_jobs (id, status, params, total_files, created_at, owner) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, QUEUED, json.dumps(params), total_files, time.time(), self.owner)
+            )
+            self._conn.commit()
+        return job_id
+
+    def mark_running(self, job_id: str) -> None:
+        """Move a queued job to running"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE screening_jobs SET status = ?, started_at = ? WHERE id = ?",
+                (RUNNING, time.time(), job_id)
+            )
+            self._conn.commit()
+
+    def update_progress(self, job_id: str, progress: Dict[str, int]) -> None:
+        """
+        Store the current progress counters of a job
+
+        Args:
+            job_id: Job id
+            progress: Counts for any of PROGRESS_FIELDS
+        """
+        fields = [field for field in PROGRESS_FIELDS if field in progress]
+        if not fields:
+            return
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE screening_jobs SET {', '.join(f'{f} = ?' for f in fields)} WHERE id = ?",
+                [progress[field] for field in fields] + [job_id]
+            )
+            self._conn.commit()
+
+    def finish(
+        self,
+        job_id: str,
+        status: str,
+        http_status: int,
+        result: Optional[Dict] = None,
+        error: Optional[str] = None
+    ) -> None:
+        """
+        Record the outcome of a job
+
+        Args:
+            job_id: Job id
+            status: DONE or FAILED
+            http_status: Status code the synchronous endpoint would have returned
+            result: Response body
+            error: Error message for failed jobs
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE screening_jobs SET status = ?, http_status = ?, result = ?, error = ?, "
+                "finished_at = ? WHERE id = ?",
+                (
+                    status,
+                    http_status,
+                    json.dumps(result) if result is not None else None,
+                    error,
+                    time.time(),
+                    job_id
+                )
+            )
+            self._conn.commit()
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """
+        Look up a job
+
+        Args:
+            job_id: Job id
+
+        Returns:
+            Dict of the job's columns (params and result decoded), or None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM screening_jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["params"] = json.loads(job["params"])
+        job["result"] = json.loads(job["result"]) if job["result"] is not None else None
+        return job
+
+    def recover(self) -> int:
+        """
+        Mark unfinished jobs whose owning process has exited as interrupted
+
+        Jobs without an owner predate owner tracking and are treated as
+        orphaned. Jobs owned by another host cannot be checked and are
+        left to that host.
+
+        Returns:
+            Number of jobs marked interrupted
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, owner FROM screening_jobs WHERE status IN (?, ?)",
+                (QUEUED, RUNNING)
+            ).fetchall()
+            orphaned = [(row["id"],) for row in rows if not self._owner_alive(row["owner"])]
+            self._conn.executemany(
+                "UPDATE screening_jobs SET status = ?, error = ?, finished_at = ? "
+                "WHERE id = ? AND status IN (?, ?)",
+                [
+                    (
+                        INTERRUPTED,
+                        "Server restarted before the job finished",
+                        time.time(),
+                        job_id,
+                        QUEUED,
+                        RUNNING
+                    )
+                    for (job_id,) in orphaned
+                ]
+            )
+            self._conn.commit()
+        if orphaned:
+            logger.warning(f"Marked {len(orphaned)} unfinished screening jobs as interrupted")
+        return len(orphaned)
+
+    def _owner_alive(self, owner: Optional[str]) -> bool:
+        """Whether the process recorded as a job's owner may still be running"""
+        if not owner:
+            return False
+        if owner == self.owner:
+            return True
+        hostname, pid, _ = owner.rsplit(":", 2)
+        if hostname != self.hostname:
+            return True
+        if int(pid) == os.getpid():
+            # Same pid, different token: an earlier run of this process
+            return False
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    def purge(self, max_age_s: float) -> int:
+        """
+        Delete finished jobs older than max_age_s
+
+        Args:
+            max_age_s: Age in seconds since the job finished
+
+        Returns:
+            Number of deleted jobs
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM screening_jobs WHERE finished_at IS NOT NULL AND finished_at < ?",
+                (time.time() - max_age_s,)
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
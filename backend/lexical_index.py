@@ -0,0 +1,136 @@
+"""
+Lexical Index Module
+In-memory BM25 inverted index used to shortlist resumes before embedding
+"""
+
+import logging
+import math
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+from .document_processor import DocumentProcessor
+from .ranking_engine import RankingEngine
+
+logger = logging.getLogger(__name__)
+
+
+class BM25Index:
+    """
+    Okapi BM25 over the tokens DocumentProcessor produces
+
+    Documents are tokenized with DocumentProcessor.content_tokens (trailing
+    sentence dots stripped), so the lexical stage sees the same words as
+    the rest of the pipeline. Postings are term -> (doc ids, term
+    frequencies); a query only touches the postings of its own terms.
+    """
+
+    def __init__(
+        self, k1: float = 1.5, b: float = 0.75, processor: Optional[DocumentProcessor] = None
+    ):
+        """
+        Initialize index
+
+        Args:
+            k1: Term-frequency saturation
+            b: Document-length normalization (0 = none, 1 = full)
+            processor: DocumentProcessor used for tokenization
+        """
+        self.k1 = k1
+        self.b = b
+        self.processor = processor or DocumentProcessor()
+        self._postings: Dict[str, Tuple[List[int], List[int]]] = {}
+        self._arrays: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._lengths: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def tokenize(self, text: str) -> List[str]:
+        """
+        Split text into index terms
+
+        Args:
+            text: Raw or already cleaned text
+
+        Returns:
+            List of terms (repeats kept)
+        """
+        tokens = (token.strip(".") for token in self.processor.content_tokens(text))
+        return [token for token in tokens if token]
+
+    def add(self, texts: List[str]) -> None:
+        """
+        Index documents; ids continue from the current size
+
+        Args:
+            texts: Document texts
+        """
+        for text in texts:
+            doc_id = len(self._lengths)
+            counts = Counter(self.tokenize(text or ""))
+            self._lengths.append(sum(counts.values()))
+            for term, count in counts.items():
+                doc_ids, frequencies = self._postings.setdefault(term, ([], []))
+                doc_ids.append(doc_id)
+                frequencies.append(count)
+        self._arrays.clear()
+
+    def _posting_arrays(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Doc ids and term frequencies of a term as arrays (cached)"""
+        if term not in self._arrays:
+            posting = self._postings.get(term)
+            if posting is None:
+                return None
+            self._arrays[term] = (
+                np.asarray(posting[0], dtype=np.int64),
+                np.asarray(posting[1], dtype=np.float32)
+            )
+        return self._arrays[term]
+
+    def scores(self, query: str) -> np.ndarray:
+        """
+        BM25 score of every document for a query
+
+        Args:
+            query: Query text (e.g. a job description)
+
+        Returns:
+            Array of scores, one per document (0 for no matching term)
+        """
+        n_docs = len(self._lengths)
+        scores = np.zeros(n_docs, dtype=np.float32)
+        if n_docs == 0:
+            return scores
+
+        lengths = np.asarray(self._lengths, dtype=np.float32)
+        average_length = max(float(lengths.mean()), 1.0)
+        length_norm = self.k1 * (1.0 - self.b + self.b * lengths / average_length)
+
+        for term in set(self.tokenize(query)):
+            posting = self._posting_arrays(term)
+            if posting is None:
+                continue
+            doc_ids, frequencies = posting
+            df = len(doc_ids)
+            idf = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+            # Each document appears once per posting, so plain fancy-index += is safe
+            scores[doc_ids] += idf * frequencies * (self.k1 + 1.0) / (
+                frequencies + length_norm[doc_ids]
+            )
+        return scores
+
+    def top_n(self, query: str, n: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Best n documents for a query
+
+        Args:
+            query: Query text
+            n: Number of documents (None for all)
+
+        Returns:
+            Tuple of (document ids, scores), best first; ties keep insertion order
+        """
+        scores = self.scores(query)
+        indices = RankingEngine.select_top_k(scores, n)
+        return indices, scores[indices]
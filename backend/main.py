@@ -4,20 +4,61 @@ Handles document upload, embedding generation, and similarity calculation
 """
 
 from fastapi import FastAPI, UploadFile, File, Form
-from fastapi.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List
+from typing import Callable, List, Optional, Sequence, Tuple
+import asyncio
+import functools
+import json
+import logging
 import os
+import time
+import numpy as np
 from dotenv import load_dotenv
 
-from document_processor import DocumentProcessor
-from embedding_generator import EmbeddingGenerator
-from similarity_calculator import SimilarityCalculator
-from models import RankingResult, RankedResume
+from backend.config import config, sqlite_path
+from backend.batch_scheduler import EmbeddingBatcher
+from backend.ann_index import BinaryIndex, IVFIndex, PQIndex
+from backend.corpus_store import CorpusStore
+from backend.extraction_pool import ExtractionPool, extraction_result
+from backend.job_store import DONE, FAILED, INTERRUPTED, PROGRESS_FIELDS, JobStore
+from backend.lexical_index import BM25Index
+from backend.screening_pipeline import ScreeningPipeline
+from backend.uploads import discard, is_digest, spool_upload
+from backend.cache import EmbeddingCache, TextCache
+from backend.document_processor import TEXT_PIPELINE_VERSION
+from backend.embedding_generator import EmbeddingGenerator
+from backend.similarity_calculator import SimilarityCalculator
+from backend.ranking_engine import RankingEngine, TopKHeap
+from backend.models import (
+    CorpusSearchResult,
+    DigestNegotiation,
+    IngestedResume,
+    IngestResult,
+    JobRanking,
+    JobStatus,
+    JobSubmission,
+    MatrixScreeningResult,
+    ModelInfo,
+    NegotiationResult,
+    ResumeBestJob,
+    RankingResult,
+    RankedResume,
+)
+
+if __name__ == "__main__":
+    # Serve through the package entry point before the model is loaded, so
+    # extraction workers do not re-run this module (see backend/__main__.py)
+    import runpy
+    runpy.run_module("backend", run_name="__main__", alter_sys=True)
+    raise SystemExit
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 app = FastAPI(
     title="Resume Screening API",
     description="AI-powered resume screening using semantic embeddings",
@@ -34,9 +75,437 @@ app.add_middleware(
 )
 
 # Initialize components
-doc_processor = DocumentProcessor()
-embedding_gen = EmbeddingGenerator()
+embedding_cache = None
+if config.EMBEDDING_CACHE_ENABLED:
+    embedding_cache = EmbeddingCache(
+        config.EMBEDDING_MODEL,
+        memory_bytes=config.EMBEDDING_CACHE_MEMORY_MB * 1024 * 1024,
+        disk_dir=config.EMBEDDING_CACHE_DIR or None,
+        disk_bytes=config.EMBEDDING_CACHE_DISK_MB * 1024 * 1024
+    )
+text_cache = None
+if config.TEXT_CACHE_ENABLED:
+    # Texts read with another PDF budget or DOCX engine must not be served from the cache
+    text_cache = TextCache(
+        f"{TEXT_PIPELINE_VERSION}:pdf{config.PDF_MAX_CHARS}:{config.DOCX_ENGINE}",
+        memory_bytes=config.TEXT_CACHE_MEMORY_MB * 1024 * 1024,
+        disk_dir=config.TEXT_CACHE_DIR or None,
+        disk_bytes=config.TEXT_CACHE_DISK_MB * 1024 * 1024
+    )
+embedding_gen = EmbeddingGenerator(
+    model_name=config.EMBEDDING_MODEL,
+    batch_size=config.EMBEDDING_BATCH_SIZE,
+    cache=embedding_cache,
+    pre_truncate=config.EMBEDDING_PRE_TRUNCATE
+)
 similarity_calc = SimilarityCalculator()
+embedding_batcher = EmbeddingBatcher(
+    embedding_gen,
+    max_batch_size=config.BATCHER_MAX_BATCH_SIZE,
+    max_wait_ms=config.BATCHER_MAX_WAIT_MS
+)
+extraction_pool = ExtractionPool(
+    n_workers=config.EXTRACTION_WORKERS,
+    timeout_s=config.EXTRACTION_TIMEOUT_S,
+    memory_mb=config.EXTRACTION_MEMORY_MB,
+    max_tasks_per_worker=config.EXTRACTION_MAX_TASKS_PER_WORKER,
+    start_method=config.EXTRACTION_START_METHOD or None
+)
+
+try:
+    corpus_store = CorpusStore(
+        sqlite_path(config.DATABASE_URL),
+        config.CORPUS_MATRIX_PATH,
+        config.EMBEDDING_MODEL,
+        embedding_gen.get_embedding_dimension(),
+        dtype=config.CORPUS_MATRIX_DTYPE
+    )
+except Exception as e:
+    logger.error(f"Resume corpus unavailable: {str(e)}")
+    corpus_store = None
+
+try:
+    job_store = JobStore(sqlite_path(config.DATABASE_URL))
+except Exception as e:
+    logger.error(f"Screening jobs unavailable: {str(e)}")
+    job_store = None
+# Screening jobs running at the same time, and the tasks that run them
+job_slots = asyncio.Semaphore(config.JOB_CONCURRENCY)
+job_tasks = set()
+
+INDEX_TYPES = {
+    "ivf": (IVFIndex, config.IVF_INDEX_PATH),
+    "pq": (PQIndex, config.PQ_INDEX_PATH),
+    "binary": (BinaryIndex, config.BINARY_INDEX_PATH)
+}
+
+# Candidates rescored exactly when a search names no rerank depth
+DEFAULT_RERANK = {"pq": config.PQ_RERANK, "binary": config.BINARY_RERANK}
+
+for index_name, (index_class, index_path) in INDEX_TYPES.items():
+    if corpus_store is not None and os.path.exists(index_path):
+        try:
+            corpus_store.attach_index(index_name, index_class.load(index_path), index_path)
+        except Exception as e:
+            logger.error(f"Error loading {index_name} index: {str(e)}")
+
+
+@app.on_event("startup")
+async def startup():
+    """Start background workers"""
+    embedding_batcher.start()
+    if job_store is not None:
+        job_store.recover()
+        job_store.purge(config.JOB_RETENTION_HOURS * 3600)
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Stop background workers"""
+    for task in list(job_tasks):
+        task.cancel()
+    embedding_batcher.stop()
+    extraction_pool.shutdown(cancel_futures=True)
+    if corpus_store is not None:
+        corpus_store.close()
+    if job_store is not None:
+        job_store.close()
+
+
+POOLINGS = ("none",) + RankingEngine.POOLINGS
+
+
+async def score_resumes(
+    queries: List[str],
+    texts: List[str],
+    pooling: str,
+    query_embeddings: Optional[List[np.ndarray]] = None,
+    progress: Optional[Callable[[str, int], None]] = None
+) -> np.ndarray:
+    """
+    Cosine scores of resume texts against one or more queries
+
+    Queries and resumes are embedded in one batched pass. Unless pooling
+    is "none", resumes are split into model-sized chunks and the chunk
+    scores are pooled per resume, so text past the model's sequence
+    length still counts.
+
+    Args:
+        queries: Job description texts
+        texts: Resume texts
+        pooling: "none", "max", "mean" or "top_m"
+        query_embeddings: Already computed embeddings of queries (skips
+                          encoding them again)
+        progress: Optional callback, called with ("embedded", len(texts))
+                  once the resumes are encoded
+
+    Returns:
+        (len(queries), len(texts)) score matrix
+    """
+    if pooling == "none":
+        chunks, owners = texts, None
+    else:
+        loop = asyncio.get_running_loop()
+        chunks, owners, _ = await loop.run_in_executor(
+            None,
+            functools.partial(embedding_gen.chunk_texts, overlap=config.CHUNK_OVERLAP_TOKENS),
+            texts
+        )
+
+    # Chunks already fit the model and are never pre-truncated; the batcher
+    # still encodes them with the queries in one pass
+    if query_embeddings is None:
+        query_embeddings, embeddings = await asyncio.gather(
+            embedding_batcher.encode(list(queries)),
+            embedding_batcher.encode(list(chunks), fitted=owners is not None)
+        )
+    else:
+        embeddings = await embedding_batcher.encode(list(chunks), fitted=owners is not None)
+    if progress is not None:
+        progress("embedded", len(texts))
+    scores = RankingEngine(embeddings).score_matrix(query_embeddings)
+    if owners is None:
+        return scores
+    return RankingEngine.pool_scores(scores, owners, len(texts), pooling, config.CHUNK_TOP_M)
+
+
+def lexical_scores(query: str, texts: List[str]) -> np.ndarray:
+    """BM25 scores of texts for a query, from a throwaway in-memory index"""
+    index = BM25Index(k1=config.BM25_K1, b=config.BM25_B)
+    index.add(texts)
+    return index.scores(query)
+
+
+def resume_entry(filename: str) -> dict:
+    """Initial extraction record of an uploaded file (unsupported until spooled)"""
+    return {
+        "name": os.path.splitext(filename)[0],
+        "filename": filename,
+        "digest": None,
+        "text": None,
+        "status": "unsupported",
+        "error": "Only PDF and DOCX files are supported"
+    }
+
+
+async def spool_resume(resume_file: UploadFile) -> Tuple[dict, Optional[dict]]:
+    """
+    Stream a PDF/DOCX upload into a temporary file
+
+    The upload is rejected as soon as it passes MAX_FILE_SIZE, so an
+    oversized file is never held in memory.
+
+    Args:
+        resume_file: Uploaded resume file
+
+    Returns:
+        Tuple of (resume_entry dict, spool_upload result or None when the
+        file is unsupported, too large or empty)
+    """
+    entry = resume_entry(resume_file.filename)
+    if not resume_file.filename.endswith(('.pdf', '.docx')):
+        return entry, None
+
+    try:
+        spooled = await spool_upload(
+            resume_file,
+            config.MAX_FILE_SIZE,
+            chunk_size=config.UPLOAD_CHUNK_SIZE,
+            temp_dir=config.UPLOAD_TEMP_DIR
+        )
+    except Exception as e:
+        logger.error(f"Error reading upload {entry['filename']}: {str(e)}")
+        entry.update(extraction_result("failed", error=str(e)))
+        return entry, None
+
+    if spooled["status"] != "ok":
+        entry.update(status=spooled["status"], error=spooled["error"])
+        return entry, None
+    entry["digest"] = spooled["digest"]
+    return entry, spooled
+
+
+def known_resume(filename: str, digest: str) -> Tuple[dict, None]:
+    """
+    Source for a resume the client did not upload because the server
+    reported its digest as known (see /resumes/negotiate)
+
+    Args:
+        filename: Original filename
+        digest: SHA-256 hex digest of the file's bytes
+
+    Returns:
+        (entry, None) pair for extract_spooled; the entry stays "unseen"
+        if the text has left the cache since the negotiation
+    """
+    entry = resume_entry(filename)
+    if filename.endswith(('.pdf', '.docx')):
+        entry.update(
+            digest=digest,
+            status="unseen",
+            error="The server no longer has this file's text; upload it again"
+        )
+    return entry, None
+
+
+def known_resumes_sources(
+    known_resumes: Optional[str]
+) -> Tuple[List[Tuple[dict, None]], Optional[str]]:
+    """
+    Parse the known_resumes form field of the screening endpoints
+
+    Args:
+        known_resumes: JSON list of {"filename": ..., "digest": ...} objects
+                       (None or empty for none)
+
+    Returns:
+        Tuple of (known_resume sources, validation error or None)
+    """
+    if not known_resumes:
+        return [], None
+    try:
+        items = json.loads(known_resumes)
+        sources = [known_resume(item["filename"], item["digest"]) for item in items]
+    except (ValueError, TypeError, KeyError, AttributeError):
+        return [], "known_resumes must be a JSON list of {filename, digest} objects"
+    if not all(is_digest(entry["digest"]) for entry, _ in sources if entry["digest"]):
+        return [], "known_resumes digests must be SHA-256 hex digests"
+    return sources, None
+
+
+async def extract_spooled(source: Tuple[dict, Optional[dict]]) -> dict:
+    """
+    Extract cleaned text from a spooled upload in the extraction pool
+
+    A worker reads the temporary file, which is deleted once its
+    extraction finishes. Files whose bytes were extracted before are
+    served from the text cache, whose SQLite tier is read and written on
+    the default executor rather than the event loop. A file that fails,
+    times out or exhausts its worker's memory only marks its own entry.
+
+    Args:
+        source: (entry, spooled) pair from spool_resume or known_resume
+
+    Returns:
+        The entry with name, filename, digest, text, status ("ok",
+        "unsupported", "too_large", "empty", "unseen", "failed",
+        "timeout", "memory_limit" or "crashed") and error
+    """
+    entry, spooled = source
+    loop = asyncio.get_running_loop()
+    if spooled is None:
+        # A known_resume is read from the text cache alone
+        if entry["status"] == "unseen" and text_cache is not None:
+            cached_text = await loop.run_in_executor(
+                None, text_cache.get, entry["digest"], entry["filename"]
+            )
+            if cached_text is not None:
+                entry.update(extraction_result("ok", cached_text))
+        return entry
+
+    submitted = None
+    try:
+        cached_text = None
+        if text_cache is not None:
+            cached_text = await loop.run_in_executor(
+                None, text_cache.get, entry["digest"], entry["filename"]
+            )
+        if cached_text is not None:
+            entry.update(extraction_result("ok", cached_text))
+            return entry
+
+        submitted = extraction_pool.submit(spooled["path"], entry["filename"])
+        submitted.add_done_callback(functools.partial(_discard_spooled, spooled["path"]))
+        entry.update(await asyncio.wrap_future(submitted))
+    except Exception as e:
+        logger.error(f"Error extracting {entry['filename']}: {str(e)}")
+        entry.update(extraction_result("failed", error=str(e)))
+        return entry
+    finally:
+        if submitted is None:
+            # Never reached a worker (cached text, failed submit or
+            # cancellation), so no done-callback deletes the file
+            discard(spooled["path"])
+
+    if entry["status"] == "ok" and text_cache is not None:
+        await loop.run_in_executor(
+            None, text_cache.put, entry["digest"], entry["filename"], entry["text"]
+        )
+    return entry
+
+
+async def extract_resume(resume_file: UploadFile) -> dict:
+    """Spool and extract one uploaded resume (see spool_resume and extract_spooled)"""
+    return await extract_spooled(await spool_resume(resume_file))
+
+
+async def extract_source(source) -> dict:
+    """Extract an UploadFile (extract_resume) or a known_resume pair (extract_spooled)"""
+    if isinstance(source, tuple):
+        return await extract_spooled(source)
+    return await extract_resume(source)
+
+
+async def extract_resumes(resumes: List[UploadFile]) -> List[dict]:
+    """
+    Extract every uploaded resume concurrently (see extract_resume)
+
+    Args:
+        resumes: Uploaded resume files
+
+    Returns:
+        One extract_resume dict per file, in upload order
+    """
+    return list(await asyncio.gather(*[extract_resume(resume) for resume in resumes]))
+
+
+async def screen_streaming(
+    jd_text: str,
+    sources: Sequence,
+    extract: Callable,
+    top_k: Optional[int],
+    pooling: str,
+    progress: Callable[[str, int], None],
+    on_scored: Optional[Callable[[List[Tuple[dict, float]]], None]] = None
+):
+    """
+    Rank resumes through the ScreeningPipeline instead of stage by stage
+
+    Extraction of later resumes overlaps the encoding of earlier batches,
+    scores feed a running top-k heap and each resume text is dropped once
+    scored. Only valid without a BM25 stage, which needs every text.
+
+    Args:
+        jd_text: Job description text
+        sources: Resumes in upload order, in the form extract accepts
+        extract: Coroutine function turning a source into an extraction record
+        top_k: Candidates to return (None for all)
+        pooling: "none", "max", "mean" or "top_m"
+        progress: Callback receiving ("embedded" or "scored", count)
+        on_scored: Optional callback receiving (entry, score) pairs per scored batch
+
+    Returns:
+        RankingResult, or a 400 JSONResponse when no resume was readable
+    """
+    query_embeddings = await embedding_batcher.encode([jd_text])
+
+    async def score(texts: List[str]) -> np.ndarray:
+        scores = (await score_resumes(
+            [jd_text], texts, pooling, query_embeddings, progress
+        ))[0]
+        progress("scored", len(texts))
+        return scores
+
+    pipeline = ScreeningPipeline(
+        extract,
+        score,
+        batch_size=config.PIPELINE_BATCH_SIZE,
+        queue_size=config.PIPELINE_QUEUE_SIZE,
+        extract_concurrency=config.PIPELINE_EXTRACT_CONCURRENCY,
+        encode_concurrency=config.PIPELINE_ENCODE_CONCURRENCY,
+        on_scored=on_scored
+    )
+    ranking, unreadable, scored = await pipeline.run(sources, top_k)
+    failures = failed_files(unreadable)
+
+    if not scored:
+        return JSONResponse(
+            status_code=400,
+            content={
+                "error": "No valid resumes provided",
+                "failed_files": failures
+            }
+        )
+
+    return RankingResult(
+        total_resumes=scored,
+        ranked_resumes=[
+            RankedResume(
+                rank=rank,
+                candidate_name=resume["name"],
+                similarity_score=round(score, 4),
+                filename=resume["filename"]
+            )
+            for rank, (score, _, resume) in enumerate(ranking, 1)
+        ],
+        status="success",
+        shortlisted=scored,
+        failed_files=failures
+    )
+
+
+def _discard_spooled(path: str, _future) -> None:
+    """Done-callback that deletes an upload's temporary file"""
+    discard(path)
+
+
+def failed_files(extracted: List[dict]) -> List[dict]:
+    """FileFailure records for everything extract_resumes could not read"""
+    return [
+        {"filename": entry["filename"], "status": entry["status"], "error": entry["error"]}
+        for entry in extracted
+        if entry["status"] != "ok"
+    ]
 
 
 @app.get("/")
@@ -49,96 +518,698 @@ async def root():
     }
 
 
+@app.get("/model-info", response_model=ModelInfo)
+async def model_info():
+    """Metadata of the loaded embedding model (computed at startup)"""
+    return ModelInfo(**embedding_gen.model_info())
+
+
+def screening_options(
+    job_description: str,
+    uploads: int,
+    top_k: Optional[int],
+    shortlist_size: Optional[int],
+    fusion_weight: Optional[float],
+    semantic_only: bool,
+    pooling: Optional[str],
+    known_resumes: Optional[str]
+) -> Tuple[dict, List[Tuple[dict, None]], Optional[str]]:
+    """
+    Validate and default the form fields shared by the screening endpoints
+
+    Args:
+        job_description: Job description text as posted
+        uploads: Number of uploaded resume files
+        top_k, shortlist_size, fusion_weight, semantic_only, pooling,
+        known_resumes: Form fields of /screen-resumes
+
+    Returns:
+        Tuple of (run_screening keyword arguments besides sources and
+        extract, known_resume sources, validation error or None)
+    """
+    options = {
+        "jd_text": job_description.strip(),
+        "top_k": top_k,
+        "shortlist_size": config.BM25_SHORTLIST_SIZE if shortlist_size is None else shortlist_size,
+        "fusion_weight": config.HYBRID_FUSION_WEIGHT if fusion_weight is None else fusion_weight,
+        "semantic_only": semantic_only,
+        "pooling": pooling or config.CHUNK_POOLING
+    }
+    known, error = known_resumes_sources(known_resumes)
+
+    if not options["jd_text"]:
+        error = "Job description cannot be empty"
+    elif top_k is not None and top_k < 1:
+        error = "top_k must be at least 1"
+    elif options["shortlist_size"] < 1:
+        error = "shortlist_size must be at least 1"
+    elif not 0.0 <= options["fusion_weight"] <= 1.0:
+        error = "fusion_weight must be between 0 and 1"
+    elif options["pooling"] not in POOLINGS:
+        error = f"Unknown pooling {options['pooling']}. Use one of {list(POOLINGS)}"
+    elif not error and not uploads and not known:
+        error = "No resumes provided"
+    return options, known, error
+
+
+async def run_screening(
+    jd_text: str,
+    sources: Sequence,
+    extract: Callable,
+    top_k: Optional[int],
+    shortlist_size: int,
+    fusion_weight: float,
+    semantic_only: bool,
+    pooling: str,
+    progress: Optional[Callable[[str, int], None]] = None,
+    on_scored: Optional[Callable[[List[Tuple[dict, float]]], None]] = None
+):
+    """
+    Rank resumes against one job description (the work behind /screen-resumes
+    and screening jobs; see screen_resumes for the BM25 and streaming paths)
+
+    Args:
+        jd_text: Job description text (validated)
+        sources: Resumes in upload order, in the form extract accepts
+        extract: Coroutine function turning a source into an extraction
+                 record (extract_source for uploads and known_resume
+                 pairs, extract_spooled for spool_resume pairs)
+        top_k: Candidates to return (None for all shortlisted)
+        shortlist_size: Resumes kept by the BM25 stage
+        fusion_weight: Weight of the max-normalized BM25 score, 0-1
+        semantic_only: Skip the BM25 stage and embed every resume
+        pooling: "none", "max", "mean" or "top_m"
+        progress: Optional callback receiving (counter, increment) as files
+                  are parsed ("parsed", plus "failed" for unreadable ones),
+                  embedded ("embedded") and scored ("scored")
+        on_scored: Optional callback receiving (extraction record, final
+                   score) pairs: per encoded batch when streaming, once
+                   for the whole shortlist on the BM25 path
+
+    Returns:
+        RankingResult, or a 400 JSONResponse when no resume was readable
+    """
+    report = progress or (lambda counter, increment: None)
+
+    async def extract_counted(source) -> dict:
+        entry = await extract(source)
+        report("parsed", 1)
+        if entry["status"] != "ok":
+            report("failed", 1)
+        return entry
+
+    # Without a lexical stage, stream uploads straight into encoding
+    if semantic_only or (fusion_weight == 0 and len(sources) <= shortlist_size):
+        return await screen_streaming(
+            jd_text, sources, extract_counted, top_k, pooling, report, on_scored
+        )
+
+    # Otherwise process resumes and extract text
+    extracted = list(await asyncio.gather(*[extract_counted(source) for source in sources]))
+    resume_data = [resume for resume in extracted if resume["status"] == "ok"]
+    failures = failed_files(extracted)
+
+    if not resume_data:
+        return JSONResponse(
+            status_code=400,
+            content={
+                "error": "No valid resumes provided",
+                "failed_files": failures
+            }
+        )
+
+    # Shortlist lexically so only the best candidates are embedded
+    candidates = np.arange(len(resume_data))
+    bm25 = None
+    if not semantic_only and (len(resume_data) > shortlist_size or fusion_weight > 0):
+        loop = asyncio.get_running_loop()
+        bm25 = await loop.run_in_executor(
+            None, lexical_scores, jd_text, [resume["text"] for resume in resume_data]
+        )
+        if bm25.max() > 0:
+            candidates = RankingEngine.select_top_k(bm25, shortlist_size)
+        else:
+            logger.info(
+                "No resume shares a term with the job description; skipping shortlist"
+            )
+
+    # Embed the JD and the candidates (chunked) in one batched pass
+    semantic = (await score_resumes(
+        [jd_text], [resume_data[i]["text"] for i in candidates], pooling, progress=report
+    ))[0]
+    report("scored", len(candidates))
+
+    # Optionally fuse BM25 and keep the best top_k
+    final = semantic
+    if bm25 is not None:
+        lexical = bm25[candidates]
+        if lexical.max() > 0:
+            lexical = lexical / lexical.max()
+        if fusion_weight > 0:
+            final = (1.0 - fusion_weight) * semantic + fusion_weight * lexical
+    order = RankingEngine.select_top_k(final, top_k)
+    if on_scored is not None:
+        on_scored([(resume_data[i], float(score)) for i, score in zip(candidates, final)])
+
+    # Build response objects only for the returned candidates
+    ranked_resumes = [
+        RankedResume(
+            rank=rank,
+            candidate_name=resume_data[candidates[j]]["name"],
+            similarity_score=round(float(final[j]), 4),
+            filename=resume_data[candidates[j]]["filename"],
+            semantic_score=round(float(semantic[j]), 4) if bm25 is not None else None,
+            lexical_score=round(float(lexical[j]), 4) if bm25 is not None else None
+        )
+        for rank, j in enumerate(order, 1)
+    ]
+
+    return RankingResult(
+        total_resumes=len(resume_data),
+        ranked_resumes=ranked_resumes,
+        status="success",
+        shortlisted=len(candidates),
+        failed_files=failures
+    )
+
+
+@app.post("/resumes/negotiate", response_model=NegotiationResult)
+async def negotiate_resumes(request: DigestNegotiation):
+    """
+    First step of a hash-first upload: report which resumes must be sent
+
+    The client hashes its files (SHA-256 of the raw bytes) and posts
+    filename/digest pairs. Digests whose extracted text the server
+    already holds need not be uploaded again: the client lists them in
+    the known_resumes field of a screening request instead, and their
+    text and embeddings come from the caches.
+
+    Args:
+        request: DigestNegotiation with the client's filenames and digests
+
+    Returns:
+        NegotiationResult: Digests to upload, in request order, and the
+        number of known ones
+    """
+    if not all(is_digest(resume.digest) for resume in request.resumes):
+        return JSONResponse(
+            status_code=400,
+            content={"error": "Digests must be SHA-256 hex digests"}
+        )
+
+    files = [(resume.digest, resume.filename) for resume in request.resumes]
+    known = set()
+    if text_cache is not None:
+        loop = asyncio.get_running_loop()
+        known = await loop.run_in_executor(None, text_cache.known, files)
+    unseen = list(dict.fromkeys(digest for digest, _ in files if digest not in known))
+    n_known = sum(digest in known for digest, _ in files)
+    logger.info(f"Digest negotiation: {n_known} known, {len(unseen)} to upload")
+    return NegotiationResult(unseen=unseen, known=n_known)
+
+
 @app.post("/screen-resumes", response_model=RankingResult)
 async def screen_resumes(
     job_description: str = Form(...),
-    resumes: List[UploadFile] = File(...)
+    resumes: Optional[List[UploadFile]] = File(None),
+    top_k: Optional[int] = Form(None),
+    shortlist_size: Optional[int] = Form(None),
+    fusion_weight: Optional[float] = Form(None),
+    semantic_only: bool = Form(False),
+    pooling: Optional[str] = Form(None),
+    known_resumes: Optional[str] = Form(None)
 ):
     """
     Main endpoint for resume screening
 
+    When more resumes than shortlist_size are uploaded, a BM25 pass over
+    the extracted text keeps the shortlist_size best lexical matches and
+    only those are embedded and ranked. Otherwise (or with semantic_only)
+    every resume is embedded, and the upload streams through the
+    ScreeningPipeline: extraction, encoding and top-k selection overlap.
+
     Args:
         job_description: Job description text
         resumes: List of resume files (PDF/DOCX)
+        top_k: Return only the best top_k candidates (default: all shortlisted)
+        shortlist_size: Resumes kept by the BM25 stage (default: BM25_SHORTLIST_SIZE)
+        fusion_weight: Weight of the max-normalized BM25 score in the final
+                       score, 0-1 (default: HYBRID_FUSION_WEIGHT)
+        semantic_only: Skip the BM25 stage and embed every resume
+        pooling: How chunk scores of a long resume are combined: "max",
+                 "mean", "top_m" or "none" (default: CHUNK_POOLING)
+        known_resumes: JSON list of {"filename", "digest"} objects for
+                       resumes /resumes/negotiate reported as known; they
+                       are screened from cached text after the uploads
 
     Returns:
         RankingResult: Ranked resumes with similarity scores
     """
     try:
-        # Step 1: Extract text from job description
-        jd_text = job_description.strip()
-        if not jd_text:
-            return JSONResponse(
-                status_code=400,
-                content={"error": "Job description cannot be empty"}
-            )
+        options, known, error = screening_options(
+            job_description, len(resumes or []), top_k, shortlist_size,
+            fusion_weight, semantic_only, pooling, known_resumes
+        )
+        if error:
+            return JSONResponse(status_code=400, content={"error": error})
+
+        return await run_screening(
+            sources=list(resumes or []) + known, extract=extract_source, **options
+        )
+
+    except Exception as e:
+        return JSONResponse(
+            status_code=500,
+            content={"error": f"Error processing resumes: {str(e)}"}
+        )
+
+
+STREAM_FORMATS = ("ndjson", "sse")
+
+
+def stream_event(event: str, payload: dict, stream_format: str) -> str:
+    """One event as an NDJSON line or a server-sent event"""
+    if stream_format == "sse":
+        return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+    return json.dumps({"event": event, **payload}) + "\n"
+
+
+def discard_sources(sources: List[Tuple[dict, Optional[dict]]]) -> None:
+    """Delete the temporary files of spool_resume pairs that were not extracted"""
+    for _, spooled in sources:
+        if spooled is not None:
+            discard(spooled["path"])
+
+
+@app.post("/screen-resumes/stream")
+async def screen_resumes_stream(
+    job_description: str = Form(...),
+    resumes: Optional[List[UploadFile]] = File(None),
+    top_k: Optional[int] = Form(None),
+    shortlist_size: Optional[int] = Form(None),
+    fusion_weight: Optional[float] = Form(None),
+    semantic_only: bool = Form(False),
+    pooling: Optional[str] = Form(None),
+    known_resumes: Optional[str] = Form(None),
+    stream_format: str = Form("ndjson", alias="format")
+):
+    """
+    /screen-resumes that reports results while resumes are processed
+
+    Emits, as NDJSON lines or server-sent events:
+    - "file": filename, status and error of each file once it is extracted
+    - "score": candidate_name, filename and similarity_score of each
+      scored resume. Without the BM25 stage (semantic_only, or no more
+      resumes than shortlist_size with fusion_weight 0) scores arrive per
+      encoded batch. With it, the shortlist is embedded in one pass and
+      fused afterwards, so all score events (and one top_k snapshot)
+      arrive together once the shortlist is scored.
+    - "top_k": the best STREAM_SNAPSHOT_SIZE (or top_k) resumes so far,
+      at most every STREAM_SNAPSHOT_INTERVAL_S seconds
+    - "result": the final RankingResult, or "error" with the status_code
+      and error body /screen-resumes would have returned
+
+    Args:
+        Same as /screen-resumes, plus format: "ndjson" (default) or "sse"
+
+    Returns:
+        StreamingResponse of application/x-ndjson or text/event-stream
+    """
+    options, known, error = screening_options(
+        job_description, len(resumes or []), top_k, shortlist_size,
+        fusion_weight, semantic_only, pooling, known_resumes
+    )
+    if not error and stream_format not in STREAM_FORMATS:
+        error = f"Unknown format {stream_format}. Use one of {list(STREAM_FORMATS)}"
+    if error:
+        return JSONResponse(status_code=400, content={"error": error})
+
+    # Spool every upload now: the request's files are closed once this returns
+    sources = [await spool_resume(resume_file) for resume_file in resumes or []] + known
+
+    async def events():
+        queue: asyncio.Queue = asyncio.Queue()
+        snapshot = TopKHeap(options["top_k"] or config.STREAM_SNAPSHOT_SIZE)
+        arrivals = 0
+        last_snapshot = float("-inf")
+
+        async def extract_reported(source) -> dict:
+            entry = await extract_spooled(source)
+            queue.put_nowait(("file", {
+                "filename": entry["filename"], "status": entry["status"], "error": entry["error"]
+            }))
+            return entry
 
-        # Step 2: Process resumes and extract text
-        resume_data = []
-        for resume_file in resumes:
-            file_content = await resume_file.read()
+        def scored(pairs: List[Tuple[dict, float]]) -> None:
+            nonlocal arrivals, last_snapshot
+            for entry, score in pairs:
+                queue.put_nowait(("score", {
+                    "candidate_name": entry["name"],
+                    "filename": entry["filename"],
+                    "similarity_score": round(score, 4)
+                }))
+                snapshot.push(score, arrivals, entry)
+                arrivals += 1
 
-            # Extract text based on file type
-            if resume_file.filename.endswith('.pdf'):
-                candidate_name = resume_file.filename.replace('.pdf', '')
-                text = doc_processor.extract_from_pdf(file_content)
-            elif resume_file.filename.endswith('.docx'):
-                candidate_name = resume_file.filename.replace('.docx', '')
-                text = doc_processor.extract_from_docx(file_content)
+            now = time.monotonic()
+            if now - last_snapshot >= config.STREAM_SNAPSHOT_INTERVAL_S:
+                last_snapshot = now
+                queue.put_nowait(("top_k", {
+                    "scored": arrivals,
+                    "ranked_resumes": [
+                        {
+                            "rank": rank,
+                            "candidate_name": entry["name"],
+                            "filename": entry["filename"],
+                            "similarity_score": round(score, 4)
+                        }
+                        for rank, (score, _, entry) in enumerate(snapshot.ranked(), 1)
+                    ]
+                }))
+
+        screening = asyncio.ensure_future(run_screening(
+            sources=sources, extract=extract_reported, on_scored=scored, **options
+        ))
+        screening.add_done_callback(lambda _: queue.put_nowait(None))
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                yield stream_event(*item, stream_format)
+
+            try:
+                response = screening.result()
+            except Exception as e:
+                logger.error(f"Error streaming screening results: {str(e)}")
+                yield stream_event(
+                    "error",
+                    {"status_code": 500, "error": f"Error processing resumes: {str(e)}"},
+                    stream_format
+                )
+                return
+            if isinstance(response, JSONResponse):
+                yield stream_event(
+                    "error",
+                    {"status_code": response.status_code, **json.loads(response.body)},
+                    stream_format
+                )
             else:
-                continue
+                yield stream_event("result", jsonable_encoder(response), stream_format)
+        finally:
+            # Also reached when the client disconnects mid-stream
+            screening.cancel()
+            discard_sources(sources)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream" if stream_format == "sse" else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+
+async def run_job(job_id: str, sources: List[Tuple[dict, Optional[dict]]], options: dict) -> None:
+    """
+    Run one screening job and store its outcome
+
+    Waits for one of JOB_CONCURRENCY slots, then screens the spooled
+    uploads like /screen-resumes. Job table writes run on the default
+    executor so SQLite commits never block the event loop. Progress
+    counters are written at most every JOB_PROGRESS_INTERVAL_S seconds,
+    skipping a write while the previous one is still in flight, and once
+    at the end. The uploads' temporary files are deleted however the job
+    ends.
+
+    Args:
+        job_id: Job id from job_store.create
+        sources: (entry, spooled) pairs from spool_resume, in upload order
+        options: run_screening keyword arguments besides sources and extract
+    """
+    loop = asyncio.get_running_loop()
+    progress = dict.fromkeys(PROGRESS_FIELDS, 0)
+    last_saved = 0.0
+    pending = None
+
+    def report(counter: str, increment: int) -> None:
+        nonlocal last_saved, pending
+        progress[counter] += increment
+        now = time.monotonic()
+        if now - last_saved >= config.JOB_PROGRESS_INTERVAL_S and (pending is None or pending.done()):
+            last_saved = now
+            pending = loop.run_in_executor(None, job_store.update_progress, job_id, dict(progress))
+
+    async def finish(status: str, http_status: int, body: dict, error: Optional[str]) -> None:
+        if pending is not None:
+            await asyncio.wait([pending])
+        await loop.run_in_executor(None, job_store.update_progress, job_id, dict(progress))
+        await loop.run_in_executor(
+            None, job_store.finish, job_id, status, http_status, body, error
+        )
+
+    try:
+        async with job_slots:
+            await loop.run_in_executor(None, job_store.mark_running, job_id)
+            try:
+                response = await run_screening(
+                    sources=sources, extract=extract_spooled, progress=report, **options
+                )
+            except Exception as e:
+                logger.error(f"Screening job {job_id} failed: {str(e)}")
+                await finish(FAILED, 500, {"error": f"Error processing resumes: {str(e)}"}, str(e))
+                return
+
+        if isinstance(response, JSONResponse):
+            body = json.loads(response.body)
+            await finish(FAILED, response.status_code, body, body.get("error"))
+        else:
+            await finish(DONE, 200, jsonable_encoder(response), None)
+    finally:
+        discard_sources(sources)
+
+
+@app.post("/jobs/screen-resumes", response_model=JobSubmission, status_code=202)
+async def submit_screening_job(
+    job_description: str = Form(...),
+    resumes: Optional[List[UploadFile]] = File(None),
+    top_k: Optional[int] = Form(None),
+    shortlist_size: Optional[int] = Form(None),
+    fusion_weight: Optional[float] = Form(None),
+    semantic_only: bool = Form(False),
+    pooling: Optional[str] = Form(None),
+    known_resumes: Optional[str] = Form(None)
+):
+    """
+    Queue a /screen-resumes run and return at once with its job id
+
+    The uploads are spooled to temporary files before responding, so the
+    job no longer needs the HTTP connection. Poll /jobs/{job_id} for
+    progress and fetch /jobs/{job_id}/result once it is done.
 
-            if text:
-                resume_data.append({
-                    "name": candidate_name,
-                    "text": text,
-                    "filename": resume_file.filename
-                })
+    Args:
+        Same as /screen-resumes
+
+    Returns:
+        JobSubmission: Job id and status ("queued")
+    """
+    if job_store is None:
+        return JSONResponse(
+            status_code=503,
+            content={"error": "Screening jobs are not available"}
+        )
+
+    options, known, error = screening_options(
+        job_description, len(resumes or []), top_k, shortlist_size,
+        fusion_weight, semantic_only, pooling, known_resumes
+    )
+    if error:
+        return JSONResponse(status_code=400, content={"error": error})
+
+    sources = [await spool_resume(resume_file) for resume_file in resumes or []] + known
+    try:
+        loop = asyncio.get_running_loop()
+        job_id = await loop.run_in_executor(None, job_store.create, options, len(sources))
+    except Exception as e:
+        discard_sources(sources)
+        return JSONResponse(
+            status_code=500,
+            content={"error": f"Error creating screening job: {str(e)}"}
+        )
+
+    task = asyncio.create_task(run_job(job_id, sources, options))
+    job_tasks.add(task)
+    task.add_done_callback(job_tasks.discard)
+    return JobSubmission(job_id=job_id, status="queued")
+
+
+@app.get("/jobs/{job_id}", response_model=JobStatus)
+async def get_screening_job(job_id: str):
+    """
+    Status and progress of a screening job
+
+    Args:
+        job_id: Id returned by /jobs/screen-resumes
+
+    Returns:
+        JobStatus: Status ("queued", "running", "done", "failed" or
+        "interrupted") and files parsed, embedded, scored and failed
+    """
+    if job_store is None:
+        return JSONResponse(
+            status_code=503,
+            content={"error": "Screening jobs are not available"}
+        )
+    loop = asyncio.get_running_loop()
+    job = await loop.run_in_executor(None, job_store.get, job_id)
+    if job is None:
+        return JSONResponse(status_code=404, content={"error": f"Unknown job {job_id}"})
+    return JobStatus(
+        job_id=job_id,
+        status=job["status"],
+        total_files=job["total_files"],
+        parsed=job["parsed"],
+        embedded=job["embedded"],
+        scored=job["scored"],
+        failed=job["failed"],
+        error=job["error"],
+        created_at=job["created_at"],
+        started_at=job["started_at"],
+        finished_at=job["finished_at"]
+    )
+
+
+@app.get("/jobs/{job_id}/result")
+async def get_screening_job_result(job_id: str):
+    """
+    Result of a finished screening job
+
+    Args:
+        job_id: Id returned by /jobs/screen-resumes
+
+    Returns:
+        The status code and body /screen-resumes would have returned
+        (409 while the job is queued or running, 410 once it was
+        interrupted by a restart and will never finish)
+    """
+    if job_store is None:
+        return JSONResponse(
+            status_code=503,
+            content={"error": "Screening jobs are not available"}
+        )
+    loop = asyncio.get_running_loop()
+    job = await loop.run_in_executor(None, job_store.get, job_id)
+    if job is None:
+        return JSONResponse(status_code=404, content={"error": f"Unknown job {job_id}"})
+    if job["status"] == INTERRUPTED:
+        return JSONResponse(
+            status_code=410,
+            content={"error": job["error"], "status": job["status"]}
+        )
+    if job["http_status"] is None:
+        return JSONResponse(
+            status_code=409,
+            content={"error": f"Job {job_id} is {job['status']}", "status": job["status"]}
+        )
+    return JSONResponse(status_code=job["http_status"], content=job["result"])
+
+
+@app.post("/screen-matrix", response_model=MatrixScreeningResult)
+async def screen_matrix(
+    job_descriptions: List[str] = Form(...),
+    resumes: List[UploadFile] = File(...),
+    top_k: int = Form(10),
+    include_best_job: bool = Form(False),
+    pooling: Optional[str] = Form(None)
+):
+    """
+    Screen one resume pool against several job descriptions
+
+    Every resume chunk and job description is embedded once, and the full
+    (jobs x resumes) score matrix comes from a single matrix multiply.
+
+    Args:
+        job_descriptions: Job description texts (repeat the form field)
+        resumes: List of resume files (PDF/DOCX)
+        top_k: Number of candidates returned per job description
+        include_best_job: Also report the best job description for each resume
+        pooling: Chunk score pooling for long resumes (default: CHUNK_POOLING)
+
+    Returns:
+        MatrixScreeningResult: Per-job top-k rankings and optional best jobs
+    """
+    try:
+        jd_texts = [jd.strip() for jd in job_descriptions]
+        if not jd_texts or not all(jd_texts):
+            return JSONResponse(
+                status_code=400,
+                content={"error": "Job descriptions cannot be empty"}
+            )
+        if top_k < 1:
+            return JSONResponse(
+                status_code=400,
+                content={"error": "top_k must be at least 1"}
+            )
+        pooling = pooling or config.CHUNK_POOLING
+        if pooling not in POOLINGS:
+            return JSONResponse(
+                status_code=400,
+                content={"error": f"Unknown pooling {pooling}. Use one of {list(POOLINGS)}"}
+            )
+
+        extracted = await extract_resumes(resumes)
+        resume_data = [resume for resume in extracted if resume["status"] == "ok"]
+        failures = failed_files(extracted)
 
         if not resume_data:
             return JSONResponse(
                 status_code=400,
-                content={"error": "No valid resumes provided"}
-            )
-
-        # Step 3: Generate embeddings
-        jd_embedding = embedding_gen.generate_embedding(jd_text)
-
-        resume_embeddings = []
-        for resume in resume_data:
-            embedding = embedding_gen.generate_embedding(resume["text"])
-            resume_embeddings.append({
-                "name": resume["name"],
-                "embedding": embedding,
-                "text": resume["text"]
-            })
-
-        # Step 4: Calculate similarity scores
-        ranked_resumes = []
-        for i, resume_emb in enumerate(resume_embeddings):
-            similarity_score = similarity_calc.cosine_similarity(
-                jd_embedding,
-                resume_emb["embedding"]
-            )
-
-            ranked_resumes.append(RankedResume(
-                rank=i + 1,
-                candidate_name=resume_emb["name"],
-                similarity_score=round(similarity_score, 4),
-                filename=resume_data[i]["filename"]
-            ))
-
-        # Step 5: Sort by similarity score (descending)
-        ranked_resumes.sort(key=lambda x: x.similarity_score, reverse=True)
-
-        # Update ranks after sorting
-        for idx, resume in enumerate(ranked_resumes):
-            resume.rank = idx + 1
-
-        return RankingResult(
-            total_resumes=len(ranked_resumes),
-            ranked_resumes=ranked_resumes,
-            status="success"
+                content={
+                    "error": "No valid resumes provided",
+                    "failed_files": failures
+                }
+            )
+
+        scores = await score_resumes(
+            jd_texts, [resume["text"] for resume in resume_data], pooling
+        )
+        indices = [RankingEngine.select_top_k(row, top_k) for row in scores]
+        top_scores = [row[idx] for row, idx in zip(scores, indices)]
+
+        job_rankings = [
+            JobRanking(
+                job_index=job_index,
+                ranked_resumes=[
+                    RankedResume(
+                        rank=rank,
+                        candidate_name=resume_data[i]["name"],
+                        similarity_score=round(float(score), 4),
+                        filename=resume_data[i]["filename"]
+                    )
+                    for rank, (i, score) in enumerate(zip(job_indices, job_scores), 1)
+                ]
+            )
+            for job_index, (job_indices, job_scores) in enumerate(zip(indices, top_scores))
+        ]
+
+        best_jobs = None
+        if include_best_job:
+            best = scores.argmax(axis=0)
+            best_jobs = [
+                ResumeBestJob(
+                    candidate_name=resume["name"],
+                    filename=resume["filename"],
+                    best_job_index=int(best[i]),
+                    similarity_score=round(float(scores[best[i], i]), 4)
+                )
+                for i, resume in enumerate(resume_data)
+            ]
+
+        return MatrixScreeningResult(
+            total_jobs=len(jd_texts),
+            total_resumes=len(resume_data),
+            job_rankings=job_rankings,
+            best_jobs=best_jobs,
+            status="success",
+            failed_files=failures
         )
 
     except Exception as e:
@@ -155,8 +1226,9 @@ async def calculate_similarity(
 ):
     """Calculate similarity between job description and a single resume"""
     try:
-        jd_embedding = embedding_gen.generate_embedding(job_description)
-        resume_embedding = embedding_gen.generate_embedding(resume_text)
+        jd_embedding, resume_embedding = await embedding_batcher.encode(
+            [job_description, resume_text]
+        )
 
         similarity = similarity_calc.cosine_similarity(jd_embedding, resume_embedding)
 
@@ -171,6 +1243,242 @@ async def calculate_similarity(
         )
 
 
+@app.post("/corpus/resumes", response_model=IngestResult)
+async def ingest_resumes(resumes: List[UploadFile] = File(...)):
+    """
+    Add resumes to the persistent corpus
+
+    Each file is extracted and embedded once; files already in the corpus
+    (same bytes) are skipped.
+
+    Args:
+        resumes: List of resume files (PDF/DOCX)
+
+    Returns:
+        IngestResult: Per-file status and the new corpus size
+    """
+    if corpus_store is None:
+        return JSONResponse(
+            status_code=503,
+            content={"error": "Resume corpus is not available"}
+        )
+
+    try:
+        extracted = await extract_resumes(resumes)
+
+        statuses = [None] * len(extracted)
+        new_resumes = []
+        new_digests = set()
+        for i, resume in enumerate(extracted):
+            if resume["status"] != "ok":
+                statuses[i] = IngestedResume(
+                    filename=resume["filename"], status=resume["status"], error=resume["error"]
+                )
+                continue
+
+            existing_id = corpus_store.find_by_sha256(resume["digest"])
+            if existing_id is not None or resume["digest"] in new_digests:
+                statuses[i] = IngestedResume(
+                    filename=resume["filename"], resume_id=existing_id, status="duplicate"
+                )
+            else:
+                new_digests.add(resume["digest"])
+                new_resumes.append((i, resume))
+
+        if new_resumes:
+            embeddings = await embedding_batcher.encode(
+                [resume["text"] for _, resume in new_resumes]
+            )
+            loop = asyncio.get_running_loop()
+            resume_ids = await loop.run_in_executor(
+                None,
+                corpus_store.add,
+                [
+                    {
+                        "candidate_name": resume["name"],
+                        "filename": resume["filename"],
+                        "content_sha256": resume["digest"],
+                        "text": resume["text"]
+                    }
+                    for _, resume in new_resumes
+                ],
+                embeddings
+            )
+            for (i, resume), resume_id in zip(new_resumes, resume_ids):
+                statuses[i] = IngestedResume(
+                    filename=resume["filename"], resume_id=resume_id, status="ingested"
+                )
+
+        return IngestResult(
+            ingested=len(new_resumes),
+            corpus_size=len(corpus_store),
+            resumes=statuses,
+            status="success"
+        )
+
+    except Exception as e:
+        return JSONResponse(
+            status_code=500,
+            content={"error": f"Error ingesting resumes: {str(e)}"}
+        )
+
+
+@app.post("/corpus/index")
+async def build_corpus_index(
+    method: str = Form("ivf"),
+    n_lists: Optional[int] = Form(None),
+    n_subvectors: Optional[int] = Form(None)
+):
+    """
+    Train an approximate index on the current corpus and save it
+
+    Args:
+        method: "ivf" (clustered scan), "pq" (compressed codes) or
+                "binary" (sign bits, Hamming prefilter)
+        n_lists: IVF clusters (default: IVF_NLISTS or ~4 * sqrt(corpus size))
+        n_subvectors: PQ bytes per vector (default: PQ_SUBVECTORS)
+
+    Returns:
+        Index summary
+    """
+    if corpus_store is None:
+        return JSONResponse(
+            status_code=503,
+            content={"error": "Resume corpus is not available"}
+        )
+    if corpus_store.refresh() == 0:
+        return JSONResponse(
+            status_code=400,
+            content={"error": "Corpus is empty"}
+        )
+    if method not in INDEX_TYPES:
+        return JSONResponse(
+            status_code=400,
+            content={"error": f"Unknown index method {method}. Use one of {list(INDEX_TYPES)}"}
+        )
+
+    try:
+        if method == "ivf":
+            n_lists = n_lists or config.IVF_NLISTS or max(1, int(4 * len(corpus_store) ** 0.5))
+            index = IVFIndex(corpus_store.dimension, n_lists=n_lists, nprobe=config.IVF_NPROBE)
+        elif method == "pq":
+            index = PQIndex(
+                corpus_store.dimension, n_subvectors=n_subvectors or config.PQ_SUBVECTORS
+            )
+        else:
+            index = BinaryIndex(corpus_store.dimension)
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            None, corpus_store.build_index, method, index, INDEX_TYPES[method][1]
+        )
+        if method == "ivf":
+            summary = {"n_lists": index.n_lists, "nprobe": index.nprobe}
+        elif method == "pq":
+            summary = {"n_subvectors": index.n_subvectors, "index_bytes": index.nbytes()}
+        else:
+            summary = {"index_bytes": index.nbytes()}
+        return {
+            "method": method,
+            **summary,
+            "indexed": len(index),
+            "status": "success"
+        }
+
+    except Exception as e:
+        return JSONResponse(
+            status_code=500,
+            content={"error": f"Error building index: {str(e)}"}
+        )
+
+
+@app.post("/corpus/search", response_model=CorpusSearchResult)
+async def search_corpus(
+    job_description: str = Form(...),
+    top_k: int = Form(10),
+    method: str = Form("exact"),
+    nprobe: Optional[int] = Form(None),
+    rerank: Optional[int] = Form(None)
+):
+    """
+    Rank the stored corpus against a job description
+
+    Only the job description is embedded. The "exact" method scores every
+    stored resume with a single matrix-vector product; "ivf" scans only the
+    nprobe closest clusters of the approximate index; "pq" and "binary"
+    scan compressed codes and rescore the best `rerank` candidates exactly.
+
+    Args:
+        job_description: Job description text
+        top_k: Number of candidates to return
+        method: "exact" or the name of a built index ("ivf", "pq", "binary")
+        nprobe: IVF clusters to scan (higher = better recall, slower)
+        rerank: Index candidates rescored against stored embeddings
+                (default: PQ_RERANK / BINARY_RERANK, none for ivf)
+
+    Returns:
+        CorpusSearchResult: Best matching stored resumes
+    """
+    if corpus_store is None:
+        return JSONResponse(
+            status_code=503,
+            content={"error": "Resume corpus is not available"}
+        )
+
+    try:
+        jd_text = job_description.strip()
+        if not jd_text:
+            return JSONResponse(
+                status_code=400,
+                content={"error": "Job description cannot be empty"}
+            )
+        if top_k < 1:
+            return JSONResponse(
+                status_code=400,
+                content={"error": "top_k must be at least 1"}
+            )
+
+        if method != "exact" and method not in corpus_store.index_names():
+            return JSONResponse(
+                status_code=400,
+                content={"error": f"Search method {method} is not available"}
+            )
+
+        options = {}
+        if method == "ivf" and nprobe is not None:
+            options["nprobe"] = nprobe
+        if method != "exact":
+            options["rerank"] = (
+                rerank if rerank is not None else DEFAULT_RERANK.get(method, 0)
+            )
+
+        jd_embedding, = await embedding_batcher.encode([jd_text])
+        loop = asyncio.get_running_loop()
+        matches = await loop.run_in_executor(
+            None, functools.partial(corpus_store.search, jd_embedding, top_k, method, **options)
+        )
+
+        return CorpusSearchResult(
+            corpus_size=len(corpus_store),
+            ranked_resumes=[
+                RankedResume(
+                    rank=rank,
+                    candidate_name=match["candidate_name"],
+                    similarity_score=round(match["score"], 4),
+                    filename=match["filename"]
+                )
+                for rank, match in enumerate(matches, 1)
+            ],
+            status="success"
+        )
+
+    except Exception as e:
+        return JSONResponse(
+            status_code=500,
+            content={"error": f"Error searching corpus: {str(e)}"}
+        )
+
+
 @app.get("/health")
 async def health_check():
     """Endpoint to check API health and service availability"""
@@ -183,7 +1491,11 @@ async def health_check():
     }
 
 
-if __name__ == "__main__":
-    import uvicorn
-    port = int(os.getenv("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+@app.get("/cache/stats")
+async def cache_stats():
+    """Report hit/miss counters and size usage of the caches"""
+    return {
+        "embeddings": embedding_cache.stats() if embedding_cache is not None else None,
+        "texts": text_cache.stats() if text_cache is not None else None
+    }
+
@@ -12,6 +12,15 @@ class RankedResume(BaseModel):
     candidate_name: str
     similarity_score: float
     filename: str
+    semantic_score: Optional[float] = None
+    lexical_score: Optional[float] = None
+
+
+class FileFailure(BaseModel):
+    """Model for an uploaded file that could not be screened"""
+    filename: str
+    status: str
+    error: Optional[str] = None
 
 
 class RankingResult(BaseModel):
@@ -19,6 +28,93 @@ class RankingResult(BaseModel):
     total_resumes: int
     ranked_resumes: List[RankedResume]
     status: str
+    shortlisted: Optional[int] = None
+    failed_files: List[FileFailure] = []
+
+
+class ResumeDigest(BaseModel):
+    """Model for a resume identified by the SHA-256 of its bytes"""
+    filename: str
+    digest: str
+
+
+class DigestNegotiation(BaseModel):
+    """Model for the resumes a client is about to screen, by digest"""
+    resumes: List[ResumeDigest]
+
+
+class NegotiationResult(BaseModel):
+    """Model for the digests the client still has to upload"""
+    unseen: List[str]
+    known: int
+
+
+class JobSubmission(BaseModel):
+    """Model for a queued screening job"""
+    job_id: str
+    status: str
+
+
+class JobStatus(BaseModel):
+    """Model for the status and progress of a screening job"""
+    job_id: str
+    status: str
+    total_files: int
+    parsed: int
+    embedded: int
+    scored: int
+    failed: int
+    error: Optional[str] = None
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+
+class JobRanking(BaseModel):
+    """Model for the ranked resumes of one job description"""
+    job_index: int
+    ranked_resumes: List[RankedResume]
+
+
+class ResumeBestJob(BaseModel):
+    """Model for the best matching job description of one resume"""
+    candidate_name: str
+    filename: str
+    best_job_index: int
+    similarity_score: float
+
+
+class MatrixScreeningResult(BaseModel):
+    """Model for screening one resume pool against several job descriptions"""
+    total_jobs: int
+    total_resumes: int
+    job_rankings: List[JobRanking]
+    best_jobs: Optional[List[ResumeBestJob]] = None
+    status: str
+    failed_files: List[FileFailure] = []
+
+
+class IngestedResume(BaseModel):
+    """Model for one file submitted to the resume corpus"""
+    filename: str
+    resume_id: Optional[int] = None
+    status: str
+    error: Optional[str] = None
+
+
+class IngestResult(BaseModel):
+    """Model for a corpus ingestion response"""
+    ingested: int
+    corpus_size: int
+    resumes: List[IngestedResume]
+    status: str
+
+
+class CorpusSearchResult(BaseModel):
+    """Model for ranking the stored corpus against a job description"""
+    corpus_size: int
+    ranked_resumes: List[RankedResume]
+    status: str
 
 
 class SimilarityRequest(BaseModel):
@@ -33,6 +129,16 @@ class SimilarityResponse(BaseModel):
     status: str
 
 
+class ModelInfo(BaseModel):
+    """Model for the metadata of the loaded embedding model"""
+    model_name: str
+    dimension: int
+    max_seq_length: Optional[int] = None
+    dtype: str
+    fingerprint: str
+    batch_size: int
+
+
 class HealthCheck(BaseModel):
     """Model for health check response"""
     status: str
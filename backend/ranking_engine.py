@@ -0,0 +1,287 @@
+"""
+Ranking Engine Module
+Vectorized scoring and top-k selection over stacked embedding matrices
+"""
+
+import heapq
+import logging
+from typing import Any, List, Optional, Sequence, Tuple, Union
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class TopKHeap:
+    """
+    Running top-k of scored items that arrive one at a time
+
+    Holds at most k entries in a min-heap keyed by (score, -index), so the
+    weakest survivor is replaced in O(log k). Ties go to the lower index,
+    as in a stable sort by descending score.
+    """
+
+    def __init__(self, k: Optional[int] = None):
+        """
+        Initialize heap
+
+        Args:
+            k: Entries to keep (None keeps every item)
+        """
+        self.k = k
+        self._heap: List[Tuple[float, int, Any]] = []
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, score: float, index: int, item: Any = None) -> None:
+        """
+        Offer an item
+
+        Args:
+            score: Higher is better
+            index: Arrival-independent position (e.g. upload order), unique per item
+            item: Payload kept with the score
+        """
+        entry = (score, -index, item)
+        if self.k is None or len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif self.k > 0 and entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def ranked(self) -> List[Tuple[float, int, Any]]:
+        """(score, index, item) of the kept entries, best first"""
+        return [
+            (score, -negated, item)
+            for score, negated, item in sorted(self._heap, key=lambda e: e[:2], reverse=True)
+        ]
+
+
+class RankingEngine:
+    """
+    Scores a query against an (N, d) embedding matrix in one pass
+
+    Cosine scores come from a single matrix-vector product over
+    pre-normalized rows; euclidean and manhattan distances are computed in
+    batch form. Top-k selection uses argpartition, so only the k winners
+    are sorted.
+    """
+
+    METRICS = ("cosine", "euclidean", "manhattan")
+
+    POOLINGS = ("max", "mean", "top_m")
+
+    # Rows per block when computing manhattan distances, bounding the
+    # temporary (block, d) difference matrix
+    MANHATTAN_BLOCK_ROWS = 65536
+
+    def __init__(
+        self,
+        embeddings: Union[np.ndarray, Sequence[np.ndarray]],
+        normalized: bool = False
+    ):
+        """
+        Initialize engine
+
+        Args:
+            embeddings: (N, d) matrix or list of N embedding vectors
+            normalized: True if rows already have unit (or zero) length, which
+                        lets cosine scoring use the matrix as-is without a copy
+        """
+        if isinstance(embeddings, np.ndarray) and embeddings.ndim == 2:
+            self.matrix = embeddings
+        elif len(embeddings) == 0:
+            self.matrix = np.empty((0, 0), dtype=np.float32)
+        else:
+            self.matrix = np.vstack([np.asarray(e, dtype=np.float32) for e in embeddings])
+
+        self._normalized = self.matrix if normalized else None
+        self._squared_norms = None
+
+    def __len__(self) -> int:
+        return len(self.matrix)
+
+    @property
+    def normalized(self) -> np.ndarray:
+        """Rows scaled to unit length (zero rows stay zero)"""
+        if self._normalized is None:
+            norms = np.linalg.norm(self.matrix, axis=1, keepdims=True)
+            self._normalized = (self.matrix / np.where(norms > 0, norms, 1.0)).astype(
+                np.float32, copy=False
+            )
+        return self._normalized
+
+    def scores(self, query: np.ndarray, metric: str = "cosine") -> np.ndarray:
+        """
+        Score every row against a query
+
+        Args:
+            query: Query embedding of dimension d
+            metric: "cosine" (higher = more similar), "euclidean" or
+                    "manhattan" (lower = more similar)
+
+        Returns:
+            Array of N scores
+        """
+        if metric not in self.METRICS:
+            raise ValueError(f"Unknown metric {metric}. Use one of {self.METRICS}")
+        if len(self.matrix) == 0:
+            return np.empty(0, dtype=np.float32)
+
+        query = np.asarray(query, dtype=np.float32).ravel()
+
+        if metric == "cosine":
+            norm = np.linalg.norm(query)
+            if norm == 0:
+                logger.warning("Query embedding has zero norm")
+                return np.zeros(len(self.matrix), dtype=np.float32)
+            return np.clip(self.normalized @ (query / norm), -1.0, 1.0)
+
+        if metric == "euclidean":
+            if self._squared_norms is None:
+                self._squared_norms = np.einsum("ij,ij->i", self.matrix, self.matrix)
+            squared = self._squared_norms - 2.0 * (self.matrix @ query) + float(query @ query)
+            return np.sqrt(np.maximum(squared, 0.0))
+
+        distances = np.empty(len(self.matrix), dtype=np.float32)
+        for start in range(0, len(self.matrix), self.MANHATTAN_BLOCK_ROWS):
+            block = self.matrix[start:start + self.MANHATTAN_BLOCK_ROWS]
+            distances[start:start + len(block)] = np.abs(block - query).sum(axis=1)
+        return distances
+
+    @staticmethod
+    def select_top_k(
+        scores: np.ndarray, k: Optional[int] = None, largest: bool = True
+    ) -> np.ndarray:
+        """
+        Indices of the k best scores, best first
+
+        Args:
+            scores: Array of scores
+            k: Number of indices to return (None for all)
+            largest: True when higher scores are better
+
+        Returns:
+            Array of row indices
+        """
+        n = len(scores)
+        if k is None or k >= n:
+            k = n
+        if k <= 0:
+            return np.empty(0, dtype=np.int64)
+
+        keyed = -scores if largest else scores
+        if k < n:
+            candidates = np.argpartition(keyed, k - 1)[:k]
+        else:
+            candidates = np.arange(n)
+        # Sort only the survivors; ties keep their original (upload) order
+        order = np.lexsort((candidates, keyed[candidates]))
+        return candidates[order]
+
+    def top_k(
+        self, query: np.ndarray, k: Optional[int] = None, metric: str = "cosine"
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Best k rows for a query
+
+        Args:
+            query: Query embedding
+            k: Number of results (None for a full ranking)
+            metric: "cosine", "euclidean" or "manhattan"
+
+        Returns:
+            Tuple of (row indices, scores), best first
+        """
+        scores = self.scores(query, metric)
+        indices = self.select_top_k(scores, k, largest=(metric == "cosine"))
+        return indices, scores[indices]
+
+    def score_matrix(self, queries: Union[np.ndarray, Sequence[np.ndarray]]) -> np.ndarray:
+        """
+        Cosine scores of several queries against every row in one matrix multiply
+
+        Args:
+            queries: (Q, d) matrix or list of Q query embeddings
+
+        Returns:
+            (Q, N) array of cosine similarities
+        """
+        queries = RankingEngine(queries).normalized
+        if len(queries) == 0 or len(self.matrix) == 0:
+            return np.zeros((len(queries), len(self.matrix)), dtype=np.float32)
+        return np.clip(queries @ self.normalized.T, -1.0, 1.0)
+
+    def top_k_matrix(
+        self, queries: Union[np.ndarray, Sequence[np.ndarray]], k: Optional[int] = None
+    ) -> Tuple[np.ndarray, List[np.ndarray], List[np.ndarray]]:
+        """
+        Best k rows for each of several queries (cosine)
+
+        Args:
+            queries: (Q, d) matrix or list of Q query embeddings
+            k: Number of results per query (None for a full ranking)
+
+        Returns:
+            Tuple of (full (Q, N) score matrix, per-query row indices,
+            per-query scores), each ranking best first
+        """
+        scores = self.score_matrix(queries)
+        indices = [self.select_top_k(row, k) for row in scores]
+        return scores, indices, [row[idx] for row, idx in zip(scores, indices)]
+
+    @staticmethod
+    def pool_scores(
+        scores: np.ndarray,
+        owners: np.ndarray,
+        n_groups: int,
+        pooling: str = "max",
+        top_m: int = 3
+    ) -> np.ndarray:
+        """
+        Combine chunk scores into one score per document
+
+        Args:
+            scores: Score of every chunk (the last axis if 2-D, e.g. one row per JD)
+            owners: Document index of every chunk; chunks of a document are
+                    consecutive and every document has at least one chunk
+            n_groups: Number of documents
+            pooling: "max" (best chunk), "mean" (all chunks) or "top_m"
+                     (mean of the m best chunks)
+            top_m: m for "top_m"
+
+        Returns:
+            Array of n_groups scores (or (Q, n_groups) for 2-D scores)
+        """
+        if pooling not in RankingEngine.POOLINGS:
+            raise ValueError(f"Unknown pooling {pooling}. Use one of {RankingEngine.POOLINGS}")
+
+        scores = np.asarray(scores)
+        starts = np.searchsorted(owners, np.arange(n_groups))
+        if n_groups == 0:
+            return np.zeros(scores.shape[:-1] + (0,), dtype=scores.dtype)
+
+        if pooling == "max":
+            return np.maximum.reduceat(scores, starts, axis=-1)
+
+        counts = np.diff(np.append(starts, len(owners)))
+        if pooling == "mean":
+            return np.add.reduceat(scores, starts, axis=-1) / counts
+
+        pooled = np.empty(scores.shape[:-1] + (n_groups,), dtype=scores.dtype)
+        for group, (start, count) in enumerate(zip(starts, counts)):
+            segment = scores[..., start:start + count]
+            m = min(top_m, count)
+            pooled[..., group] = np.partition(segment, count - m, axis=-1)[..., count - m:].mean(
+                axis=-1
+            )
+        return pooled
+
+    @staticmethod
+    def rank(
+        query: np.ndarray,
+        embeddings: Union[np.ndarray, List[np.ndarray]],
+        k: Optional[int] = None,
+        metric: str = "cosine"
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Convenience wrapper: build an engine and return its top k"""
+        return RankingEngine(embeddings).top_k(query, k, metric)
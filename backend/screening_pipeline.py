@@ -0,0 +1,162 @@
+"""
+Screening Pipeline Module
+Streams uploads through extract -> encode/score -> top-k stages connected
+by bounded queues, so extraction of later resumes overlaps encoding of
+earlier ones
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .ranking_engine import TopKHeap
+
+logger = logging.getLogger(__name__)
+
+
+class ScreeningPipeline:
+    """
+    Bounded-memory screening of many resumes against one query
+
+    Stage 1 extracts up to extract_concurrency documents at a time and
+    puts readable ones on a queue of at most queue_size resumes; when
+    the queue is full, no new extraction starts. Stage 2 takes resumes
+    off the queue in batches of batch_size and scores up to
+    encode_concurrency batches at once, while stage 1 keeps extracting.
+    Batches start at one resume and double up to batch_size, so the
+    first scores are available almost at once. Stage 3
+    pushes each score into a running top-k heap and drops the resume
+    text, so only the queue, the batches in flight and the k survivors
+    are ever held in memory.
+    """
+
+    def __init__(
+        self,
+        extract: Callable[[object], Awaitable[Dict]],
+        score: Callable[[List[str]], Awaitable[np.ndarray]],
+        batch_size: int = 32,
+        queue_size: int = 64,
+        extract_concurrency: int = 8,
+        encode_concurrency: int = 2,
+        on_scored: Optional[Callable[[List[Tuple[Dict, float]]], None]] = None
+    ):
+        """
+        Initialize pipeline
+
+        Args:
+            extract: Coroutine function turning one source (e.g. an upload)
+                     into a dict with at least status ("ok" when readable)
+                     and text
+            score: Coroutine function scoring a batch of texts, returning
+                   one score per text
+            batch_size: Resumes per score call
+            queue_size: Extracted resumes that may wait for scoring
+            extract_concurrency: Documents extracted at the same time
+            encode_concurrency: Batches scored at the same time
+            on_scored: Optional callback receiving the (entry, score) pairs
+                       of every scored batch, entries without their text
+        """
+        self.extract = extract
+        self.score = score
+        self.batch_size = max(1, batch_size)
+        self.queue_size = max(1, queue_size)
+        self.extract_concurrency = max(1, extract_concurrency)
+        self.encode_concurrency = max(1, encode_concurrency)
+        self.on_scored = on_scored
+
+    async def run(
+        self, sources: Sequence, k: Optional[int] = None
+    ) -> Tuple[List[Tuple[float, int, Dict]], List[Dict], int]:
+        """
+        Screen every source and keep the best k
+
+        Args:
+            sources: Documents in upload order
+            k: Resumes to keep (None for all)
+
+        Returns:
+            Tuple of (ranking as (score, upload index, entry without its
+            text), best first; entries that could not be read, in upload
+            order; number of resumes scored)
+        """
+        ready: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        heap = TopKHeap(k)
+        failures: List[Tuple[int, Dict]] = []
+        scored = 0
+
+        extract_slots = asyncio.Semaphore(self.extract_concurrency)
+        encode_slots = asyncio.Semaphore(self.encode_concurrency)
+
+        async def extract_one(index: int, source) -> None:
+            try:
+                entry = await self.extract(source)
+                if entry["status"] == "ok":
+                    await ready.put((index, entry))
+                else:
+                    failures.append((index, entry))
+            finally:
+                extract_slots.release()
+
+        async def produce() -> None:
+            tasks = []
+            try:
+                for index, source in enumerate(sources):
+                    await extract_slots.acquire()
+                    tasks.append(asyncio.ensure_future(extract_one(index, source)))
+                await asyncio.gather(*tasks)
+            finally:
+                for task in tasks:
+                    task.cancel()
+            await ready.put(None)
+
+        async def score_batch(batch: List[Tuple[int, Dict]]) -> None:
+            nonlocal scored
+            try:
+                scores = await self.score([entry.pop("text") for _, entry in batch])
+                for (index, entry), value in zip(batch, scores):
+                    heap.push(float(value), index, entry)
+                scored += len(batch)
+                if self.on_scored is not None:
+                    self.on_scored([
+                        (entry, float(value)) for (_, entry), value in zip(batch, scores)
+                    ])
+            finally:
+                encode_slots.release()
+
+        async def consume() -> None:
+            tasks = []
+            batch: List[Tuple[int, Dict]] = []
+            target = 1
+            try:
+                finished = False
+                while not finished:
+                    item = await ready.get()
+                    if item is None:
+                        finished = True
+                    else:
+                        batch.append(item)
+                    if batch and (finished or len(batch) >= target):
+                        await encode_slots.acquire()
+                        tasks.append(asyncio.ensure_future(score_batch(batch)))
+                        batch = []
+                        target = min(2 * target, self.batch_size)
+                    # Surface scoring errors without waiting for the whole stream
+                    for task in tasks:
+                        if task.done() and task.exception() is not None:
+                            raise task.exception()
+                await asyncio.gather(*tasks)
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+        stages = [asyncio.ensure_future(produce()), asyncio.ensure_future(consume())]
+        try:
+            await asyncio.gather(*stages)
+        finally:
+            for stage in stages:
+                stage.cancel()
+
+        failures.sort(key=lambda failure: failure[0])
+        return heap.ranked(), [entry for _, entry in failures], scored
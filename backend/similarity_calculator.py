@@ -7,6 +7,8 @@ import numpy as np
 import logging
 from typing import Tuple
 
+from .ranking_engine import RankingEngine
+
 logger = logging.getLogger(__name__)
 
 
@@ -104,15 +106,16 @@ class SimilarityCalculator:
         Returns:
             List of similarity scores
         """
-        similarities = []
-        for resume_embedding in resume_embeddings:
-            similarity = SimilarityCalculator.cosine_similarity(
-                job_embedding,
-                resume_embedding
-            )
-            similarities.append(similarity)
+        if len(resume_embeddings) == 0:
+            return []
+
+        try:
+            scores = RankingEngine(resume_embeddings).scores(job_embedding, "cosine")
+            return [float(score) for score in scores]
 
-        return similarities
+        except Exception as e:
+            logger.error(f"Error calculating batch similarity: {str(e)}")
+            return [0.0 for _ in resume_embeddings]
 
     @staticmethod
     def rank_by_similarity(similarities: list, resume_names: list) -> list:
@@ -126,17 +129,11 @@ class SimilarityCalculator:
         Returns:
             Sorted list of (rank, name, score) tuples
         """
-        # Create list of (index, score, name)
-        indexed_scores = [
-            (i, score, name) for i, (score, name) in enumerate(zip(similarities, resume_names))
-        ]
-
-        # Sort by score descending
-        ranked = sorted(indexed_scores, key=lambda x: x[1], reverse=True)
+        scores = np.asarray(similarities[:len(resume_names)], dtype=np.float64)
+        order = RankingEngine.select_top_k(scores)
 
-        # Return with rank numbers
         return [
-            (rank + 1, name, score) for rank, (_, score, name) in enumerate(ranked)
+            (rank + 1, resume_names[i], similarities[i]) for rank, i in enumerate(order)
         ]
 
     @staticmethod
@@ -0,0 +1,115 @@
+"""
+Uploads Module
+Streams uploaded files into temporary files in fixed-size chunks, hashing
+them and enforcing the size limit on the way
+"""
+
+import hashlib
+import logging
+import os
+import re
+import tempfile
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Per-file outcomes besides "ok"
+TOO_LARGE = "too_large"
+EMPTY = "empty"
+
+_DIGEST = re.compile(r"[0-9a-f]{64}")
+
+
+def spool_result(
+    status: str,
+    path: Optional[str] = None,
+    digest: Optional[str] = None,
+    size: int = 0,
+    error: Optional[str] = None
+) -> Dict:
+    """Structured outcome of one spooled upload"""
+    return {"status": status, "path": path, "digest": digest, "size": size, "error": error}
+
+
+def is_digest(value) -> bool:
+    """Whether value is a lowercase hex SHA-256 digest, as spool_upload produces"""
+    return isinstance(value, str) and _DIGEST.fullmatch(value) is not None
+
+
+def discard(path: Optional[str]) -> None:
+    """Delete a spooled file, ignoring files that are already gone"""
+    if path is None:
+        return
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"Could not delete spooled upload {path}: {str(e)}")
+
+
+async def spool_upload(
+    upload,
+    max_bytes: Optional[int],
+    chunk_size: int = 64 * 1024,
+    temp_dir: Optional[str] = None
+) -> Dict:
+    """
+    Copy an upload into a named temporary file, chunk_size bytes at a time
+
+    The SHA-256 digest is updated per chunk, so the file is never held in
+    memory as a whole. An upload whose declared size is over max_bytes is
+    rejected before anything is read; one that grows past it while
+    streaming is abandoned at that chunk. The upload is closed either way.
+
+    Args:
+        upload: FastAPI/Starlette UploadFile
+        max_bytes: Largest accepted file size (0 or None for no limit)
+        chunk_size: Bytes read per step
+        temp_dir: Directory for the temporary file (None for the system default)
+
+    Returns:
+        Dict with status ("ok", "too_large" or "empty"), path of the
+        temporary file (only for "ok"; the caller deletes it with discard),
+        digest, size and error
+    """
+    too_large = spool_result(
+        TOO_LARGE, error=f"File exceeds the {max_bytes}-byte upload limit"
+    )
+    try:
+        declared = getattr(upload, "size", None)
+        if max_bytes and declared is not None and declared > max_bytes:
+            too_large["size"] = declared
+            return too_large
+
+        hasher = hashlib.sha256()
+        size = 0
+        spooled = tempfile.NamedTemporaryFile(
+            prefix="upload-", suffix=os.path.splitext(upload.filename or "")[1].lower(),
+            dir=temp_dir, delete=False
+        )
+        try:
+            with spooled:
+                while True:
+                    chunk = await upload.read(chunk_size)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if max_bytes and size > max_bytes:
+                        break
+                    hasher.update(chunk)
+                    spooled.write(chunk)
+        except BaseException:
+            discard(spooled.name)
+            raise
+
+        if max_bytes and size > max_bytes:
+            discard(spooled.name)
+            too_large["size"] = size
+            return too_large
+        if size == 0:
+            discard(spooled.name)
+            return spool_result(EMPTY, error="File is empty")
+        return spool_result("ok", spooled.name, hasher.hexdigest(), size)
+    finally:
+        await upload.close()
@@ -0,0 +1,342 @@
+"""
+Vector Store Module
+Append-only, memory-mapped embedding matrices in float32, float16 or int8
+"""
+
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Iterable, Optional
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are only serialized within a process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class VectorStore:
+    """
+    L2-normalized embedding rows in a flat file, memory-mapped with np.memmap
+
+    Every process that opens the same file shares one copy of it in the OS
+    page cache, so uvicorn workers do not each hold the corpus in private
+    memory. Rows are stored as:
+
+    - float32: 4 bytes per dimension, exact
+    - float16: 2 bytes per dimension
+    - int8: 1 byte per dimension plus a float32 scale per row in a
+      "<path>.scales" side file (value = code * scale)
+
+    Scoring reads the encoded rows block by block, so a query never
+    materializes a float32 copy of the whole corpus.
+
+    Appends from several processes are serialized by an fcntl lock on
+    "<path>.lock" (see locked), and each append starts at the row count of
+    the file at that moment. Readers call refresh to see rows appended by
+    other processes.
+    """
+
+    DTYPES = ("float32", "float16", "int8")
+
+    # Rows decoded per block while scoring, bounding the float32 temporary
+    SCORE_BLOCK_ROWS = 16384
+
+    def __init__(self, path: str, dimension: int, dtype: str = "float32"):
+        """
+        Open (or create) a store
+
+        Args:
+            path: Data file
+            dimension: Embedding dimension
+            dtype: "float32", "float16" or "int8"
+        """
+        if dtype not in self.DTYPES:
+            raise ValueError(f"Unknown vector dtype {dtype}. Use one of {self.DTYPES}")
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self.path = path
+        self.scales_path = path + ".scales"
+        self.lock_path = path + ".lock"
+        self.dimension = dimension
+        self.dtype = dtype
+        self._lock = threading.Lock()
+        self._write_lock = threading.RLock()
+        self._lock_file = None
+        self._lock_depth = 0
+        self._codes = None
+        self._scales = None
+
+        with self.locked():
+            for file_path in self._files():
+                if not os.path.exists(file_path):
+                    open(file_path, "ab").close()
+
+            self._size = self._file_rows()
+            # Drop a partial row or an unmatched scale left by an interrupted append
+            self._truncate_files(self._size)
+
+    @property
+    def row_bytes(self) -> int:
+        """Bytes per row in the data file"""
+        return self.dimension * np.dtype(self.dtype).itemsize
+
+    def _files(self):
+        return [self.path, self.scales_path] if self.dtype == "int8" else [self.path]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _file_rows(self) -> int:
+        """Whole rows currently in the data (and scales) file"""
+        rows = os.path.getsize(self.path) // self.row_bytes
+        if self.dtype == "int8":
+            rows = min(rows, os.path.getsize(self.scales_path) // 4)
+        return rows
+
+    @contextmanager
+    def locked(self):
+        """
+        Hold the inter-process write lock of the store
+
+        Re-entrant within a thread, so a caller can keep the lock across an
+        append and its own bookkeeping (e.g. CorpusStore's database insert).
+        """
+        with self._write_lock:
+            if self._lock_depth == 0:
+                self._lock_file = open(self.lock_path, "a+b")
+                if fcntl is not None:
+                    fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0:
+                    if fcntl is not None:
+                        fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+                    self._lock_file.close()
+                    self._lock_file = None
+
+    def refresh(self, rows: Optional[int] = None) -> int:
+        """
+        Pick up rows appended by other processes
+
+        Args:
+            rows: Expose at most this many rows (e.g. the committed count,
+                  so rows of an append still in progress stay hidden)
+
+        Returns:
+            Number of visible rows
+        """
+        with self._lock:
+            size = self._file_rows()
+            if rows is not None:
+                size = min(size, rows)
+            if size != self._size:
+                self._size = size
+                self._codes = self._scales = None
+            return size
+
+    def nbytes(self) -> int:
+        """Size of the stored rows (scales included) in bytes"""
+        return self._size * (self.row_bytes + (4 if self.dtype == "int8" else 0))
+
+    def encode(self, vectors: np.ndarray):
+        """
+        Normalize and quantize vectors to the store's encoding
+
+        Args:
+            vectors: (N, d) vectors
+
+        Returns:
+            Tuple of (codes, scales); scales is None unless dtype is int8
+        """
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dimension)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms > 0, norms, 1.0)
+
+        if self.dtype != "int8":
+            return vectors.astype(self.dtype), None
+
+        scales = np.abs(vectors).max(axis=1) / 127.0
+        safe = np.where(scales > 0, scales, 1.0)[:, None]
+        codes = np.clip(np.rint(vectors / safe), -127, 127).astype(np.int8)
+        return codes, scales.astype(np.float32)
+
+    def append(self, vectors: np.ndarray) -> int:
+        """
+        Normalize, encode and durably append rows
+
+        Args:
+            vectors: (N, d) vectors
+
+        Returns:
+            Row number of the first appended vector
+        """
+        codes, scales = self.encode(vectors)
+        with self.locked(), self._lock:
+            # Other processes may have appended since this one last looked
+            first_row = self._file_rows()
+            self._truncate_files(first_row)
+            self._write(self.path, codes)
+            if scales is not None:
+                self._write(self.scales_path, scales)
+            self._size = first_row + len(codes)
+            self._codes = self._scales = None
+        return first_row
+
+    @staticmethod
+    def _write(path: str, array: np.ndarray) -> None:
+        with open(path, "ab") as f:
+            f.write(np.ascontiguousarray(array).tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+
+    def truncate(self, rows: int) -> None:
+        """
+        Drop every row from rows onwards (e.g. rows of a failed transaction)
+
+        Only safe while the caller holds locked() since before the rows were
+        appended; otherwise rows of another process may be dropped.
+        """
+        with self.locked(), self._lock:
+            if rows >= self._file_rows():
+                return
+            self._truncate_files(rows)
+            self._size = rows
+            self._codes = self._scales = None
+
+    def _truncate_files(self, rows: int) -> None:
+        for file_path, row_bytes in zip(self._files(), (self.row_bytes, 4)):
+            if os.path.getsize(file_path) > rows * row_bytes:
+                with open(file_path, "r+b") as f:
+                    f.truncate(rows * row_bytes)
+
+    def _mapped(self):
+        """Memory-mapped (codes, scales) of the committed rows"""
+        with self._lock:
+            if self._codes is None:
+                if self._size == 0:
+                    self._codes = np.empty((0, self.dimension), dtype=self.dtype)
+                    self._scales = np.empty(0, dtype=np.float32)
+                else:
+                    self._codes = np.memmap(
+                        self.path, dtype=self.dtype, mode="r", shape=(self._size, self.dimension)
+                    )
+                    if self.dtype == "int8":
+                        self._scales = np.memmap(
+                            self.scales_path, dtype=np.float32, mode="r", shape=(self._size,)
+                        )
+            return self._codes, self._scales
+
+    def vectors(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """
+        Decode a contiguous range of rows to float32
+
+        Args:
+            start: First row
+            stop: End row (exclusive, default: all rows)
+
+        Returns:
+            (stop - start, d) float32 array
+        """
+        codes, scales = self._mapped()
+        block = np.asarray(codes[start:stop], dtype=np.float32)
+        if scales is not None:
+            block *= scales[start:stop, None]
+        return block
+
+    def take(self, rows: Iterable[int]) -> np.ndarray:
+        """Decode arbitrary rows to float32, in the given order"""
+        rows = np.asarray(list(rows), dtype=np.int64)
+        codes, scales = self._mapped()
+        block = codes[rows].astype(np.float32)
+        if scales is not None:
+            block *= scales[rows, None]
+        return block
+
+    def scores(self, query: np.ndarray) -> np.ndarray:
+        """
+        Cosine similarity of a query against every row
+
+        float16 and int8 blocks are cast to float32 one block at a time;
+        int8 scores are rescaled per row afterwards, which is cheaper than
+        rescaling the d values of every row. numpy's float16 cast is not
+        vectorized on most CPUs, so float16 saves memory but scans several
+        times slower than float32; int8 saves more and scans at about
+        float32 speed.
+
+        Args:
+            query: Query embedding
+
+        Returns:
+            Array of N float32 scores
+        """
+        query = np.asarray(query, dtype=np.float32).ravel()
+        norm = np.linalg.norm(query)
+        codes, scales = self._mapped()
+        result = np.zeros(len(codes), dtype=np.float32)
+        if norm == 0 or len(codes) == 0:
+            return result
+        query = query / norm
+
+        for start in range(0, len(codes), self.SCORE_BLOCK_ROWS):
+            block = codes[start:start + self.SCORE_BLOCK_ROWS]
+            if self.dtype != "float32":
+                block = block.astype(np.float32)
+            result[start:start + len(block)] = block @ query
+        if scales is not None:
+            result *= scales
+        return np.clip(result, -1.0, 1.0)
+
+    def compact(
+        self, keep: Optional[np.ndarray] = None, dtype: Optional[str] = None,
+        block_rows: int = 65536
+    ) -> "VectorStore":
+        """
+        Rewrite the store offline, dropping rows and/or changing the encoding
+
+        The new files are written next to the old ones and swapped in with
+        os.replace, so readers never see a half-written store. Surviving
+        rows keep their relative order.
+
+        Args:
+            keep: Boolean mask of rows to keep (default: all)
+            dtype: New encoding (default: unchanged)
+            block_rows: Rows re-encoded per block
+
+        Returns:
+            The compacted store (self is closed and must not be used afterwards)
+        """
+        dtype = dtype or self.dtype
+        tmp = VectorStore(self.path + ".compact", self.dimension, dtype)
+        tmp.truncate(0)
+
+        for start in range(0, self._size, block_rows):
+            block = self.vectors(start, start + block_rows)
+            if keep is not None:
+                block = block[np.asarray(keep[start:start + block_rows], dtype=bool)]
+            if len(block):
+                tmp.append(block)
+
+        with self._lock:
+            self._codes = self._scales = None
+            os.replace(tmp.path, self.path)
+            if dtype == "int8":
+                os.replace(tmp.scales_path, self.scales_path)
+            elif os.path.exists(self.scales_path):
+                os.remove(self.scales_path)
+            if os.path.exists(tmp.scales_path):
+                os.remove(tmp.scales_path)
+            if os.path.exists(tmp.lock_path):
+                os.remove(tmp.lock_path)
+
+        logger.info(f"Compacted {self.path}: {self._size} -> {len(tmp)} rows ({dtype})")
+        return VectorStore(self.path, self.dimension, dtype)
@@ -0,0 +1,77 @@
+"""
+ANN Benchmark
+Recall@k and query latency of the IVF index against the exact RankingEngine
+
+Run from the repository root:
+    python -m benchmarks.bench_ann --rows 100000 --nprobe 1 4 16 64
+"""
+
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.ann_index import IVFIndex, normalize_rows  # noqa: E402
+from backend.ranking_engine import RankingEngine  # noqa: E402
+
+
+def clustered_data(rng, n: int, dim: int, topics: int, subtopics: int = 20) -> np.ndarray:
+    """
+    Unit vectors around topic and sub-topic centres, closer to real
+    embeddings than pure noise (neighbours share more than their topic)
+    """
+    # Fixed centres so that corpus and queries generated separately share topics
+    centre_rng = np.random.default_rng(1234)
+    centres = centre_rng.standard_normal((topics, dim), dtype=np.float32)
+    offsets = centre_rng.standard_normal((topics * subtopics, dim), dtype=np.float32)
+    subtopic = rng.integers(0, topics * subtopics, n)
+    data = centres[subtopic // subtopics] + 0.7 * offsets[subtopic]
+    data += 0.5 * rng.standard_normal((n, dim), dtype=np.float32)
+    return normalize_rows(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--topics", type=int, default=500)
+    parser.add_argument("--n-lists", type=int, default=0, help="0 = about 4 * sqrt(rows)")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    matrix = clustered_data(rng, args.rows, args.dim, args.topics)
+    queries = clustered_data(rng, args.queries, args.dim, args.topics)
+    n_lists = args.n_lists or max(1, int(4 * args.rows ** 0.5))
+
+    start = time.perf_counter()
+    index = IVFIndex(args.dim, n_lists=n_lists)
+    index.train(matrix)
+    index.add(range(args.rows), matrix)
+    build_s = time.perf_counter() - start
+
+    engine = RankingEngine(matrix, normalized=True)
+    start = time.perf_counter()
+    exact = [set(engine.top_k(q, args.top_k)[0].tolist()) for q in queries]
+    exact_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+    print(f"rows={args.rows} dim={args.dim} n_lists={index.n_lists} top_k={args.top_k} "
+          f"queries={args.queries} build={build_s:.1f}s")
+    print(f"{'method':>12} {'recall@k':>9} {'ms/query':>9} {'speed-up':>9}")
+    print(f"{'exact':>12} {1.0:9.3f} {exact_ms:9.2f} {'1x':>9}")
+
+    for nprobe in args.nprobe:
+        start = time.perf_counter()
+        found = [index.search(q, args.top_k, nprobe=nprobe)[0].tolist() for q in queries]
+        ivf_ms = (time.perf_counter() - start) * 1000 / len(queries)
+        recall = np.mean([len(truth & set(ids)) / args.top_k for truth, ids in zip(exact, found)])
+        print(f"{'ivf/' + str(nprobe):>12} {recall:9.3f} {ivf_ms:9.2f} {exact_ms / ivf_ms:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
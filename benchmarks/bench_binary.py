@@ -0,0 +1,87 @@
+"""
+Binary Prefilter Benchmark
+Recall@k and latency of the sign-bit Hamming prefilter plus exact rerank
+against exact corpus search, all through CorpusStore.search
+
+Run from the repository root:
+    python -m benchmarks.bench_binary --rows 1000000 --rerank 20 50 200 2000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.ann_index import BinaryIndex  # noqa: E402
+from backend.corpus_store import CorpusStore  # noqa: E402
+from benchmarks.bench_ann import clustered_data  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--topics", type=int, default=500)
+    parser.add_argument("--rerank", type=int, nargs="+", default=[20, 50, 200, 2000])
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    queries = clustered_data(rng, args.queries, args.dim, args.topics)
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = CorpusStore(
+            os.path.join(directory, "corpus.db"), os.path.join(directory, "corpus.f32"),
+            "bench", args.dim
+        )
+        for first in range(0, args.rows, 100000):
+            n = min(100000, args.rows - first)
+            records = [
+                {"candidate_name": str(i), "filename": "", "content_sha256": str(i), "text": ""}
+                for i in range(first, first + n)
+            ]
+            store.add(records, clustered_data(rng, n, args.dim, args.topics))
+
+        start = time.perf_counter()
+        index = BinaryIndex(args.dim)
+        store.build_index("binary", index)
+        build_s = time.perf_counter() - start
+
+        def run(**options):
+            start = time.perf_counter()
+            found = [
+                [r["row"] for r in store.search(q, args.top_k, **options)] for q in queries
+            ]
+            return found, (time.perf_counter() - start) * 1000 / len(queries)
+
+        exact, exact_ms = run()
+        exact = [set(rows) for rows in exact]
+
+        start = time.perf_counter()
+        for q in queries:
+            index.search(q, max(args.rerank))
+        scan_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+        print(f"rows={args.rows} dim={args.dim} top_k={args.top_k} queries={args.queries} "
+              f"build={build_s:.1f}s")
+        print(f"codes: {index.nbytes() / 2 ** 20:.0f} MB vs float32 "
+              f"{store.matrix_nbytes() / 2 ** 20:.0f} MB; "
+              f"Hamming scan alone: {scan_ms:.1f} ms/query")
+        print(f"{'method':>14} {'recall@k':>9} {'ms/query':>9} {'speed-up':>9}")
+        print(f"{'exact':>14} {1.0:9.3f} {exact_ms:9.1f} {'1x':>9}")
+
+        for rerank in args.rerank:
+            found, binary_ms = run(method="binary", rerank=rerank)
+            recall = np.mean([len(t & set(f)) / args.top_k for t, f in zip(exact, found)])
+            print(f"{'binary/' + str(rerank):>14} {recall:9.3f} {binary_ms:9.1f} "
+                  f"{exact_ms / binary_ms:8.1f}x")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Chunking Benchmark
+Throughput and text coverage of whole-text encoding (truncated by the model)
+against token-bounded chunks encoded in length-sorted buckets
+
+Run from the repository root:
+    python -m benchmarks.bench_chunking --resumes 200 --batch-size 32
+"""
+
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.embedding_generator import EmbeddingGenerator  # noqa: E402
+
+VOCABULARY = (
+    "python java kubernetes docker aws azure sql postgres machine learning data "
+    "engineer developer senior lead team project delivered built designed led "
+    "microservices api backend frontend react pipeline spark airflow testing "
+    "agile scrum mentoring architecture cloud security performance analytics"
+).split()
+
+
+def synthetic_resumes(rng, n: int, median_words: int) -> list:
+    """Resumes with log-normal word counts, so a few are much longer than the model limit"""
+    lengths = np.clip(rng.lognormal(np.log(median_words), 0.8, n), 20, 20000).astype(int)
+    return [" ".join(rng.choice(VOCABULARY, length)) for length in lengths]
+
+
+def padded_tokens(lengths: list, batch_size: int) -> int:
+    """Tokens processed when each batch pads to its longest member"""
+    return sum(
+        max(lengths[start:start + batch_size]) * len(lengths[start:start + batch_size])
+        for start in range(0, len(lengths), batch_size)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=200)
+    parser.add_argument("--median-words", type=int, default=400)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    texts = synthetic_resumes(rng, args.resumes, args.median_words)
+    generator = EmbeddingGenerator(args.model, batch_size=args.batch_size)
+    generator.generate_batch_embeddings(texts[:4])  # warm-up
+
+    max_tokens = generator.max_chunk_tokens()
+    chunks, owners, lengths = generator.chunk_texts(texts)
+    total_tokens = sum(lengths)
+    whole_tokens = sum(
+        min(int(np.sum(lengths_of)), max_tokens)
+        for lengths_of in np.split(np.asarray(lengths), np.flatnonzero(np.diff(owners)) + 1)
+    )
+
+    start = time.perf_counter()
+    generator.generate_batch_embeddings(texts)
+    whole_s = time.perf_counter() - start
+
+    # Chunks in upload order, one model call per batch: padding as without bucketing
+    start = time.perf_counter()
+    for first in range(0, len(chunks), args.batch_size):
+        generator.model.encode(chunks[first:first + args.batch_size], convert_to_numpy=True)
+    unsorted_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    generator.generate_chunked_embeddings(texts)
+    bucketed_s = time.perf_counter() - start
+
+    sorted_lengths = sorted(lengths)
+    print(f"resumes={len(texts)} chunks={len(chunks)} max_chunk_tokens={max_tokens} "
+          f"batch_size={args.batch_size} tokens={total_tokens}")
+    print(f"{'path':>18} {'seconds':>8} {'resumes/s':>10} {'tokens seen':>12} {'padding':>8}")
+    print(f"{'whole (truncated)':>18} {whole_s:8.2f} {len(texts) / whole_s:10.1f} "
+          f"{whole_tokens / total_tokens:11.0%} {'-':>8}")
+    for name, seconds, order in (
+        ("chunks unsorted", unsorted_s, lengths),
+        ("chunks bucketed", bucketed_s, sorted_lengths),
+    ):
+        padding = 1 - total_tokens / padded_tokens(order, args.batch_size)
+        print(f"{name:>18} {seconds:8.2f} {len(texts) / seconds:10.1f} "
+              f"{1.0:11.0%} {padding:8.0%}")
+
+
+if __name__ == "__main__":
+    main()
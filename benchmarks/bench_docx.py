@@ -0,0 +1,74 @@
+"""
+DOCX Extraction Benchmark
+Throughput of the python-docx object model against the streaming
+zipfile + incremental XML engine on a generated DOCX corpus
+
+Run from the repository root:
+    python -m benchmarks.bench_docx --documents 200 --paragraphs 80 --table-rows 30
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docx import Document  # noqa: E402
+from backend.document_processor import DocumentProcessor  # noqa: E402
+from benchmarks.bench_pdf import WORDS  # noqa: E402
+
+
+def resume_docx(rng, paragraphs: int, table_rows: int) -> bytes:
+    """A resume-like DOCX: body paragraphs and a skills table with merged headers"""
+    document = Document()
+    for _ in range(paragraphs):
+        document.add_paragraph(" ".join(rng.choice(WORDS, 15)))
+
+    table = document.add_table(rows=table_rows, cols=4)
+    for row in range(table_rows):
+        if row % 5 == 0:
+            # Section header spanning the row: python-docx yields it once per column
+            header = table.cell(row, 0).merge(table.cell(row, 3))
+            header.text = " ".join(rng.choice(WORDS, 3))
+        else:
+            for col in range(4):
+                table.cell(row, col).text = " ".join(rng.choice(WORDS, 4))
+
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument("--paragraphs", type=int, default=80)
+    parser.add_argument("--table-rows", type=int, default=30)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    corpus = [resume_docx(rng, args.paragraphs, args.table_rows) for _ in range(args.documents)]
+    megabytes = sum(map(len, corpus)) / 2 ** 20
+
+    print(f"documents={args.documents} paragraphs={args.paragraphs} "
+          f"table_rows={args.table_rows} size={megabytes:.1f} MB")
+    print(f"{'engine':>12} {'seconds':>8} {'docs/s':>8} {'MB/s':>7} "
+          f"{'chars/doc':>10} {'speed-up':>9}")
+
+    baseline = None
+    for engine in DocumentProcessor.DOCX_ENGINES[::-1]:
+        processor = DocumentProcessor(docx_engine=engine)
+        start = time.perf_counter()
+        texts = [processor.extract_from_docx(content) for content in corpus]
+        seconds = time.perf_counter() - start
+        baseline = baseline or seconds
+        print(f"{engine:>12} {seconds:8.2f} {len(corpus) / seconds:8.1f} "
+              f"{megabytes / seconds:7.1f} {np.mean([len(t) for t in texts]):10.0f} "
+              f"{baseline / seconds:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Normalizer Benchmark
+Time of the previous five-pass clean_text + remove_stopwords pipeline
+against the single-pass normalizer, on the sample data
+
+Run from the repository root:
+    python -m benchmarks.bench_normalizer --repeat 2000
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.document_processor import DocumentProcessor  # noqa: E402
+from tests.helpers import legacy_clean_text, legacy_content_tokens  # noqa: E402
+
+SAMPLE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sample_data"
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--scale", type=int, default=1, help="Concatenate each sample this often")
+    args = parser.parse_args()
+
+    processor = DocumentProcessor()
+    samples = []
+    for path in sorted(glob.glob(os.path.join(SAMPLE_DIR, "*.txt"))):
+        with open(path, encoding="utf-8") as sample:
+            samples.append("\n".join([sample.read()] * args.scale))
+
+    for text in samples:
+        assert processor.clean_text(text) == legacy_clean_text(text)
+        assert processor.content_tokens(text) == legacy_content_tokens(processor, text)
+
+    def timed(func) -> float:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for text in samples:
+                func(text)
+        return (time.perf_counter() - start) * 1e6 / (args.repeat * len(samples))
+
+    characters = sum(map(len, samples)) // len(samples)
+    print(f"samples={len(samples)} mean_chars={characters} repeat={args.repeat} "
+          f"(microseconds per document, outputs identical)")
+    print(f"{'stage':>26} {'previous':>9} {'single-pass':>12} {'speed-up':>9}")
+    for stage, previous, current in (
+        ("clean_text", legacy_clean_text, processor.clean_text),
+        ("clean + remove_stopwords",
+         lambda text: legacy_content_tokens(processor, text), processor.content_tokens),
+    ):
+        previous_us, current_us = timed(previous), timed(current)
+        print(f"{stage:>26} {previous_us:9.1f} {current_us:12.1f} {previous_us / current_us:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
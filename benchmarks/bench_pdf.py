@@ -0,0 +1,88 @@
+"""
+PDF Extraction Benchmark
+Per-page extraction time, and whole-document time of the previous
+concatenating extractor against streamed and budget-stopped extraction
+
+Run from the repository root:
+    python -m benchmarks.bench_pdf --pages 5 50 200 --max-chars 4000
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyPDF2 import PdfReader  # noqa: E402
+from backend.document_processor import DocumentProcessor, iter_pdf_pages  # noqa: E402
+from tests.helpers import text_pdf  # noqa: E402
+
+WORDS = (
+    "python java kubernetes docker aws azure sql postgres machine learning data "
+    "engineer developer senior lead team project delivered built designed led"
+).split()
+
+
+def resume_pdf(rng, n_pages: int, lines_per_page: int = 60) -> bytes:
+    """A resume-like PDF of n_pages full pages"""
+    return text_pdf([
+        [" ".join(rng.choice(WORDS, 12)) for _ in range(lines_per_page)]
+        for _ in range(n_pages)
+    ])
+
+
+def concatenating_extract(processor: DocumentProcessor, file_content: bytes) -> str:
+    """Previous extractor: += every page, always parse the whole document"""
+    text = ""
+    for page in PdfReader(io.BytesIO(file_content)).pages:
+        text += page.extract_text()
+    return processor.clean_text(text)
+
+
+def timed(func, repeat: int = 3) -> float:
+    """Best wall-clock time of func over repeat runs, in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, nargs="+", default=[5, 50, 200])
+    parser.add_argument("--max-chars", type=int, default=4000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    streaming = DocumentProcessor()
+    budgeted = DocumentProcessor(pdf_max_chars=args.max_chars)
+
+    print(f"max_chars={args.max_chars} (best of 3, milliseconds)")
+    print(f"{'pages':>6} {'ms/page':>8} {'p95 page':>9} {'concat +=':>10} "
+          f"{'streamed':>9} {'budget':>8}")
+
+    for n_pages in args.pages:
+        pdf = resume_pdf(rng, n_pages)
+
+        page_ms = []
+        pages = iter_pdf_pages(pdf)
+        while True:
+            start = time.perf_counter()
+            if next(pages, None) is None:
+                break
+            page_ms.append((time.perf_counter() - start) * 1000)
+
+        concat_ms = timed(lambda: concatenating_extract(streaming, pdf))
+        streamed_ms = timed(lambda: streaming.extract_from_pdf(pdf))
+        budget_ms = timed(lambda: budgeted.extract_from_pdf(pdf))
+
+        print(f"{n_pages:>6} {np.mean(page_ms):8.2f} {np.percentile(page_ms, 95):9.2f} "
+              f"{concat_ms:10.1f} {streamed_ms:9.1f} {budget_ms:8.1f}")
+
+if __name__ == "__main__":
+    main()
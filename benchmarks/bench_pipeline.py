@@ -0,0 +1,166 @@
+"""
+Screening Pipeline Benchmark
+Wall-clock time and peak RSS growth of staged screening (extract all,
+encode all, score all) against the streaming ScreeningPipeline on a
+generated PDF corpus
+
+Each mode runs in a fresh child process with its own model, extraction
+pool and embedding batcher; peak RSS is sampled from /proc every 5 ms.
+
+Run from the repository root:
+    python -m benchmarks.bench_pipeline --resumes 300 --pages 3 --top-k 10
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.batch_scheduler import EmbeddingBatcher  # noqa: E402
+from backend.embedding_generator import EmbeddingGenerator  # noqa: E402
+from backend.extraction_pool import ExtractionPool  # noqa: E402
+from backend.ranking_engine import RankingEngine  # noqa: E402
+from backend.screening_pipeline import ScreeningPipeline  # noqa: E402
+from benchmarks.bench_pdf import resume_pdf  # noqa: E402
+
+QUERY = "senior python developer with kubernetes aws and machine learning experience"
+
+
+class RSSSampler:
+    """Background thread recording the highest resident set size seen"""
+
+    def __init__(self, interval_s: float = 0.005):
+        self.interval_s = interval_s
+        self.peak = self.resident()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @staticmethod
+    def resident() -> int:
+        """Current RSS in bytes (0 where /proc is missing)"""
+        try:
+            with open("/proc/self/statm") as statm:
+                return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError):
+            return 0
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            self.peak = max(self.peak, self.resident())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.resident())
+
+
+async def staged(pool, batcher, corpus, top_k):
+    """Previous flow: extract everything, then encode everything, then rank"""
+    results = await asyncio.gather(
+        *[pool.extract_async(content, "resume.pdf") for content in corpus]
+    )
+    readable = [i for i, result in enumerate(results) if result["status"] == "ok"]
+    embeddings = await batcher.encode([QUERY] + [results[i]["text"] for i in readable])
+    scores = RankingEngine(embeddings[1:]).score_matrix(embeddings[:1])[0]
+    return [readable[i] for i in RankingEngine.select_top_k(scores, top_k)]
+
+
+async def pipelined(pool, batcher, corpus, top_k, args):
+    """Streaming flow: bounded queues between extraction and encoding, top-k heap"""
+    query = await batcher.encode([QUERY])
+
+    async def score(texts):
+        return RankingEngine(await batcher.encode(texts)).score_matrix(query)[0]
+
+    pipeline = ScreeningPipeline(
+        lambda content: pool.extract_async(content, "resume.pdf"),
+        score,
+        batch_size=args["batch_size"],
+        queue_size=args["queue_size"],
+        extract_concurrency=args["extract_concurrency"],
+        encode_concurrency=args["encode_concurrency"]
+    )
+    ranking, _, _ = await pipeline.run(corpus, top_k)
+    return [index for _, index, _ in ranking]
+
+
+def run_mode(mode, corpus, args, conn):
+    """Child process: build the components, time one mode, send back the numbers"""
+    generator = EmbeddingGenerator(args["model"], batch_size=args["batch_size"])
+    batcher = EmbeddingBatcher(generator, max_batch_size=args["batch_size"])
+    pool = ExtractionPool(n_workers=args["workers"])
+
+    async def main():
+        # Warm up the model and the worker processes outside the measurement
+        await batcher.encode([QUERY])
+        await asyncio.gather(
+            *[pool.extract_async(content, "resume.pdf") for content in corpus[:args["workers"]]]
+        )
+
+        baseline = RSSSampler.resident()
+        with RSSSampler() as sampler:
+            start = time.perf_counter()
+            if mode == "staged":
+                top = await staged(pool, batcher, corpus, args["top_k"])
+            else:
+                top = await pipelined(pool, batcher, corpus, args["top_k"], args)
+            seconds = time.perf_counter() - start
+        return seconds, (sampler.peak - baseline) / 2 ** 20, [int(i) for i in top]
+
+    try:
+        conn.send(asyncio.run(main()))
+    finally:
+        batcher.stop()
+        pool.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=300)
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1))
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--queue-size", type=int, default=64)
+    parser.add_argument("--extract-concurrency", type=int, default=None)
+    parser.add_argument("--encode-concurrency", type=int, default=2)
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    args = vars(parser.parse_args())
+    args["extract_concurrency"] = args["extract_concurrency"] or 2 * args["workers"]
+
+    rng = np.random.default_rng(0)
+    corpus = [resume_pdf(rng, args["pages"]) for _ in range(args["resumes"])]
+    context = multiprocessing.get_context(
+        "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+    )
+
+    print(f"resumes={args['resumes']} pages={args['pages']} workers={args['workers']} "
+          f"batch_size={args['batch_size']} queue_size={args['queue_size']} "
+          f"extract_concurrency={args['extract_concurrency']} "
+          f"encode_concurrency={args['encode_concurrency']}")
+    print(f"{'mode':>10} {'seconds':>8} {'resumes/s':>10} {'peak RSS +MB':>13}")
+
+    tops = {}
+    for mode in ("staged", "pipelined"):
+        parent_conn, child_conn = context.Pipe()
+        process = context.Process(target=run_mode, args=(mode, corpus, args, child_conn))
+        process.start()
+        seconds, peak_mb, tops[mode] = parent_conn.recv()
+        process.join()
+        print(f"{mode:>10} {seconds:8.2f} {len(corpus) / seconds:10.1f} {peak_mb:13.1f}")
+
+    print(f"same top-{args['top_k']}: {tops['staged'] == tops['pipelined']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+PQ Benchmark
+Memory, recall@k and latency of the PQ index (with and without exact rerank)
+against exact corpus search, all through CorpusStore.search
+
+Run from the repository root:
+    python -m benchmarks.bench_pq --rows 1000000 --rerank 0 50 200 500
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.ann_index import PQIndex  # noqa: E402
+from backend.corpus_store import CorpusStore  # noqa: E402
+from benchmarks.bench_ann import clustered_data  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--topics", type=int, default=500)
+    parser.add_argument("--n-subvectors", type=int, default=48)
+    parser.add_argument("--rerank", type=int, nargs="+", default=[0, 50, 200, 500])
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    queries = clustered_data(rng, args.queries, args.dim, args.topics)
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = CorpusStore(
+            os.path.join(directory, "corpus.db"), os.path.join(directory, "corpus.f32"),
+            "bench", args.dim
+        )
+        for first in range(0, args.rows, 100000):
+            n = min(100000, args.rows - first)
+            records = [
+                {"candidate_name": str(i), "filename": "", "content_sha256": str(i), "text": ""}
+                for i in range(first, first + n)
+            ]
+            store.add(records, clustered_data(rng, n, args.dim, args.topics))
+
+        start = time.perf_counter()
+        index = PQIndex(args.dim, n_subvectors=args.n_subvectors)
+        store.build_index("pq", index)
+        build_s = time.perf_counter() - start
+
+        def run(**options):
+            start = time.perf_counter()
+            found = [
+                [r["row"] for r in store.search(q, args.top_k, **options)] for q in queries
+            ]
+            return found, (time.perf_counter() - start) * 1000 / len(queries)
+
+        exact, exact_ms = run()
+        exact = [set(rows) for rows in exact]
+
+        print(f"rows={args.rows} dim={args.dim} n_subvectors={args.n_subvectors} "
+              f"top_k={args.top_k} queries={args.queries} build={build_s:.1f}s")
+        print(f"{'method':>14} {'MB':>8} {'recall@k':>9} {'ms/query':>9}")
+        print(f"{'exact float32':>14} {store.matrix_nbytes() / 2 ** 20:8.0f} "
+              f"{1.0:9.3f} {exact_ms:9.1f}")
+
+        for rerank in args.rerank:
+            found, pq_ms = run(method="pq", rerank=rerank)
+            recall = np.mean([len(t & set(f)) / args.top_k for t, f in zip(exact, found)])
+            print(f"{'pq/' + str(rerank):>14} {index.nbytes() / 2 ** 20:8.0f} "
+                  f"{recall:9.3f} {pq_ms:9.1f}")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
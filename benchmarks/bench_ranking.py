@@ -0,0 +1,85 @@
+"""
+Ranking Benchmark
+Compares the per-pair cosine_similarity loop with the vectorized RankingEngine
+
+Run from the repository root:
+    python -m benchmarks.bench_ranking --rows 1000 100000 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.ranking_engine import RankingEngine  # noqa: E402
+from backend.similarity_calculator import SimilarityCalculator  # noqa: E402
+
+
+def timed(func, repeat: int) -> float:
+    """Best wall-clock time of func over repeat runs, in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def loop_ranking(query: np.ndarray, rows: list, k: int) -> list:
+    """Previous approach: score pair by pair, then sort the full list"""
+    scores = [SimilarityCalculator.cosine_similarity(query, row) for row in rows]
+    ranked = sorted(enumerate(scores), key=lambda x: x[1], reverse=True)
+    return ranked[:k]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--loop-max-rows", type=int, default=1000000,
+        help="Skip the per-pair loop above this many rows"
+    )
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    query = rng.standard_normal(args.dim).astype(np.float32)
+
+    print(f"dim={args.dim} top_k={args.top_k} (best of {args.repeat}, milliseconds)")
+    print(f"{'rows':>10} {'loop+sort':>12} {'full argsort':>13} {'argpartition':>13} {'speed-up':>9}")
+
+    for n in args.rows:
+        matrix = rng.standard_normal((n, args.dim), dtype=np.float32)
+        matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+        engine = RankingEngine(matrix, normalized=True)
+
+        def full_sort():
+            scores = engine.scores(query)
+            return np.argsort(-scores)[:args.top_k]
+
+        engine_ms = timed(lambda: engine.top_k(query, args.top_k), args.repeat)
+        sort_ms = timed(full_sort, args.repeat)
+
+        if n <= args.loop_max_rows:
+            rows = list(matrix)
+            loop_ms = timed(lambda: loop_ranking(query, rows, args.top_k), 1)
+            expected = [i for i, _ in loop_ranking(query, rows, args.top_k)]
+            assert list(engine.top_k(query, args.top_k)[0]) == expected
+            del rows
+            loop_text = f"{loop_ms:12.1f}"
+            speedup = f"{loop_ms / engine_ms:8.0f}x"
+        else:
+            loop_text = f"{'skipped':>12}"
+            speedup = f"{'-':>9}"
+
+        print(f"{n:>10} {loop_text} {sort_ms:13.2f} {engine_ms:13.2f} {speedup}")
+        del matrix, engine
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Pre-truncation Benchmark
+Tokenization and encoding time of long texts with and without cutting them
+to the calibrated character budget first, and how close the embeddings stay
+
+Run from the repository root:
+    python -m benchmarks.bench_truncation --texts 64 --median-words 3000
+"""
+
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.embedding_generator import EmbeddingGenerator  # noqa: E402
+from benchmarks.bench_chunking import synthetic_resumes  # noqa: E402
+
+
+def timed(func) -> float:
+    """Wall-clock time of func in seconds"""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--texts", type=int, default=64)
+    parser.add_argument("--median-words", type=int, default=3000)
+    parser.add_argument(
+        "--jd-chars", type=int, default=100000,
+        help="Length of the extra job descriptions (FileHandler's maximum)"
+    )
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    texts = synthetic_resumes(rng, args.texts, args.median_words)
+    texts += [text[:args.jd_chars] for text in synthetic_resumes(rng, 4, args.jd_chars // 4)]
+
+    full = EmbeddingGenerator(args.model, batch_size=args.batch_size)
+    fast = EmbeddingGenerator(args.model, batch_size=args.batch_size, pre_truncate=True)
+    fast.model = full.model
+    full.generate_batch_embeddings(texts[:4])  # warm-up
+
+    calibrate_s = timed(lambda: fast.calibrate_truncation())
+    truncated = [fast.truncate_for_model(text) for text in texts]
+    truncate_s = timed(lambda: [fast.truncate_for_model(text) for text in texts])
+
+    print(f"texts={len(texts)} characters={sum(map(len, texts))} "
+          f"budget={fast.truncate_chars} characters "
+          f"(calibration {calibrate_s * 1000:.0f} ms, cutting {truncate_s * 1000:.1f} ms)")
+    print(f"{'stage':>10} {'full s':>8} {'truncated s':>12} {'speed-up':>9}")
+
+    tokenize = getattr(full.model, "tokenize", None)
+    if tokenize is not None:
+        full_s = timed(lambda: tokenize(texts))
+        fast_s = timed(lambda: tokenize(truncated))
+        print(f"{'tokenize':>10} {full_s:8.2f} {fast_s:12.2f} {full_s / fast_s:8.1f}x")
+
+    embeddings = {}
+
+    def encode(generator, name):
+        embeddings[name] = np.vstack(generator.generate_batch_embeddings(texts))
+
+    full_s = timed(lambda: encode(full, "full"))
+    fast_s = timed(lambda: encode(fast, "fast"))
+    print(f"{'encode':>10} {full_s:8.2f} {fast_s:12.2f} {full_s / fast_s:8.1f}x")
+
+    a, b = embeddings["full"], embeddings["fast"]
+    cosines = (a * b).sum(axis=1) / (np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1))
+    print(f"embedding agreement: min cosine {cosines.min():.6f}, "
+          f"mean {cosines.mean():.6f}")
+
+
+if __name__ == "__main__":
+    main()
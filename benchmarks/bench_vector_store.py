@@ -0,0 +1,74 @@
+"""
+Vector Store Benchmark
+Storage size, scan latency and top-k agreement of float32 / float16 / int8 corpora
+
+Run from the repository root:
+    python -m benchmarks.bench_vector_store --rows 1000000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.ranking_engine import RankingEngine  # noqa: E402
+from backend.vector_store import VectorStore  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--append-rows", type=int, default=100000, help="Rows per append call")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    queries = rng.standard_normal((args.queries, args.dim), dtype=np.float32)
+
+    print(f"rows={args.rows} dim={args.dim} top_k={args.top_k} queries={args.queries}")
+    print(f"{'dtype':>8} {'MB':>8} {'append s':>9} {'ms/query':>9} {'recall@k':>9} {'max |err|':>10}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        exact = None
+        for dtype in VectorStore.DTYPES:
+            store = VectorStore(os.path.join(directory, dtype), args.dim, dtype)
+            data_rng = np.random.default_rng(1)
+
+            start = time.perf_counter()
+            for first in range(0, args.rows, args.append_rows):
+                n = min(args.append_rows, args.rows - first)
+                store.append(data_rng.standard_normal((n, args.dim), dtype=np.float32))
+            append_s = time.perf_counter() - start
+
+            store.scores(queries[0])  # fault the pages in once
+            start = time.perf_counter()
+            results = []
+            for query in queries:
+                scores = store.scores(query)
+                top = RankingEngine.select_top_k(scores, args.top_k)
+                results.append((set(top.tolist()), scores))
+            query_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+            if exact is None:
+                exact = results
+            recall = np.mean([
+                len(truth & found) / args.top_k
+                for (truth, _), (found, _) in zip(exact, results)
+            ])
+            error = max(
+                float(np.abs(scores - truth_scores).max())
+                for (_, truth_scores), (_, scores) in zip(exact, results)
+            )
+            print(f"{dtype:>8} {store.nbytes() / 2 ** 20:8.0f} {append_s:9.2f} "
+                  f"{query_ms:9.1f} {recall:9.3f} {error:10.5f}")
+            del store, results
+
+
+if __name__ == "__main__":
+    main()
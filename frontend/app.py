@@ -6,8 +6,15 @@ Provides user interface for uploading resumes and viewing ranked results
 import streamlit as st
 import requests
 import pandas as pd
-from typing import List
+from typing import List, Optional, Tuple
+import hashlib
 import io
+import json
+import time
+
+# Seconds between job status polls, and the longest a screening job is awaited
+JOB_POLL_INTERVAL_S = 1.0
+JOB_MAX_WAIT_S = 3600
 
 # Configure Streamlit page
 st.set_page_config(
@@ -43,6 +50,37 @@ api_url = st.sidebar.text_input(
     help="URL of the resume screening API"
 )
 
+st.sidebar.subheader("Retrieval")
+semantic_only = st.sidebar.checkbox(
+    "Semantic only",
+    value=False,
+    help="Embed every resume instead of shortlisting with BM25 first"
+)
+shortlist_size = st.sidebar.number_input(
+    "BM25 shortlist size",
+    min_value=1,
+    value=200,
+    disabled=semantic_only,
+    help="Uploads larger than this are shortlisted lexically before embedding"
+)
+fusion_weight = st.sidebar.slider(
+    "Keyword weight",
+    min_value=0.0,
+    max_value=1.0,
+    value=0.0,
+    step=0.05,
+    disabled=semantic_only,
+    help="Share of the BM25 keyword score in the final score"
+)
+
+st.sidebar.subheader("Results")
+live_results = st.sidebar.checkbox(
+    "Live results",
+    value=True,
+    help="Stream rankings as resumes are processed; turn off to run large "
+         "batches as a background job"
+)
+
 st.sidebar.info("""
     ### How to use:
     1. Enter the job description
@@ -107,109 +145,368 @@ def main():
 
         with st.spinner("🔄 Analyzing resumes... This may take a moment"):
             try:
-                # Prepare files for API
-                files = []
-                for uploaded_file in uploaded_files:
-                    files.append(
-                        ("resumes", (uploaded_file.name, uploaded_file.getbuffer(), uploaded_file.type))
+                # Upload only the files the server has not extracted before
+                files, known = negotiate_uploads(api_url, uploaded_files)
+                data = {
+                    "job_description": job_description,
+                    "shortlist_size": int(shortlist_size),
+                    "fusion_weight": fusion_weight,
+                    "semantic_only": semantic_only,
+                    "known_resumes": json.dumps(known)
+                }
+                status_code, result = run_screening(
+                    api_url, data, files, len(uploaded_files), live_results
+                )
+
+                # Known resumes whose text the server no longer has come back
+                # "unseen"; screen again with those files uploaded
+                retry = reupload_unseen(uploaded_files, files, known, result)
+                if retry is not None:
+                    files, known = retry
+                    data["known_resumes"] = json.dumps(known)
+                    status_code, result = run_screening(
+                        api_url, data, files, len(uploaded_files), live_results
                     )
 
-                # Send request to API
-                response = requests.post(
-                    f"{api_url}/screen-resumes",
-                    data={"job_description": job_description},
-                    files=files,
-                    timeout=30
-                )
+                if status_code == 200:
+                    render_results(result, stats_placeholder)
+                else:
+                    st.error(f"❌ API Error: {status_code}")
+                    st.error(result.get("error", "Unknown error"))
+                    render_failed_files(result.get("failed_files"))
 
-                if response.status_code == 200:
-                    result = response.json()
+            except requests.exceptions.ConnectionError:
+                st.error(f"❌ Cannot connect to API at {api_url}")
+                st.info("Make sure the backend API is running (python -m backend.main)")
 
-                    # Display results
-                    st.success("✅ Analysis completed successfully!")
+            except Exception as e:
+                st.error(f"❌ Error: {str(e)}")
 
-                    # Update stats
-                    with stats_placeholder.container():
-                        st.metric("Total Resumes", result["total_resumes"])
 
-                    # Display ranking table
-                    st.header("🏆 Resume Rankings")
+def run_screening(
+    api_url: str, data: dict, files: list, total_files: int, live_results: bool
+) -> Tuple[int, dict]:
+    """
+    Screen resumes through the streaming endpoint or a screening job
 
-                    # Prepare data for table
-                    table_data = []
-                    for i, resume in enumerate(result["ranked_resumes"], 1):
-                        table_data.append({
-                            "Rank": f"#{resume['rank']}",
-                            "Candidate Name": resume["candidate_name"],
-                            "Similarity Score": f"{resume['similarity_score']:.4f}",
-                            "Match %": f"{resume['similarity_score'] * 100:.2f}%",
-                            "Relevance": get_relevance_label(resume["similarity_score"])
-                        })
+    Args:
+        api_url: Base URL of the API
+        data: Form fields of /screen-resumes
+        files: Multipart resume files
+        total_files: Resumes screened, uploaded or known
+        live_results: Stream progress and rankings instead of polling a job
 
-                    df = pd.DataFrame(table_data)
+    Returns:
+        Tuple of (HTTP status, RankingResult or error body)
+    """
+    if live_results:
+        return stream_screening(api_url, data, files, total_files)
 
-                    # Display table with styling
-                    st.dataframe(
-                        df,
-                        use_container_width=True,
-                        height=400,
-                        hide_index=True
-                    )
+    # Submit a screening job; the server keeps working after this request
+    # returns, so large batches cannot time out
+    response = requests.post(
+        f"{api_url}/jobs/screen-resumes", data=data, files=files, timeout=300
+    )
+    if response.status_code == 202:
+        response = wait_for_job(api_url, response.json()["job_id"])
+    return response.status_code, response.json()
 
-                    # Download results as CSV
-                    st.markdown("---")
-                    csv = df.to_csv(index=False)
-                    st.download_button(
-                        label="📥 Download Results as CSV",
-                        data=csv,
-                        file_name="resume_rankings.csv",
-                        mime="text/csv"
-                    )
 
-                    # Display detailed metrics
-                    st.header("📈 Detailed Analysis")
+def reupload_unseen(
+    uploaded_files: list, files: list, known: List[dict], result: dict
+) -> Optional[Tuple[list, List[dict]]]:
+    """
+    Move known resumes the server reported as "unseen" back to the uploads
 
-                    col1, col2, col3 = st.columns(3)
+    Args:
+        uploaded_files: Streamlit UploadedFile objects
+        files: Multipart files of the previous request
+        known: known_resumes entries of the previous request
+        result: Response body of the previous request
 
-                    top_score = result["ranked_resumes"][0]["similarity_score"]
-                    avg_score = sum(r["similarity_score"] for r in result["ranked_resumes"]) / len(
-                        result["ranked_resumes"]
-                    )
-                    min_score = result["ranked_resumes"][-1]["similarity_score"]
+    Returns:
+        Tuple of (multipart files, known_resumes entries) for a second
+        request, or None when no known resume was unseen
+    """
+    unseen = {
+        failure["filename"]
+        for failure in result.get("failed_files") or []
+        if failure["status"] == "unseen"
+    }
+    if not unseen or not any(entry["filename"] in unseen for entry in known):
+        return None
 
-                    with col1:
-                        st.metric("Highest Match", f"{top_score:.4f}", "Top Candidate")
+    files = files + [
+        ("resumes", (uploaded_file.name, uploaded_file.getbuffer(), uploaded_file.type))
+        for uploaded_file in uploaded_files
+        if uploaded_file.name in unseen
+        and any(entry["filename"] == uploaded_file.name for entry in known)
+    ]
+    known = [entry for entry in known if entry["filename"] not in unseen]
+    return files, known
 
-                    with col2:
-                        st.metric("Average Match", f"{avg_score:.4f}", f"{avg_score * 100:.2f}%")
 
-                    with col3:
-                        st.metric("Lowest Match", f"{min_score:.4f}", "Bottom Candidate")
+def render_failed_files(failures: Optional[List[dict]]) -> None:
+    """
+    List the files a screening could not read, with their status and error
 
-                    # Top candidate details
-                    if result["ranked_resumes"]:
-                        st.markdown("---")
-                        st.header("🌟 Top Candidate")
-                        top_candidate = result["ranked_resumes"][0]
+    Args:
+        failures: failed_files of a /screen-resumes response (None or empty for none)
+    """
+    if not failures:
+        return
+    st.warning(f"⚠️ {len(failures)} file(s) could not be screened")
+    st.dataframe(
+        pd.DataFrame([
+            {"File": failure["filename"], "Status": failure["status"], "Error": failure["error"] or ""}
+            for failure in failures
+        ]),
+        use_container_width=True,
+        hide_index=True
+    )
 
-                        col1, col2, col3 = st.columns(3)
-                        with col1:
-                            st.info(f"**Name:** {top_candidate['candidate_name']}")
-                        with col2:
-                            st.success(f"**Score:** {top_candidate['similarity_score']:.4f}")
-                        with col3:
-                            st.success(f"**Match:** {top_candidate['similarity_score'] * 100:.2f}%")
 
-                else:
-                    st.error(f"❌ API Error: {response.status_code}")
-                    st.error(response.json().get("error", "Unknown error"))
+def render_results(result: dict, stats_placeholder) -> None:
+    """
+    Show a finished RankingResult: stats, ranking table, metrics and top candidate
 
-            except requests.exceptions.ConnectionError:
-                st.error(f"❌ Cannot connect to API at {api_url}")
-                st.info("Make sure the backend API is running (python -m backend.main)")
+    Args:
+        result: /screen-resumes response body
+        stats_placeholder: Container for the analysis stats column
+    """
+    # Display results
+    st.success("✅ Analysis completed successfully!")
+
+    # Update stats
+    with stats_placeholder.container():
+        st.metric("Total Resumes", result["total_resumes"])
+        if result.get("shortlisted") is not None:
+            st.metric("Shortlisted", result["shortlisted"])
+
+    # Files that could not be screened
+    render_failed_files(result.get("failed_files"))
+
+    # Display ranking table
+    st.header("🏆 Resume Rankings")
+
+    # Prepare data for table
+    table_data = []
+    for i, resume in enumerate(result["ranked_resumes"], 1):
+        table_data.append({
+            "Rank": f"#{resume['rank']}",
+            "Candidate Name": resume["candidate_name"],
+            "Similarity Score": f"{resume['similarity_score']:.4f}",
+            "Match %": f"{resume['similarity_score'] * 100:.2f}%",
+            "Relevance": get_relevance_label(resume["similarity_score"])
+        })
+
+    df = pd.DataFrame(table_data)
+
+    # Display table with styling
+    st.dataframe(
+        df,
+        use_container_width=True,
+        height=400,
+        hide_index=True
+    )
 
-            except Exception as e:
-                st.error(f"❌ Error: {str(e)}")
+    # Download results as CSV
+    st.markdown("---")
+    csv = df.to_csv(index=False)
+    st.download_button(
+        label="📥 Download Results as CSV",
+        data=csv,
+        file_name="resume_rankings.csv",
+        mime="text/csv"
+    )
+
+    # Display detailed metrics
+    st.header("📈 Detailed Analysis")
+
+    col1, col2, col3 = st.columns(3)
+
+    top_score = result["ranked_resumes"][0]["similarity_score"]
+    avg_score = sum(r["similarity_score"] for r in result["ranked_resumes"]) / len(
+        result["ranked_resumes"]
+    )
+    min_score = result["ranked_resumes"][-1]["similarity_score"]
+
+    with col1:
+        st.metric("Highest Match", f"{top_score:.4f}", "Top Candidate")
+
+    with col2:
+        st.metric("Average Match", f"{avg_score:.4f}", f"{avg_score * 100:.2f}%")
+
+    with col3:
+        st.metric("Lowest Match", f"{min_score:.4f}", "Bottom Candidate")
+
+    # Top candidate details
+    if result["ranked_resumes"]:
+        st.markdown("---")
+        st.header("🌟 Top Candidate")
+        top_candidate = result["ranked_resumes"][0]
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.info(f"**Name:** {top_candidate['candidate_name']}")
+        with col2:
+            st.success(f"**Score:** {top_candidate['similarity_score']:.4f}")
+        with col3:
+            st.success(f"**Match:** {top_candidate['similarity_score'] * 100:.2f}%")
+
+
+def negotiate_uploads(api_url: str, uploaded_files: list) -> Tuple[list, List[dict]]:
+    """
+    Ask the API which resumes it has never seen, by SHA-256 of their bytes
+
+    Files the server already extracted are sent as filename/digest pairs
+    instead of being uploaded again, so changing only the job description
+    re-sends nothing. If the negotiation fails every file is uploaded.
+
+    Args:
+        api_url: Base URL of the API
+        uploaded_files: Streamlit UploadedFile objects
+
+    Returns:
+        Tuple of (multipart files to upload, known_resumes entries)
+    """
+    digests = [
+        hashlib.sha256(uploaded_file.getbuffer()).hexdigest() for uploaded_file in uploaded_files
+    ]
+    unseen = set(digests)
+    try:
+        response = requests.post(
+            f"{api_url}/resumes/negotiate",
+            json={
+                "resumes": [
+                    {"filename": uploaded_file.name, "digest": digest}
+                    for uploaded_file, digest in zip(uploaded_files, digests)
+                ]
+            },
+            timeout=30
+        )
+        if response.status_code == 200:
+            unseen = set(response.json()["unseen"])
+    except requests.exceptions.RequestException:
+        pass
+
+    files, known = [], []
+    for uploaded_file, digest in zip(uploaded_files, digests):
+        if digest in unseen:
+            files.append(
+                ("resumes", (uploaded_file.name, uploaded_file.getbuffer(), uploaded_file.type))
+            )
+        else:
+            known.append({"filename": uploaded_file.name, "digest": digest})
+    return files, known
+
+
+def stream_screening(
+    api_url: str, data: dict, files: list, total_files: int
+) -> Tuple[int, dict]:
+    """
+    Screen through /screen-resumes/stream, showing progress and the current
+    top candidates while resumes are processed
+
+    Args:
+        api_url: Base URL of the API
+        data: Form fields of /screen-resumes
+        files: Multipart resume files
+        total_files: Resumes screened, uploaded or known
+
+    Returns:
+        Tuple of (HTTP status, RankingResult or error body)
+    """
+    status_line = st.empty()
+    live_table = st.empty()
+    parsed = unreadable = scored = 0
+    outcome = (500, {"error": "The result stream ended early"})
+    last_update = 0.0
+
+    with requests.post(
+        f"{api_url}/screen-resumes/stream",
+        data=data,
+        files=files,
+        stream=True,
+        timeout=(30, 300)
+    ) as response:
+        if response.status_code != 200:
+            return response.status_code, response.json()
+
+        for line in response.iter_lines():
+            if not line:
+                continue
+            event = json.loads(line)
+            kind = event.pop("event")
+            if kind == "file":
+                parsed += 1
+                unreadable += event["status"] != "ok"
+            elif kind == "score":
+                scored += 1
+            elif kind == "top_k":
+                live_table.dataframe(
+                    pd.DataFrame([
+                        {
+                            "Rank": f"#{resume['rank']}",
+                            "Candidate Name": resume["candidate_name"],
+                            "Similarity Score": f"{resume['similarity_score']:.4f}",
+                            "Relevance": get_relevance_label(resume["similarity_score"])
+                        }
+                        for resume in event["ranked_resumes"]
+                    ]),
+                    use_container_width=True,
+                    hide_index=True
+                )
+            elif kind == "result":
+                outcome = (200, event)
+            elif kind == "error":
+                outcome = (event.pop("status_code", 500), event)
+
+            now = time.monotonic()
+            if now - last_update >= 0.25:
+                last_update = now
+                status_line.info(
+                    f"🔄 Parsed {parsed}/{total_files} · scored {scored}"
+                    + (f" · {unreadable} unreadable" if unreadable else "")
+                )
+
+    status_line.empty()
+    live_table.empty()
+    return outcome
+
+
+def wait_for_job(api_url: str, job_id: str) -> requests.Response:
+    """
+    Poll a screening job, showing its progress, and fetch its result
+
+    Args:
+        api_url: Base URL of the API
+        job_id: Id returned by /jobs/screen-resumes
+
+    Returns:
+        Response of /jobs/{job_id}/result (the /screen-resumes status and body,
+        or 410 with the error for a job interrupted by a restart)
+    """
+    progress_bar = st.progress(0.0, text="⏳ Waiting for a free worker...")
+    deadline = time.monotonic() + JOB_MAX_WAIT_S
+    while time.monotonic() < deadline:
+        status = requests.get(f"{api_url}/jobs/{job_id}", timeout=10).json()
+        total = max(status["total_files"], 1)
+        if status["status"] == "running":
+            progress_bar.progress(
+                min(status["parsed"] / total, 1.0),
+                text=(
+                    f"🔄 Parsed {status['parsed']}/{status['total_files']} · "
+                    f"embedded {status['embedded']} · scored {status['scored']}"
+                    + (f" · {status['failed']} unreadable" if status["failed"] else "")
+                )
+            )
+        elif status["status"] != "queued":
+            break
+        time.sleep(JOB_POLL_INTERVAL_S)
+
+    progress_bar.empty()
+    return requests.get(f"{api_url}/jobs/{job_id}/result", timeout=30)
 
 
 def get_relevance_label(similarity_score: float) -> str:
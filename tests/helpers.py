@@ -0,0 +1,75 @@
+"""
+Shared test helpers: reference implementations of replaced code paths and
+builders for test documents (also used by the benchmarks)
+"""
+
+import io
+import re
+from typing import List
+
+from backend.document_processor import DocumentProcessor
+
+
+def legacy_clean_text(text: str) -> str:
+    """Previous clean_text: lowercase, two substitutions, two split/join passes"""
+    text = text.lower()
+    text = re.sub(r'[^a-z0-9\s\.]', ' ', text)
+    text = ' '.join(text.split())
+    text = re.sub(r'\b\d+\b', '', text)
+    return ' '.join(text.split())
+
+
+def legacy_content_tokens(processor: DocumentProcessor, text: str) -> list:
+    """Previous lexical path: legacy_clean_text, then remove_stopwords, then split"""
+    return processor.remove_stopwords(legacy_clean_text(text)).split()
+
+
+def text_pdf(pages: List[List[str]]) -> bytes:
+    """Minimal PDF with one Helvetica text line per string, one page per list"""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once the page objects are numbered
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for lines in pages:
+        body = "BT /F1 10 Tf 12 TL 50 780 Td " + " ".join(
+            "(" + line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ") '"
+            for line in lines
+        ) + " ET"
+        stream = body.encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects)
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids), len(kids)
+    )
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, xref
+    ))
+    return out.getvalue()
+
+
+def docx_bytes(*paragraphs: str) -> bytes:
+    """DOCX with one paragraph per string"""
+    from docx import Document
+    document = Document()
+    for paragraph in paragraphs:
+        document.add_paragraph(paragraph)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
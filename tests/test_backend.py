@@ -3,11 +3,40 @@ Test suite for Resume Screening System
 Run with: pytest tests/
 """
 
+import asyncio
+import hashlib
+import importlib
+import io
+import json
+import multiprocessing
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
 import pytest
 import numpy as np
-from backend.document_processor import DocumentProcessor
+from backend.document_processor import (
+    DocumentProcessor, extract_document, iter_docx_paragraphs, iter_pdf_pages
+)
+from backend import embedding_generator
+from backend.config import config
 from backend.embedding_generator import EmbeddingGenerator
+from backend.extraction_pool import ExtractionPool, resource
 from backend.similarity_calculator import SimilarityCalculator
+from backend.ann_index import BinaryIndex, FlatCodeIndex, IVFIndex, PQIndex, popcount
+from backend.batch_scheduler import EmbeddingBatcher
+from backend.cache import EmbeddingCache, LRUCache, TextCache
+from backend.corpus_store import CorpusStore
+from backend.job_store import JobStore
+from backend.lexical_index import BM25Index
+from backend.ranking_engine import RankingEngine, TopKHeap
+from backend.screening_pipeline import ScreeningPipeline
+from backend.uploads import is_digest, spool_upload
+from backend.vector_store import VectorStore
+from tests.helpers import docx_bytes, legacy_clean_text, legacy_content_tokens, text_pdf
 
 
 class TestDocumentProcessor:
@@ -52,6 +81,254 @@ class TestDocumentProcessor:
         assert "5" not in cleaned
         assert "3" not in cleaned
 
+    def test_normalizer_matches_previous_pipeline(self):
+        """Property test: random mixed-script texts clean exactly as before"""
+        alphabet = list(
+            "abcXYZ019._-@#/()+ \t\n\r\x0b\x0c\x1c\xa0\u2028\u3000"
+            "\xe9\xdf\u0130\u212a\u03a3\u03c3\u0663\uff15\U0001d7d8"
+        ) + ["3.5", "v2.0", "2020s", "..", "C++", "e-mail", "Σ "]
+        rng = np.random.default_rng(0)
+        for _ in range(2000):
+            text = "".join(rng.choice(alphabet, rng.integers(0, 40)))
+            assert self.processor.clean_text(text) == legacy_clean_text(text), repr(text)
+            assert self.processor.content_tokens(text) == legacy_content_tokens(
+                self.processor, text
+            ), repr(text)
+
+    def test_normalizer_matches_every_bmp_character(self):
+        """Test every Basic Multilingual Plane character between word characters"""
+        for codepoint in range(0x10000):
+            text = f"A{chr(codepoint)}1 x.{chr(codepoint)}"
+            assert self.processor.clean_text(text) == legacy_clean_text(text), hex(codepoint)
+
+    def test_extract_document_unsupported_extension(self):
+        """Test that worker extraction skips unsupported file types"""
+        assert extract_document(b"plain text", "resume.txt") is None
+        assert extract_document(b"not a pdf", "resume.pdf") is None
+
+    def test_pdf_pages_are_streamed_and_joined(self):
+        """Test page-by-page extraction with a separator between pages"""
+        pdf = text_pdf([["Python Developer"], ["Docker Kubernetes"], ["AWS"]])
+        pages = iter_pdf_pages(pdf)
+
+        assert next(pages).strip() == "Python Developer"
+        assert self.processor.extract_from_pdf(pdf) == "python developer docker kubernetes aws"
+
+    def test_pdf_budget_stops_early(self):
+        """Test that extraction stops once pdf_max_chars characters were read"""
+        pdf = text_pdf([[f"page{i} " + "skill " * 10] for i in range(20)])
+        text = DocumentProcessor(pdf_max_chars=100).extract_from_pdf(pdf)
+
+        assert text.startswith("page0 skill") and "page1" in text
+        assert "page2" not in text
+        assert len(text) <= 100
+
+    @staticmethod
+    def merged_table_docx():
+        """DOCX with a body paragraph, a line break and a table with a merged header"""
+        from docx import Document
+        document = Document()
+        paragraph = document.add_paragraph("Senior Python Developer")
+        paragraph.add_run().add_break()
+        paragraph.add_run("Remote")
+        table = document.add_table(rows=2, cols=3)
+        table.cell(0, 0).merge(table.cell(0, 2)).text = "Cloud Skills"
+        table.cell(1, 1).text = "Kubernetes"
+        document.add_paragraph("References available")
+        buffer = io.BytesIO()
+        document.save(buffer)
+        return buffer.getvalue()
+
+    def test_streaming_docx_reads_merged_cells_once(self):
+        """Test document-order paragraphs and single emission of merged cells"""
+        content = self.merged_table_docx()
+
+        assert [p for p in iter_docx_paragraphs(content) if p] == [
+            "Senior Python Developer\nRemote", "Cloud Skills", "Kubernetes", "References available"
+        ]
+        assert self.processor.extract_from_docx(content) == (
+            "senior python developer remote cloud skills kubernetes references available"
+        )
+        legacy = DocumentProcessor(docx_engine="python-docx").extract_from_docx(content)
+        assert legacy.count("cloud skills") == 3
+        assert set(legacy.split()) == set(self.processor.extract_from_docx(content).split())
+
+    def test_streaming_docx_falls_back(self):
+        """Test that unreadable archives fall back to python-docx and fail cleanly"""
+        assert self.processor.extract_from_docx(b"PK not a zip") is None
+        with pytest.raises(ValueError):
+            DocumentProcessor(docx_engine="unknown")
+
+
+class TestExtractionPool:
+    """Tests for ExtractionPool (forked workers with stand-in extractors)"""
+
+    @staticmethod
+    def slow_extract(file_content, filename):
+        time.sleep(float(file_content))
+        return "done"
+
+    @staticmethod
+    def pid_extract(file_content, filename):
+        return str(os.getpid())
+
+    @staticmethod
+    def greedy_extract(file_content, filename):
+        return str(len(bytearray(int(file_content))))
+
+    @staticmethod
+    def crashing_extract(file_content, filename):
+        if file_content == b"crash":
+            os._exit(3)
+        return "survived"
+
+    def test_real_documents_and_failures(self):
+        """Test structured results for a readable DOCX and an unreadable PDF"""
+        from docx import Document
+        document = Document()
+        document.add_paragraph("Senior Python Developer")
+        buffer = io.BytesIO()
+        document.save(buffer)
+
+        pool = ExtractionPool(n_workers=2)
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            assert pool._context.get_start_method() == "forkserver"
+        results = [
+            future.result(timeout=30)
+            for future in [
+                pool.submit(buffer.getvalue(), "resume.docx"),
+                pool.submit(b"not a pdf", "resume.pdf")
+            ]
+        ]
+        pool.shutdown()
+
+        assert results[0] == {"status": "ok", "text": "senior python developer", "error": None}
+        assert results[1]["status"] == "failed" and results[1]["text"] is None
+
+    def test_timeout_replaces_worker(self):
+        """Test that a hung document times out without blocking the next one"""
+        pool = ExtractionPool(
+            n_workers=1, timeout_s=0.5, extract=self.slow_extract, start_method="fork"
+        )
+        hung = pool.submit(b"30", "hung.pdf")
+        quick = pool.submit(b"0", "quick.pdf")
+
+        assert hung.result(timeout=10)["status"] == "timeout"
+        assert quick.result(timeout=10) == {"status": "ok", "text": "done", "error": None}
+        pool.shutdown()
+
+    def test_workers_are_recycled(self):
+        """Test that a worker is replaced after max_tasks_per_worker documents"""
+        pool = ExtractionPool(
+            n_workers=1, max_tasks_per_worker=2, extract=self.pid_extract, start_method="fork"
+        )
+        pids = [pool.submit(b"", f"{i}.pdf").result(timeout=10)["text"] for i in range(4)]
+        pool.shutdown()
+
+        assert pids[0] == pids[1] and pids[2] == pids[3] and pids[1] != pids[2]
+
+    def test_crashed_worker_is_reported(self):
+        """Test that a worker dying mid-document fails only that document"""
+        pool = ExtractionPool(n_workers=1, extract=self.crashing_extract, start_method="fork")
+        crashed = pool.submit(b"crash", "bad.pdf").result(timeout=10)
+        survived = pool.submit(b"fine", "good.pdf").result(timeout=10)
+        pool.shutdown()
+
+        assert crashed["status"] == "crashed"
+        assert survived["text"] == "survived"
+
+    def test_failed_worker_start_is_reported(self):
+        """Test that a worker that cannot start fails its document, not the slot"""
+        pool = ExtractionPool(n_workers=1, extract=self.crashing_extract, start_method="fork")
+        start_worker = pool._start_worker
+        attempts = []
+
+        def flaky_start():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise OSError("no more processes")
+            return start_worker()
+
+        pool._start_worker = flaky_start
+        failed = pool.submit(b"fine", "first.pdf").result(timeout=10)
+        survived = pool.submit(b"fine", "second.pdf").result(timeout=10)
+        pool.shutdown()
+
+        assert failed["status"] == "crashed" and "no more processes" in failed["error"]
+        assert survived["text"] == "survived"
+
+    @pytest.mark.skipif(resource is None, reason="RLIMIT_AS is POSIX only")
+    def test_memory_limit(self):
+        """Test that allocations past the address-space cap fail that document only"""
+        pool = ExtractionPool(
+            n_workers=1, memory_mb=64, extract=self.greedy_extract, start_method="fork"
+        )
+        greedy = pool.submit(str(1 << 30).encode(), "big.pdf").result(timeout=30)
+        modest = pool.submit(str(1 << 20).encode(), "small.pdf").result(timeout=30)
+        pool.shutdown()
+
+        assert greedy["status"] == "memory_limit"
+        assert modest["text"] == str(1 << 20)
+
+
+class TestUploads:
+    """Tests for chunked upload spooling and extraction from spooled files"""
+
+    class CountingFile(io.BytesIO):
+        """BytesIO that remembers how many bytes were read before closing"""
+        bytes_read = 0
+
+        def read(self, size=-1):
+            chunk = super().read(size)
+            self.bytes_read += len(chunk)
+            return chunk
+
+    def spool(self, content: bytes, max_bytes, size=None, chunk_size=4):
+        from starlette.datastructures import UploadFile
+        upload = UploadFile(self.CountingFile(content), size=size, filename="Resume.PDF")
+        return asyncio.run(spool_upload(upload, max_bytes, chunk_size=chunk_size)), upload
+
+    def test_spooled_file_and_digest(self):
+        """Test that chunked spooling writes the whole file and hashes it incrementally"""
+        content = b"%PDF-1.4 " * 10
+        result, upload = self.spool(content, max_bytes=1024)
+        try:
+            assert result["status"] == "ok" and result["size"] == len(content)
+            assert result["digest"] == hashlib.sha256(content).hexdigest()
+            assert result["path"].endswith(".pdf")
+            with open(result["path"], "rb") as spooled:
+                assert spooled.read() == content
+            assert upload.file.closed
+        finally:
+            os.remove(result["path"])
+
+    def test_size_limit_enforced_while_streaming(self):
+        """Test rejection by declared size and by bytes read, leaving no temp file"""
+        declared, upload = self.spool(b"x" * 10, max_bytes=64, size=1 << 20)
+        assert declared["status"] == "too_large" and declared["path"] is None
+        assert upload.file.bytes_read == 0 and upload.file.closed
+
+        streamed, upload = self.spool(b"x" * 100, max_bytes=64)
+        assert streamed["status"] == "too_large" and streamed["path"] is None
+        assert upload.file.bytes_read <= 64 + 4
+
+        empty, _ = self.spool(b"", max_bytes=64)
+        assert empty["status"] == "empty"
+
+    def test_extract_from_file_handle_and_path(self, tmp_path):
+        """Test that open files and spooled paths extract like raw bytes"""
+        pdf = text_pdf([["Senior Python Developer"], ["Kubernetes 2020"]])
+        path = tmp_path / "resume.pdf"
+        path.write_bytes(pdf)
+        processor = DocumentProcessor()
+
+        expected = processor.extract_from_pdf(pdf)
+        with open(path, "rb") as handle:
+            handle.read(5)
+            assert processor.extract_text(handle, "resume.pdf") == expected
+        assert extract_document(str(path), "resume.pdf") == expected
+        assert expected == "senior python developer kubernetes"
+
 
 class TestEmbeddingGenerator:
     """Tests for EmbeddingGenerator"""
@@ -97,6 +374,16 @@ class TestEmbeddingGenerator:
         for emb in embeddings:
             assert len(emb) == 384
 
+    def test_batch_embeddings_with_empty_text(self):
+        """Test that empty texts in a batch get zero vectors without affecting others"""
+        texts = ["Python developer", "", "Java programmer"]
+        embeddings = self.generator.generate_batch_embeddings(texts, batch_size=2)
+
+        assert len(embeddings) == 3
+        assert np.linalg.norm(embeddings[1]) == 0
+        assert np.linalg.norm(embeddings[0]) > 0
+        assert np.linalg.norm(embeddings[2]) > 0
+
     def test_embedding_normalization(self):
         """Test embedding normalization"""
         text = "Test text for normalization"
@@ -108,6 +395,166 @@ class TestEmbeddingGenerator:
         assert abs(norm - 1.0) < 0.01
 
 
+class TestModelMetadata:
+    """Tests for model metadata read once at load time"""
+
+    class CountingModel:
+        """Stand-in SentenceTransformer that counts encode calls"""
+
+        max_seq_length = 128
+
+        def __init__(self, model_name):
+            self.calls = 0
+
+        def encode(self, texts, batch_size=32, convert_to_numpy=True):
+            self.calls += 1
+            if isinstance(texts, str):
+                return np.full(6, len(texts), dtype=np.float32)
+            if any("fail" in text for text in texts):
+                raise RuntimeError("batch failed")
+            return np.array([np.full(6, len(text), dtype=np.float32) for text in texts])
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.patch = pytest.MonkeyPatch()
+        self.patch.setattr(embedding_generator, "SentenceTransformer", self.CountingModel)
+        self.generator = EmbeddingGenerator("counting-model")
+
+    def teardown_method(self):
+        """Restore SentenceTransformer"""
+        self.patch.undo()
+
+    def test_metadata_is_read_at_load(self):
+        """Test that dimension, sequence length, dtype and fingerprint are precomputed"""
+        info = self.generator.model_info()
+
+        assert info["dimension"] == 6
+        assert info["max_seq_length"] == 128
+        assert info["dtype"] == "float32"
+        assert len(info["fingerprint"]) == 16
+        assert info["fingerprint"] == EmbeddingGenerator("counting-model").fingerprint
+        assert self.generator.model.calls == 1
+
+    def test_empty_and_failure_paths_do_not_encode(self):
+        """Test that zero vectors come from metadata, not extra forward passes"""
+        model = self.generator.model
+        model.calls = 0
+
+        assert self.generator.get_embedding_dimension() == 6
+        empty = self.generator.generate_embedding("  ")
+        assert empty.shape == (6,) and empty.dtype == np.float32
+        assert model.calls == 0
+
+        embeddings = self.generator.generate_batch_embeddings(["", "ok", "fail"])
+        assert [float(e[0]) for e in embeddings] == [0.0, 2.0, 4.0]
+        # One failed batch plus one retry per non-empty text
+        assert model.calls == 3
+
+
+class TestChunking:
+    """Tests for token-bounded chunking and length-bucketed encoding"""
+
+    class WordModel:
+        """Stand-in model without a tokenizer (words approximate tokens)"""
+
+        max_seq_length = 7
+
+        def __init__(self):
+            self.batches = []
+
+        def encode(self, texts, batch_size=32, convert_to_numpy=True):
+            self.batches.append(list(texts))
+            return np.array([[float(len(text.split())), 1.0] for text in texts])
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.generator = EmbeddingGenerator.__new__(EmbeddingGenerator)
+        self.generator.model = self.WordModel()
+        self.generator.batch_size = 2
+        self.generator.cache = None
+        self.generator.pre_truncate = False
+        self.generator.truncate_chars = None
+        self.generator.dimension = 2
+        self.generator.dtype = np.float64
+
+    def test_chunks_fit_sequence_length(self):
+        """Test that long texts split on words into chunks of max_chunk_tokens"""
+        text = " ".join(f"w{i}" for i in range(12))
+        chunks, owners, lengths = self.generator.chunk_texts(["short text", text])
+
+        assert self.generator.max_chunk_tokens() == 5
+        assert chunks == ["short text", "w0 w1 w2 w3 w4", "w5 w6 w7 w8 w9", "w10 w11"]
+        assert list(owners) == [0, 1, 1, 1]
+        assert lengths == [2, 5, 5, 2]
+
+    def test_chunk_overlap_and_empty_text(self):
+        """Test overlapping chunks and that empty texts keep one chunk"""
+        chunks, owners, _ = self.generator.chunk_texts(["", "a b c d e f g"], overlap=2)
+
+        assert chunks == ["", "a b c d e", "d e f g"]
+        assert list(owners) == [0, 1, 1]
+
+    def test_batches_are_length_sorted(self):
+        """Test that chunks are encoded in length buckets and returned in order"""
+        texts = ["a b c d", "a", "a b c", "a b"]
+        embeddings = self.generator.generate_batch_embeddings(texts, lengths=[4, 1, 3, 2])
+
+        assert self.generator.model.batches == [["a", "a b"], ["a b c", "a b c d"]]
+        assert [float(e[0]) for e in embeddings] == [4.0, 1.0, 3.0, 2.0]
+
+
+    def test_pre_truncation_keeps_the_model_window(self):
+        """Test that fast mode cuts long texts on whitespace past the token limit"""
+        self.generator.pre_truncate = True
+        self.generator.truncate_chars = None
+        long_text = " ".join(["word"] * 100)
+
+        budget = self.generator.calibrate_truncation(["abcd efgh ijkl"])
+        assert budget == int(5 * 14 / 3 * EmbeddingGenerator.TRUNCATE_MARGIN)
+
+        truncated = self.generator.truncate_for_model(long_text)
+        assert len(truncated) <= budget
+        assert long_text.startswith(truncated) and not truncated.endswith(" ")
+        assert len(truncated.split()) >= self.generator.max_chunk_tokens()
+        assert self.generator.truncate_for_model("short text") == "short text"
+
+        self.generator.generate_batch_embeddings([long_text])
+        assert self.generator.model.batches == [[truncated]]
+
+    def test_pre_truncation_budget_is_fixed_and_skips_chunks(self):
+        """Test that the budget ignores the first input and chunks are never cut"""
+        self.generator.pre_truncate = True
+        self.generator.truncate_chars = None
+        self.generator.generate_batch_embeddings(["a b c"])
+        budget = self.generator.truncate_chars
+        assert budget == self.generator.calibrate_truncation()
+
+        self.generator.truncate_chars = 4
+        self.generator.model.batches = []
+        chunks, _, lengths = self.generator.chunk_texts(["alpha beta gamma delta epsilon zeta"])
+        self.generator.generate_batch_embeddings(chunks, lengths=lengths)
+        self.generator.generate_batch_embeddings(["alpha beta"], fitted=[True])
+        self.generator.generate_batch_embeddings(["alpha beta"])
+        assert self.generator.model.batches == [
+            ["zeta", "alpha beta gamma delta epsilon"], ["alpha beta"], ["alph"]
+        ]
+
+    def test_cache_keys_follow_the_model_input(self):
+        """Test that a pre-truncated text and the same text passed whole never share an entry"""
+        self.generator.cache = EmbeddingCache("word-model")
+        self.generator.pre_truncate = True
+        self.generator.truncate_chars = 10
+        text = "alpha beta gamma"
+
+        cut = self.generator.generate_batch_embeddings([text])[0]
+        whole = self.generator.generate_batch_embeddings([text], fitted=[True])[0]
+        again = self.generator.generate_embedding(text, fitted=True)
+        short = self.generator.generate_embedding("alpha beta", fitted=True)
+
+        assert [float(cut[0]), float(whole[0]), float(again[0]), float(short[0])] == [2, 3, 3, 2]
+        assert self.generator.model.batches == [["alpha beta"], ["alpha beta gamma"]]
+
+
 class TestSimilarityCalculator:
     """Tests for SimilarityCalculator"""
 
@@ -177,6 +624,1103 @@ class TestSimilarityCalculator:
         assert similarity == 0.0
 
 
+class TestRankingEngine:
+    """Tests for RankingEngine"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        rng = np.random.default_rng(0)
+        self.rows = list(rng.standard_normal((50, 8)))
+        self.query = rng.standard_normal(8)
+        self.engine = RankingEngine(self.rows)
+
+    def test_scores_match_pairwise_metrics(self):
+        """Test that batch scores equal the per-pair calculator"""
+        metrics = {
+            "cosine": SimilarityCalculator.cosine_similarity,
+            "euclidean": SimilarityCalculator.euclidean_distance,
+            "manhattan": SimilarityCalculator.manhattan_distance,
+        }
+        for metric, pairwise in metrics.items():
+            expected = [pairwise(self.query, row) for row in self.rows]
+            np.testing.assert_allclose(
+                self.engine.scores(self.query, metric), expected, rtol=1e-4, atol=1e-4
+            )
+
+    def test_top_k_matches_full_sort(self):
+        """Test that argpartition top-k equals the head of a full sort"""
+        cosine = self.engine.scores(self.query)
+        indices, scores = self.engine.top_k(self.query, 5)
+        assert list(indices) == list(np.argsort(-cosine)[:5])
+        assert list(scores) == sorted(scores, reverse=True)
+
+        euclidean = self.engine.scores(self.query, "euclidean")
+        indices, _ = self.engine.top_k(self.query, 5, metric="euclidean")
+        assert list(indices) == list(np.argsort(euclidean)[:5])
+
+    def test_ties_keep_original_order(self):
+        """Test that equal scores are ranked in input order"""
+        indices = RankingEngine.select_top_k(np.array([0.5, 0.9, 0.5, 0.9]), 3)
+        assert list(indices) == [1, 3, 0]
+
+    def test_zero_vectors_score_zero(self):
+        """Test cosine handling of zero rows and zero queries"""
+        engine = RankingEngine([np.zeros(3), np.array([1.0, 0.0, 0.0])])
+        assert list(engine.scores(np.array([1.0, 0.0, 0.0]))) == [0.0, 1.0]
+        assert list(engine.scores(np.zeros(3))) == [0.0, 0.0]
+
+    def test_score_matrix_matches_single_queries(self):
+        """Test that the jobs x resumes matrix equals per-query scoring"""
+        rng = np.random.default_rng(1)
+        queries = rng.standard_normal((4, 8))
+        scores, indices, top_scores = self.engine.top_k_matrix(queries, 3)
+
+        assert scores.shape == (4, 50)
+        for query, row, idx, top in zip(queries, scores, indices, top_scores):
+            np.testing.assert_allclose(row, self.engine.scores(query), rtol=1e-5, atol=1e-6)
+            assert list(idx) == list(self.engine.top_k(query, 3)[0])
+            np.testing.assert_allclose(top, row[idx])
+
+    def test_top_k_heap_matches_select_top_k(self):
+        """Test that the running heap equals a stable sort, ties included"""
+        rng = np.random.default_rng(3)
+        scores = np.round(rng.random(200), 1)  # plenty of ties
+        for k in (None, 0, 1, 7, 200):
+            heap = TopKHeap(k)
+            for index in rng.permutation(len(scores)):
+                heap.push(float(scores[index]), int(index), f"r{index}")
+            ranked = heap.ranked()
+            stable = np.argsort(-scores, kind="stable")[:k]
+            assert [index for _, index, _ in ranked] == list(stable)
+            assert all(item == f"r{index}" for _, index, item in ranked)
+
+    def test_pool_scores(self):
+        """Test max, mean and top-m pooling of chunk scores per document"""
+        scores = np.array([0.1, 0.9, 0.5, 0.3, 0.7, 0.2])
+        owners = np.array([0, 0, 0, 1, 2, 2])
+
+        np.testing.assert_allclose(RankingEngine.pool_scores(scores, owners, 3), [0.9, 0.3, 0.7])
+        np.testing.assert_allclose(
+            RankingEngine.pool_scores(scores, owners, 3, "mean"), [0.5, 0.3, 0.45]
+        )
+        np.testing.assert_allclose(
+            RankingEngine.pool_scores(scores, owners, 3, "top_m", top_m=2), [0.7, 0.3, 0.45]
+        )
+        with pytest.raises(ValueError):
+            RankingEngine.pool_scores(scores, owners, 3, "median")
+
+    def test_pool_scores_per_query_row(self):
+        """Test that 2-D (jobs x chunks) scores pool along the chunk axis"""
+        rng = np.random.default_rng(2)
+        scores = rng.random((4, 6))
+        owners = np.array([0, 0, 0, 1, 2, 2])
+
+        for pooling in RankingEngine.POOLINGS:
+            pooled = RankingEngine.pool_scores(scores, owners, 3, pooling)
+            assert pooled.shape == (4, 3)
+            for row, expected in zip(scores, pooled):
+                np.testing.assert_allclose(
+                    RankingEngine.pool_scores(row, owners, 3, pooling), expected
+                )
+
+    def test_rank_by_similarity(self):
+        """Test full ranking of named scores"""
+        ranked = SimilarityCalculator.rank_by_similarity([0.2, 0.9, 0.5], ["a", "b", "c"])
+        assert ranked == [(1, "b", 0.9), (2, "c", 0.5), (3, "a", 0.2)]
+
+
+class TestScreeningPipeline:
+    """Tests for ScreeningPipeline (stand-in extraction and scoring coroutines)"""
+
+    def setup_method(self):
+        self.in_memory = 0
+        self.peak_in_memory = 0
+        self.events = []
+
+    async def extract(self, source):
+        delay, score = source
+        await asyncio.sleep(delay)
+        self.events.append("extract")
+        if score is None:
+            return {"name": "bad", "status": "failed", "text": None, "error": "unreadable"}
+        self.in_memory += 1
+        self.peak_in_memory = max(self.peak_in_memory, self.in_memory)
+        return {"name": f"r{score}", "status": "ok", "text": str(score), "error": None}
+
+    async def score(self, texts):
+        self.events.append("score")
+        await asyncio.sleep(0.01)
+        self.in_memory -= len(texts)
+        return np.array([float(text) for text in texts])
+
+    def test_ranking_matches_staged_and_memory_is_bounded(self):
+        """Test top-k, failure count and how many texts are held at once"""
+        rng = np.random.default_rng(4)
+        scores = np.round(rng.random(60), 1)
+        sources = [(float(rng.random()) * 0.005, score) for score in scores]
+        sources[7] = (0.0, None)
+        sources[3] = (0.01, None)
+
+        pipeline = ScreeningPipeline(
+            self.extract, self.score, batch_size=4, queue_size=4,
+            extract_concurrency=3, encode_concurrency=2
+        )
+        ranking, failures, scored = asyncio.run(pipeline.run(sources, k=5))
+
+        readable = np.array([score if score is not None else -1.0 for _, score in sources])
+        assert scored == 58 and len(failures) == 2
+        assert [index for _, index, _ in ranking] == list(np.argsort(-readable, kind="stable")[:5])
+        assert all("text" not in entry for _, _, entry in ranking)
+        # queue + one partial batch + batches in flight + extractions blocked on a full queue
+        assert self.peak_in_memory <= 4 + 4 + 2 * 4 + 3
+
+    def test_extraction_overlaps_scoring(self):
+        """Test that scoring starts with the first resume and batches then grow"""
+        batches = []
+        pipeline = ScreeningPipeline(
+            self.extract, self.score, batch_size=4, extract_concurrency=1,
+            on_scored=lambda scored: batches.append([score for _, score in scored])
+        )
+        asyncio.run(pipeline.run([(0.002, i) for i in range(10)]))
+
+        assert self.events[:2] == ["extract", "score"]
+        assert [len(batch) for batch in batches][:3] == [1, 2, 4]
+        assert sorted(score for batch in batches for score in batch) == list(range(10))
+        last_extract = len(self.events) - 1 - self.events[::-1].index("extract")
+        assert self.events.index("score") < last_extract
+
+    def test_scoring_errors_propagate(self):
+        """Test that a failing score call fails the run instead of hanging"""
+        async def broken_score(texts):
+            raise RuntimeError("encoder down")
+
+        pipeline = ScreeningPipeline(self.extract, broken_score, batch_size=2)
+        with pytest.raises(RuntimeError):
+            asyncio.run(asyncio.wait_for(pipeline.run([(0.0, i) for i in range(50)]), 10))
+
+
+class TestEmbeddingBatcher:
+    """Tests for EmbeddingBatcher"""
+
+    class RecordingGenerator:
+        """Stand-in generator that records the size of each batch"""
+
+        def __init__(self):
+            self.batch_sizes = []
+            self.fitted = []
+
+        def generate_batch_embeddings(self, texts, fitted=None):
+            self.batch_sizes.append(len(texts))
+            self.fitted.append(fitted)
+            return [np.array([float(len(text))]) for text in texts]
+
+    def test_concurrent_requests_share_a_batch(self):
+        """Test that requests submitted together are encoded in one pass"""
+        generator = self.RecordingGenerator()
+        batcher = EmbeddingBatcher(generator, max_batch_size=64, max_wait_ms=200)
+
+        futures = [batcher.submit(["a" * n, "b" * n], fitted=n == 2) for n in range(1, 4)]
+        results = [future.result(timeout=5) for future in futures]
+        batcher.stop()
+
+        assert generator.batch_sizes == [6]
+        assert generator.fitted == [[False, False, True, True, False, False]]
+        for n, result in enumerate(results, 1):
+            assert [float(v[0]) for v in result] == [n, n]
+
+    def test_max_batch_size_flushes_early(self):
+        """Test that a full batch is dispatched without waiting"""
+        generator = self.RecordingGenerator()
+        batcher = EmbeddingBatcher(generator, max_batch_size=2, max_wait_ms=10000)
+
+        future = batcher.submit(["one", "two"])
+        assert len(future.result(timeout=5)) == 2
+        batcher.stop()
+
+
+class TestEmbeddingCache:
+    """Tests for the embedding caches"""
+
+    def test_lru_evicts_by_size(self):
+        """Test that the LRU tier stays within its byte budget"""
+        cache = LRUCache(max_bytes=10)
+        cache.put("a", b"12345")
+        cache.put("b", b"12345")
+        cache.get("a")
+        cache.put("c", b"12345")
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert cache.current_bytes == 10
+        assert cache.stats()["evictions"] == 1
+
+    def test_key_depends_on_model(self):
+        """Test that the same text under different models gets different keys"""
+        text = "Python developer"
+        assert EmbeddingCache("model-a").key(text) != EmbeddingCache("model-b").key(text)
+        assert EmbeddingCache("model", variant="abc:full").key(text) != (
+            EmbeddingCache("model", variant="abc:pre640").key(text)
+        )
+
+    def test_returned_embeddings_are_private_copies(self, tmp_path):
+        """Test that callers can modify cached embeddings without touching the cache"""
+        embedding = np.arange(4, dtype=np.float32)
+        cache = EmbeddingCache("model", disk_dir=str(tmp_path))
+        cache.put("Python developer", embedding)
+        embedding[0] = 9.0
+
+        for tier_cache in (cache, EmbeddingCache("model", disk_dir=str(tmp_path))):
+            found = tier_cache.get("Python developer")
+            found *= 2.0
+            assert tier_cache.get("Python developer").tolist() == [0.0, 1.0, 2.0, 3.0]
+
+    def test_disk_tier_persists(self, tmp_path):
+        """Test that embeddings survive a new cache instance via the disk tier"""
+        embedding = np.arange(4, dtype=np.float32)
+        cache = EmbeddingCache("model", disk_dir=str(tmp_path))
+        cache.put("Python developer", embedding)
+        cache.disk.close()
+
+        reopened = EmbeddingCache("model", disk_dir=str(tmp_path))
+        found = reopened.get_many(["Python developer", "Java programmer"])
+
+        assert list(found) == ["Python developer"]
+        np.testing.assert_array_equal(found["Python developer"], embedding)
+        stats = reopened.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_disk_tier_evicts_by_size(self, tmp_path):
+        """Test that the disk tier drops least recently used entries"""
+        cache = EmbeddingCache("model", disk_dir=str(tmp_path), disk_bytes=32)
+        for i in range(4):
+            cache.put(f"text {i}", np.full(4, i, dtype=np.float32))
+
+        assert cache.disk.current_bytes <= 32
+        assert cache.disk.get(cache.key("text 0")) is None
+        assert cache.disk.get(cache.key("text 3")) is not None
+
+    def test_disk_tier_batches_large_writes(self, tmp_path):
+        """Test that writes of more keys than SQLite's variable limit succeed"""
+        cache = EmbeddingCache("model", disk_dir=str(tmp_path))
+        texts = [f"text {i}" for i in range(40000)]
+        cache.put_many({text: np.full(2, 1.0, dtype=np.float32) for text in texts})
+        cache.put_many({text: np.full(2, 2.0, dtype=np.float32) for text in texts})
+
+        assert cache.disk.current_bytes == len(texts) * 8
+        stored = np.frombuffer(cache.disk.get(cache.key("text 39999")), dtype=np.float32)
+        assert list(stored) == [2.0, 2.0]
+
+
+class TestTextCache:
+    """Tests for the extracted-text cache"""
+
+    def test_round_trip_by_content_hash(self):
+        """Test that identical bytes hit the cache regardless of filename"""
+        cache = TextCache("1")
+        digest = TextCache.digest(b"%PDF resume bytes")
+        cache.put(digest, "alice.pdf", "python developer")
+
+        assert cache.get(digest, "renamed.pdf") == "python developer"
+        assert cache.get(digest, "alice.docx") is None
+        assert cache.get(TextCache.digest(b"other bytes"), "alice.pdf") is None
+
+    def test_version_bump_invalidates(self, tmp_path):
+        """Test that a new pipeline version purges old entries from disk"""
+        digest = TextCache.digest(b"resume")
+        old = TextCache("1", disk_dir=str(tmp_path))
+        old.put(digest, "resume.pdf", "old cleaning output")
+        old.disk.close()
+
+        new = TextCache("2", disk_dir=str(tmp_path))
+        assert new.get(digest, "resume.pdf") is None
+        assert new.disk.current_bytes == 0
+
+    def test_memory_tier_is_bounded(self):
+        """Test that the memory tier evicts beyond its budget"""
+        cache = TextCache("1", memory_bytes=10)
+        cache.put("a", "a.pdf", "12345")
+        cache.put("b", "b.pdf", "12345")
+        cache.put("c", "c.pdf", "12345")
+
+        assert cache.get("a", "a.pdf") is None
+        assert cache.get("c", "c.pdf") == "12345"
+
+    def test_known_digests_across_tiers(self, tmp_path):
+        """Test digest negotiation lookups without loading texts or counting hits"""
+        seen, disk_only, unseen = (TextCache.digest(content) for content in (b"a", b"b", b"c"))
+        cache = TextCache("1", disk_dir=str(tmp_path))
+        cache.put(seen, "seen.pdf", "python developer")
+        cache.put(disk_only, "disk.docx", "data engineer")
+        cache.memory.clear()
+        cache.put(seen, "seen.pdf", "python developer")
+
+        known = cache.known([
+            (seen, "seen.pdf"), (disk_only, "disk.docx"), (unseen, "new.pdf"),
+            (disk_only, "disk.pdf")
+        ])
+        assert known == {seen, disk_only}
+        assert cache.known([(disk_only, "disk.pdf")]) == set()
+        assert cache.stats()["hits"] == 0
+        assert is_digest(seen) and not is_digest(seen.upper()) and not is_digest("abc")
+
+
+class TestCorpusStore:
+    """Tests for the persistent resume corpus"""
+
+    def make_store(self, tmp_path, model_name="model", dimension=3):
+        return CorpusStore(
+            str(tmp_path / "corpus.db"), str(tmp_path / "corpus.f32"), model_name, dimension
+        )
+
+    def make_record(self, name):
+        return {
+            "candidate_name": name,
+            "filename": f"{name}.pdf",
+            "content_sha256": f"sha-{name}",
+            "text": f"{name} resume text"
+        }
+
+    def test_search_ranks_stored_resumes(self, tmp_path):
+        """Test ingest-once / query-many ranking"""
+        store = self.make_store(tmp_path)
+        store.add(
+            [self.make_record("alice"), self.make_record("bob"), self.make_record("carol")],
+            [np.array([1.0, 0.0, 0.0]), np.array([0.0, 2.0, 0.0]), np.array([1.0, 1.0, 0.0])]
+        )
+
+        results = store.search(np.array([0.0, 1.0, 0.0]), top_k=2)
+
+        assert [r["candidate_name"] for r in results] == ["bob", "carol"]
+        assert results[0]["score"] == pytest.approx(1.0)
+        assert store.find_by_sha256("sha-alice") is not None
+
+    def test_corpus_persists_across_instances(self, tmp_path):
+        """Test that a reopened corpus keeps its rows"""
+        store = self.make_store(tmp_path)
+        store.add([self.make_record("alice")], [np.array([1.0, 0.0, 0.0])])
+        store.close()
+
+        reopened = self.make_store(tmp_path)
+        assert len(reopened) == 1
+        assert reopened.search(np.array([1.0, 0.0, 0.0]))[0]["candidate_name"] == "alice"
+
+    def test_rejects_different_model(self, tmp_path):
+        """Test that a corpus cannot be mixed with another model's embeddings"""
+        self.make_store(tmp_path).close()
+        with pytest.raises(ValueError):
+            self.make_store(tmp_path, model_name="other-model")
+
+    def test_search_with_attached_ivf_index(self, tmp_path):
+        """Test that an attached index follows later ingests and serves search"""
+        store = self.make_store(tmp_path)
+        store.add(
+            [self.make_record("alice"), self.make_record("bob")],
+            [np.array([1.0, 0.0, 0.0]), np.array([0.0, 1.0, 0.0])]
+        )
+        store.build_index("ivf", IVFIndex(3, n_lists=2, nprobe=2), str(tmp_path / "ivf.npz"))
+        store.add([self.make_record("carol")], [np.array([0.0, 0.0, 1.0])])
+
+        results = store.search(np.array([0.0, 0.1, 1.0]), top_k=1, method="ivf")
+
+        assert results[0]["candidate_name"] == "carol"
+        with pytest.raises(ValueError):
+            store.search(np.array([1.0, 0.0, 0.0]), method="hnsw")
+
+    def test_concurrent_writers_share_row_numbers(self, tmp_path):
+        """Test two stores on the same files (e.g. two workers) appending in turn"""
+        first, second = self.make_store(tmp_path), self.make_store(tmp_path)
+        first.add([self.make_record("alice")], [np.array([1.0, 0.0, 0.0])])
+        second.add([self.make_record("bob")], [np.array([0.0, 1.0, 0.0])])
+
+        # A failed insert rolls back only its own rows
+        with pytest.raises(sqlite3.IntegrityError):
+            second.add([self.make_record("alice")], [np.array([0.0, 0.0, 1.0])])
+        first.add([self.make_record("carol")], [np.array([0.0, 0.0, 1.0])])
+
+        for store in (first, second):
+            assert store.refresh() == 3
+            assert [r["row"] for r in store.get_by_rows([0, 1, 2])] == [0, 1, 2]
+            assert store.search(np.array([0.0, 1.0, 0.0]), top_k=1)[0]["candidate_name"] == "bob"
+            assert store.search(np.array([0.0, 0.0, 1.0]), top_k=1)[0]["candidate_name"] == "carol"
+
+    def test_compact_matrix_converts_encoding(self, tmp_path):
+        """Test that an existing float32 corpus can be rewritten as int8"""
+        store = self.make_store(tmp_path)
+        store.add(
+            [self.make_record("alice"), self.make_record("bob")],
+            [np.array([1.0, 0.0, 0.0]), np.array([0.0, 1.0, 0.0])]
+        )
+        store.compact_matrix("int8")
+        store.close()
+
+        reopened = self.make_store(tmp_path)
+        assert reopened.dtype == "int8"
+        assert reopened.search(np.array([0.0, 1.0, 0.0]))[0]["candidate_name"] == "bob"
+
+    def test_pq_search_with_rerank(self, tmp_path):
+        """Test that PQ candidates are rescored exactly against stored embeddings"""
+        vectors = np.random.default_rng(0).standard_normal((300, 8))
+        store = self.make_store(tmp_path, dimension=8)
+        store.add([self.make_record(str(i)) for i in range(300)], list(vectors))
+        store.build_index("pq", PQIndex(8, n_subvectors=4))
+
+        results = store.search(vectors[42], top_k=3, method="pq", rerank=50)
+
+        assert results[0]["candidate_name"] == "42"
+        assert results[0]["score"] == pytest.approx(1.0, abs=1e-5)
+
+    def test_binary_prefilter_with_rerank(self, tmp_path):
+        """Test that the Hamming shortlist is reranked with exact cosine"""
+        vectors = np.random.default_rng(0).standard_normal((300, 64))
+        store = self.make_store(tmp_path, dimension=64)
+        store.add([self.make_record(str(i)) for i in range(300)], list(vectors))
+        store.build_index("binary", BinaryIndex(64))
+
+        results = store.search(vectors[42], top_k=3, method="binary", rerank=30)
+        exact_scores = RankingEngine(vectors).scores(vectors[42])
+
+        assert results[0]["candidate_name"] == "42"
+        for result in results:
+            assert result["score"] == pytest.approx(exact_scores[result["row"]], abs=1e-5)
+
+
+class TestJobStore:
+    """Tests for the persisted screening job table"""
+
+    def test_job_lifecycle(self, tmp_path):
+        """Test queued -> running -> done with progress and a stored result"""
+        store = JobStore(str(tmp_path / "jobs.db"))
+        job_id = store.create({"jd_text": "python developer", "top_k": 5}, total_files=3)
+        assert store.get(job_id)["status"] == "queued"
+        assert store.get("missing") is None
+
+        store.mark_running(job_id)
+        store.update_progress(job_id, {"parsed": 3, "embedded": 2, "failed": 1})
+        store.finish(job_id, "done", 200, {"total_resumes": 2, "ranked_resumes": []})
+
+        job = store.get(job_id)
+        assert job["status"] == "done" and job["http_status"] == 200
+        assert (job["parsed"], job["embedded"], job["scored"], job["failed"]) == (3, 2, 0, 1)
+        assert job["params"]["top_k"] == 5
+        assert job["result"] == {"total_resumes": 2, "ranked_resumes": []}
+        assert job["created_at"] <= job["started_at"] <= job["finished_at"]
+        store.close()
+
+    def test_restart_interrupts_unfinished_jobs(self, tmp_path):
+        """Test that a new process marks left-over jobs interrupted and purges old ones"""
+        store = JobStore(str(tmp_path / "jobs.db"))
+        queued = store.create({}, 1)
+        running = store.create({}, 1)
+        finished = store.create({}, 1)
+        store.mark_running(running)
+        store.finish(finished, "failed", 400, {"error": "No valid resumes provided"}, "bad")
+        store.close()
+
+        reopened = JobStore(str(tmp_path / "jobs.db"))
+        assert reopened.recover() == 2
+        assert reopened.get(queued)["status"] == "interrupted"
+        assert reopened.get(running)["status"] == "interrupted"
+        assert reopened.get(finished)["status"] == "failed"
+
+        assert reopened.purge(max_age_s=3600) == 0
+        assert reopened.purge(max_age_s=-1) == 3
+        assert reopened.get(finished) is None
+        reopened.close()
+
+    def test_recover_keeps_jobs_of_live_processes(self, tmp_path):
+        """Test that only jobs of exited (or unknown) owners are interrupted"""
+        db_path = str(tmp_path / "jobs.db")
+        with sqlite3.connect(db_path) as conn:
+            # Table layout from before jobs recorded their owner
+            conn.execute(
+                "CREATE TABLE screening_jobs (id TEXT PRIMARY KEY, status TEXT NOT NULL, "
+                "params TEXT NOT NULL, total_files INTEGER NOT NULL, "
+                "parsed INTEGER NOT NULL DEFAULT 0, embedded INTEGER NOT NULL DEFAULT 0, "
+                "scored INTEGER NOT NULL DEFAULT 0, failed INTEGER NOT NULL DEFAULT 0, "
+                "http_status INTEGER, result TEXT, error TEXT, created_at REAL NOT NULL, "
+                "started_at REAL, finished_at REAL)"
+            )
+            conn.execute(
+                "INSERT INTO screening_jobs (id, status, params, total_files, created_at) "
+                "VALUES ('legacy', 'running', '{}', 1, 0)"
+            )
+
+        exited = subprocess.Popen([sys.executable, "-c", "pass"])
+        exited.wait()
+        store = JobStore(db_path)
+        owners = {
+            "mine": store.owner,
+            "sibling": f"{store.hostname}:{os.getppid()}:sibling",
+            "exited": f"{store.hostname}:{exited.pid}:exited",
+            "remote": f"{store.hostname}-other:{exited.pid}:remote"
+        }
+        for name, owner in owners.items():
+            job_id = store.create({}, 1)
+            store._conn.execute(
+                "UPDATE screening_jobs SET id = ?, owner = ? WHERE id = ?", (name, owner, job_id)
+            )
+        store._conn.commit()
+
+        assert store.recover() == 2
+        statuses = {name: store.get(name)["status"] for name in list(owners) + ["legacy"]}
+        assert statuses == {
+            "mine": "queued", "sibling": "queued", "exited": "interrupted",
+            "remote": "queued", "legacy": "interrupted"
+        }
+        store.close()
+
+
+class TestVectorStore:
+    """Tests for the memory-mapped quantized vector store"""
+
+    def make_vectors(self, n=200, dim=32, seed=0):
+        return np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+
+    @pytest.mark.parametrize("dtype,tolerance", [
+        ("float32", 1e-6), ("float16", 2e-3), ("int8", 2e-2)
+    ])
+    def test_scores_match_float32(self, tmp_path, dtype, tolerance):
+        """Test that quantized scoring stays close to exact cosine similarity"""
+        vectors = self.make_vectors()
+        store = VectorStore(str(tmp_path / "vectors"), 32, dtype)
+        store.append(vectors)
+        query = self.make_vectors(n=1, seed=1)[0]
+
+        expected = RankingEngine(vectors).scores(query)
+
+        np.testing.assert_allclose(store.scores(query), expected, atol=tolerance)
+
+    def test_storage_size_per_dtype(self, tmp_path):
+        """Test bytes per row of each encoding"""
+        sizes = {}
+        for dtype in VectorStore.DTYPES:
+            store = VectorStore(str(tmp_path / dtype), 32, dtype)
+            store.append(self.make_vectors(n=10))
+            sizes[dtype] = store.nbytes() // 10
+        assert sizes == {"float32": 128, "float16": 64, "int8": 36}
+
+    def test_append_truncate_and_reopen(self, tmp_path):
+        """Test that appended rows persist and truncated rows do not"""
+        path = str(tmp_path / "vectors")
+        store = VectorStore(path, 32, "int8")
+        assert store.append(self.make_vectors(n=5)) == 0
+        assert store.append(self.make_vectors(n=5, seed=1)) == 5
+        store.truncate(7)
+
+        reopened = VectorStore(path, 32, "int8")
+        assert len(reopened) == 7
+        assert reopened.vectors(5, 7).shape == (2, 32)
+
+    def test_compact_drops_rows_and_changes_dtype(self, tmp_path):
+        """Test offline compaction with a keep mask and a new encoding"""
+        vectors = self.make_vectors(n=10)
+        store = VectorStore(str(tmp_path / "vectors"), 32, "float32")
+        store.append(vectors)
+        keep = np.arange(10) % 2 == 0
+
+        compacted = store.compact(keep=keep, dtype="float16")
+
+        assert len(compacted) == 5
+        assert compacted.dtype == "float16"
+        expected = RankingEngine(vectors[keep]).normalized
+        np.testing.assert_allclose(compacted.vectors(), expected, atol=2e-3)
+
+
+class TestIVFIndex:
+    """Tests for the IVF approximate nearest-neighbour index"""
+
+    def make_data(self, n=2000, dim=16, clusters=20, seed=0):
+        rng = np.random.default_rng(seed)
+        centers = rng.standard_normal((clusters, dim))
+        data = centers[rng.integers(0, clusters, n)] + 0.3 * rng.standard_normal((n, dim))
+        return data.astype(np.float32)
+
+    def make_index(self, data, n_lists=32, nprobe=8):
+        index = IVFIndex(data.shape[1], n_lists=n_lists, nprobe=nprobe)
+        index.train(data)
+        index.add(range(len(data)), data)
+        return index
+
+    def test_recall_against_exact_search(self):
+        """Test recall@10 against the exact ranking engine"""
+        data = self.make_data()
+        index = self.make_index(data)
+        engine = RankingEngine(data)
+        queries = self.make_data(n=20, seed=1)
+
+        hits = 0
+        for query in queries:
+            exact, _ = engine.top_k(query, 10)
+            approx, _ = index.search(query, 10)
+            hits += len(set(exact.tolist()) & set(approx.tolist()))
+
+        assert hits / (10 * len(queries)) >= 0.9
+
+    def test_full_probe_matches_exact(self):
+        """Test that scanning every list gives the exact ranking"""
+        data = self.make_data(n=500)
+        index = self.make_index(data, n_lists=8)
+        query = data[0]
+
+        ids, scores = index.search(query, 5, nprobe=8)
+        exact, exact_scores = RankingEngine(data).top_k(query, 5)
+
+        assert ids.tolist() == exact.tolist()
+        np.testing.assert_allclose(scores, exact_scores, atol=1e-5)
+
+    def test_delete_uses_tombstones(self):
+        """Test that deleted ids disappear from results before and after compaction"""
+        data = self.make_data(n=500)
+        index = self.make_index(data, n_lists=8, nprobe=8)
+
+        assert index.delete([0, 0]) == 1
+        assert 0 not in index.search(data[0], 5)[0].tolist()
+        assert len(index) == 499
+
+        index.compact()
+        assert 0 not in index.search(data[0], 5)[0].tolist()
+        assert len(index) == 499
+
+    def test_max_id_is_a_running_maximum(self):
+        """Test that max_id follows adds and survives deleting the largest id"""
+        data = self.make_data(n=500)
+        index = self.make_index(data, n_lists=8)
+        assert index.max_id() == 499
+
+        index.add([700, 600], data[:2])
+        index.delete([700])
+        index.compact()
+        assert index.max_id() == 700
+
+    def test_save_and_load(self, tmp_path):
+        """Test that a saved index answers queries identically after loading"""
+        data = self.make_data(n=500)
+        index = self.make_index(data, n_lists=8)
+        index.delete([3])
+        path = str(tmp_path / "ivf.npz")
+        index.save(path)
+
+        loaded = IVFIndex.load(path)
+
+        assert len(loaded) == len(index)
+        assert loaded.max_id() == 499
+        assert loaded.search(data[7], 10)[0].tolist() == index.search(data[7], 10)[0].tolist()
+
+    def test_add_requires_training(self):
+        """Test that adding to an untrained index fails loudly"""
+        with pytest.raises(RuntimeError):
+            IVFIndex(4).add([0], np.ones((1, 4)))
+
+
+class TestPQIndex:
+    """Tests for the product-quantization index"""
+
+    def make_data(self, n=2000, dim=32, seed=0):
+        rng = np.random.default_rng(seed)
+        centers = rng.standard_normal((20, dim))
+        data = centers[rng.integers(0, 20, n)] + 0.3 * rng.standard_normal((n, dim))
+        return data.astype(np.float32)
+
+    def make_index(self, data, n_subvectors=8):
+        index = PQIndex(data.shape[1], n_subvectors=n_subvectors)
+        index.train(data, n_iter=10)
+        index.add(range(len(data)), data)
+        return index
+
+    def test_codes_are_compact_and_accurate(self):
+        """Test code size and that ADC scores approximate exact cosine scores"""
+        data = self.make_data()
+        index = self.make_index(data)
+        query = data[5]
+
+        ids, scores = index.search(query, len(data))
+        exact = RankingEngine(data).scores(query)
+
+        assert index.nbytes() == len(data) * (8 + 8)  # 8 code bytes + int64 id
+        assert np.abs(scores - exact[ids]).max() < 0.1
+        assert 5 in ids[:10].tolist()
+
+    def test_rejects_indivisible_dimension(self):
+        """Test that n_subvectors must divide the dimension"""
+        with pytest.raises(ValueError):
+            PQIndex(30, n_subvectors=8)
+
+    def test_delete_and_save_load(self, tmp_path):
+        """Test tombstones survive a save/load round trip"""
+        data = self.make_data(n=500)
+        index = self.make_index(data)
+        index.delete([5])
+        path = str(tmp_path / "pq.npz")
+        index.save(path)
+
+        loaded = PQIndex.load(path)
+
+        assert len(loaded) == 499
+        assert loaded.max_id() == 499
+        assert 5 not in loaded.search(data[5], 10)[0].tolist()
+        assert loaded.search(data[9], 10)[0].tolist() == index.search(data[9], 10)[0].tolist()
+
+    def test_max_id_is_a_running_maximum(self):
+        """Test that max_id follows adds and survives deleting the largest id"""
+        data = self.make_data(n=500)
+        index = self.make_index(data)
+        assert index.max_id() == 499
+
+        index.add([700, 600], data[:2])
+        index.delete([700])
+        index.compact()
+        assert index.max_id() == 700
+
+
+class TestBinaryIndex:
+    """Tests for the sign-bit Hamming prefilter"""
+
+    def test_popcount(self):
+        """Test bit counting over uint64 words"""
+        words = np.array([0, 1, 0xFF, 2 ** 64 - 1], dtype=np.uint64)
+        assert popcount(words).tolist() == [0, 1, 8, 64]
+
+    def test_codes_are_packed_sign_bits(self):
+        """Test 48-byte codes for 384 dims and zero distance to itself"""
+        vectors = np.random.default_rng(0).standard_normal((100, 384))
+        index = BinaryIndex(384)
+        index.train(vectors)
+        index.add(range(100), vectors)
+
+        ids, scores = index.search(vectors[7], 1)
+
+        assert index.encode(vectors).shape == (6, 100)
+        assert index.nbytes() == 100 * (48 + 8)
+        assert ids.tolist() == [7]
+        assert scores[0] == pytest.approx(1.0)
+
+    def test_hamming_orders_by_angle(self):
+        """Test that Hamming distance grows with the angle to the query"""
+        rng = np.random.default_rng(0)
+        query = rng.standard_normal(256)
+        noise = rng.standard_normal(256)
+        vectors = np.stack([query + scale * noise for scale in (0.1, 0.5, 1.0, 3.0)])
+        index = BinaryIndex(256)
+        index.thresholds = np.zeros(256, dtype=np.float32)
+        index.add(range(4), vectors)
+
+        assert index.search(query, 4)[0].tolist() == [0, 1, 2, 3]
+
+    def test_incomplete_subclass_cannot_be_created(self):
+        """Test that FlatCodeIndex subclasses must implement every abstract member"""
+        class NoScore(FlatCodeIndex):
+            is_trained = True
+            n_columns = 1
+
+            def encode(self, vectors):
+                return np.zeros((1, len(vectors)), dtype=np.uint8)
+
+            def _params(self):
+                return {}
+
+            @classmethod
+            def _from_params(cls, data):
+                return cls(1)
+
+        with pytest.raises(TypeError):
+            NoScore(4)
+
+
+class TestBM25Index:
+    """Tests for the lexical BM25 shortlist"""
+
+    def make_index(self, texts):
+        index = BM25Index()
+        index.add(texts)
+        return index
+
+    def test_tokenize_matches_document_processor(self):
+        """Test that terms come from clean_text + remove_stopwords"""
+        tokens = BM25Index().tokenize("Senior Python Developer, with 5 years of Node.js.")
+        assert tokens == ["senior", "python", "developer", "years", "node.js"]
+
+    def test_ranks_matching_documents_first(self):
+        """Test that documents sharing query terms outrank the rest"""
+        index = self.make_index([
+            "chef with restaurant experience",
+            "python developer building fastapi services",
+            "java developer"
+        ])
+
+        ids, scores = index.top_n("Python FastAPI developer", 2)
+
+        assert ids.tolist() == [1, 2]
+        assert scores[0] > scores[1] > 0
+
+    def test_rare_terms_weigh_more(self):
+        """Test inverse document frequency"""
+        index = self.make_index([
+            "developer kubernetes", "developer", "developer", "developer"
+        ])
+        scores = index.scores("developer kubernetes")
+        assert scores[0] > 2 * scores[1]
+
+    def test_longer_documents_are_normalized(self):
+        """Test document-length normalization"""
+        index = self.make_index(["python", "python " + "filler " * 50])
+        scores = index.scores("python")
+        assert scores[0] > scores[1]
+
+    def test_unknown_terms_score_zero(self):
+        """Test queries without indexed terms"""
+        index = self.make_index(["python developer"])
+        assert index.scores("haskell").tolist() == [0.0]
+        assert BM25Index().scores("python").tolist() == []
+
+
+class TestAPI:
+    """Endpoint tests through TestClient, with a stand-in model and temporary storage"""
+
+    class HashingModel:
+        """Stand-in SentenceTransformer: bag of words hashed into 16 dimensions"""
+
+        max_seq_length = 128
+
+        def __init__(self, model_name):
+            pass
+
+        def encode(self, texts, batch_size=32, convert_to_numpy=True, **kwargs):
+            single = isinstance(texts, str)
+            vectors = np.zeros((1 if single else len(texts), 16), dtype=np.float32)
+            for row, text in enumerate([texts] if single else texts):
+                for word in text.lower().split():
+                    vectors[row, int(hashlib.md5(word.encode()).hexdigest(), 16) % 16] += 1
+            return vectors[0] if single else vectors
+
+    @classmethod
+    def setup_class(cls):
+        """Import the app against temporary storage and start it"""
+        from fastapi.testclient import TestClient
+        cls.tmp_dir = tempfile.mkdtemp()
+        cls.patch = pytest.MonkeyPatch()
+        cls.patch.setattr(embedding_generator, "SentenceTransformer", cls.HashingModel)
+        for name, value in {
+            "DATABASE_URL": f"sqlite:///{cls.tmp_dir}/api.db",
+            "EMBEDDING_CACHE_DIR": cls.tmp_dir,
+            "TEXT_CACHE_DIR": cls.tmp_dir,
+            "UPLOAD_TEMP_DIR": cls.tmp_dir,
+            "CORPUS_MATRIX_PATH": f"{cls.tmp_dir}/corpus.f32",
+            "IVF_INDEX_PATH": f"{cls.tmp_dir}/ivf.npz",
+            "PQ_INDEX_PATH": f"{cls.tmp_dir}/pq.npz",
+            "BINARY_INDEX_PATH": f"{cls.tmp_dir}/binary.npz",
+            "EXTRACTION_WORKERS": 1,
+            "STREAM_SNAPSHOT_INTERVAL_S": 0.0
+        }.items():
+            cls.patch.setattr(config, name, value)
+        cls.main = importlib.import_module("backend.main")
+        cls.client = TestClient(cls.main.app)
+        cls.client.__enter__()
+
+    @classmethod
+    def teardown_class(cls):
+        """Stop the app and forget the module so a later import starts afresh"""
+        cls.client.__exit__(None, None, None)
+        sys.modules.pop("backend.main", None)
+        cls.patch.undo()
+        shutil.rmtree(cls.tmp_dir, ignore_errors=True)
+
+    @staticmethod
+    def uploads(*resumes):
+        """Multipart resumes field for (filename, content) pairs"""
+        return [("resumes", (name, content, "application/octet-stream")) for name, content in resumes]
+
+    @staticmethod
+    def known(*resumes):
+        """known_resumes field for (filename, content) pairs"""
+        return json.dumps([
+            {"filename": name, "digest": hashlib.sha256(content).hexdigest()}
+            for name, content in resumes
+        ])
+
+    def wait_for_job(self, job_id):
+        """Poll a job until it leaves queued/running"""
+        for _ in range(300):
+            status = self.client.get(f"/jobs/{job_id}").json()
+            if status["status"] not in ("queued", "running"):
+                return status
+            time.sleep(0.05)
+        raise AssertionError(f"Job {job_id} did not finish")
+
+    @pytest.mark.parametrize("url,field,error", [
+        (url, field, f"{field} must be at least 1")
+        for url in ("/screen-resumes", "/screen-resumes/stream", "/jobs/screen-resumes")
+        for field in ("top_k", "shortlist_size")
+    ] + [
+        ("/screen-matrix", "top_k", "top_k must be at least 1"),
+        ("/corpus/search", "top_k", "top_k must be at least 1")
+    ])
+    def test_counts_below_one_are_rejected(self, url, field, error):
+        """Test that every screening and search endpoint validates top_k and shortlist_size"""
+        jd_field = "job_descriptions" if url == "/screen-matrix" else "job_description"
+        response = self.client.post(
+            url,
+            data={jd_field: "python developer", field: "0"},
+            files=None if url == "/corpus/search" else self.uploads(
+                ("a.docx", docx_bytes("python developer"))
+            )
+        )
+        assert response.status_code == 400
+        assert response.json() == {"error": error}
+
+    def test_negotiate_then_screen_known_with_uploads(self):
+        """Test that negotiated known resumes are screened from cache next to uploads"""
+        seen = ("seen.docx", docx_bytes("Python developer Kubernetes"))
+        new = ("new.docx", docx_bytes("Java developer Spring"))
+        first = self.client.post(
+            "/screen-resumes", data={"job_description": "python"}, files=self.uploads(seen)
+        )
+        assert first.status_code == 200
+
+        negotiation = self.client.post("/resumes/negotiate", json={"resumes": [
+            {"filename": name, "digest": hashlib.sha256(content).hexdigest()}
+            for name, content in (seen, new, new)
+        ]})
+        assert negotiation.json() == {
+            "unseen": [hashlib.sha256(new[1]).hexdigest()], "known": 1
+        }
+
+        response = self.client.post(
+            "/screen-resumes",
+            data={"job_description": "python kubernetes developer", "known_resumes": self.known(seen)},
+            files=self.uploads(new)
+        )
+        result = response.json()
+        assert response.status_code == 200
+        assert result["total_resumes"] == 2 and result["failed_files"] == []
+        assert [r["filename"] for r in result["ranked_resumes"]] == ["seen.docx", "new.docx"]
+
+    def test_unseen_known_resumes(self):
+        """Test known_resumes the server has no text for, or cannot parse"""
+        unseen = ("unseen.docx", b"never uploaded")
+        assert self.client.post("/resumes/negotiate", json={"resumes": [
+            {"filename": "a.docx", "digest": "not-a-digest"}
+        ]}).status_code == 400
+
+        response = self.client.post(
+            "/screen-resumes",
+            data={"job_description": "python", "known_resumes": self.known(unseen)}
+        )
+        assert response.status_code == 400
+        assert response.json()["error"] == "No valid resumes provided"
+        assert [(f["filename"], f["status"]) for f in response.json()["failed_files"]] == [
+            ("unseen.docx", "unseen")
+        ]
+
+        for known_resumes, error in [
+            ("[{\"filename\": \"a.docx\"", "known_resumes must be a JSON list of {filename, digest} objects"),
+            ("[{\"filename\": \"a.docx\"}]", "known_resumes must be a JSON list of {filename, digest} objects"),
+            ("[{\"filename\": \"a.docx\", \"digest\": \"abc\"}]",
+             "known_resumes digests must be SHA-256 hex digests")
+        ]:
+            response = self.client.post(
+                "/screen-resumes", data={"job_description": "python", "known_resumes": known_resumes}
+            )
+            assert response.status_code == 400
+            assert response.json() == {"error": error}
+
+    def test_job_submit_status_and_result(self):
+        """Test a job from submission to its stored result, and the missing/interrupted cases"""
+        submitted = self.client.post(
+            "/jobs/screen-resumes",
+            data={"job_description": "python developer"},
+            files=self.uploads(
+                ("a.docx", docx_bytes("Python developer")), ("b.pdf", b"not a pdf")
+            )
+        )
+        assert submitted.status_code == 202 and submitted.json()["status"] == "queued"
+        job_id = submitted.json()["job_id"]
+
+        status = self.wait_for_job(job_id)
+        assert status["status"] == "done"
+        assert (status["total_files"], status["parsed"], status["failed"]) == (2, 2, 1)
+        result = self.client.get(f"/jobs/{job_id}/result")
+        assert result.status_code == 200
+        assert [r["filename"] for r in result.json()["ranked_resumes"]] == ["a.docx"]
+
+        assert self.client.get("/jobs/missing").status_code == 404
+        assert self.client.get("/jobs/missing/result").status_code == 404
+
+        # A job left behind by an exited process
+        orphan = self.main.job_store.create({}, 1)
+        self.main.job_store._conn.execute(
+            "UPDATE screening_jobs SET owner = NULL WHERE id = ?", (orphan,)
+        )
+        self.main.job_store._conn.commit()
+        assert self.client.get(f"/jobs/{orphan}/result").status_code == 409
+        self.main.job_store.recover()
+        result = self.client.get(f"/jobs/{orphan}/result")
+        assert result.status_code == 410
+        assert result.json()["status"] == "interrupted"
+
+    def test_spooled_upload_is_deleted_when_submit_fails(self):
+        """Test that an upload the extraction pool refuses leaves no temporary file"""
+        def refuse(file_content, filename):
+            raise RuntimeError("pool is shut down")
+
+        with pytest.MonkeyPatch.context() as patch:
+            patch.setattr(self.main.extraction_pool, "submit", refuse)
+            response = self.client.post(
+                "/screen-resumes",
+                data={"job_description": "python"},
+                files=self.uploads(("refused.docx", docx_bytes("Rust developer Tokio")))
+            )
+
+        assert response.status_code == 400
+        assert response.json()["failed_files"][0]["error"] == "pool is shut down"
+        assert not [name for name in os.listdir(self.tmp_dir) if name.startswith("upload-")]
+
+    def test_stream_ndjson_framing(self):
+        """Test one JSON event per line: files, scores, a snapshot and the result last"""
+        response = self.client.post(
+            "/screen-resumes/stream",
+            data={"job_description": "python developer", "semantic_only": "true"},
+            files=self.uploads(
+                ("a.docx", docx_bytes("Python developer")), ("b.docx", docx_bytes("Chef"))
+            )
+        )
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        events = [json.loads(line) for line in response.text.splitlines()]
+        names = [event["event"] for event in events]
+
+        assert names.count("file") == 2 and names.count("score") == 2 and "top_k" in names
+        assert names[-1] == "result"
+        assert events[-1]["ranked_resumes"][0]["filename"] == "a.docx"
+
+    def test_stream_sse_framing_and_error_event(self):
+        """Test server-sent event framing and the error event of a failed screening"""
+        response = self.client.post(
+            "/screen-resumes/stream",
+            data={"job_description": "python developer", "format": "sse"},
+            files=self.uploads(("broken.pdf", b"not a pdf"))
+        )
+        assert response.headers["content-type"].startswith("text/event-stream")
+        blocks = response.text.split("\n\n")
+        assert blocks[-1] == ""
+        events = []
+        for block in blocks[:-1]:
+            event_line, data_line = block.split("\n")
+            assert event_line.startswith("event: ") and data_line.startswith("data: ")
+            events.append((event_line[len("event: "):], json.loads(data_line[len("data: "):])))
+
+        assert [name for name, _ in events] == ["file", "error"]
+        assert events[0][1]["status"] != "ok"
+        assert events[1][1]["status_code"] == 400
+        assert events[1][1]["error"] == "No valid resumes provided"
+
+        unknown = self.client.post(
+            "/screen-resumes/stream",
+            data={"job_description": "python", "format": "xml"},
+            files=self.uploads(("a.docx", docx_bytes("Python")))
+        )
+        assert unknown.status_code == 400
+
+
 class TestIntegration:
     """Integration tests for the full pipeline"""
 